@@ -0,0 +1,319 @@
+"""
+Banc d'essai de la gateway : charge HTTP par route, avec les services backend en local
+
+Démarre les quatre services réels (versions en mémoire) et la gateway sur des
+ports dédiés, envoie une charge concurrente sur chaque route puis écrit un
+rapport JSON (RPS, p50/p95/p99, taux d'erreur par route) comparable d'une
+version à l'autre.
+
+Usage:
+    python -m benchmarks.run_benchmark --concurrency 20 --duration 10
+    python -m benchmarks.run_benchmark --external --gateway-url http://localhost:8080
+    python -m benchmarks.run_benchmark --baseline benchmarks/results/precedent.json
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+GATEWAY_DIR = Path(__file__).resolve().parent.parent
+SERVICES_DIR = GATEWAY_DIR.parent / "services"
+RESULTS_DIR = GATEWAY_DIR / "benchmarks" / "results"
+
+# Ports par défaut des services lancés par le banc (décalés des ports de développement)
+DEFAULT_PORTS = {
+    "mobility": 18000,
+    "air_quality": 18081,
+    "emergency": 15051,
+    "urban_events": 18004,
+    "gateway": 18080,
+}
+
+
+@dataclass
+class Route:
+    """Route de la gateway soumise à la charge"""
+    name: str
+    method: str
+    path: str
+    json: Optional[Dict[str, Any]] = None
+
+
+DEFAULT_ROUTES = [
+    Route("mobility_lignes", "GET", "/mobility/lignes"),
+    Route("mobility_horaires", "GET", "/mobility/horaires/L1"),
+    Route("mobility_trafic", "GET", "/mobility/trafic"),
+    Route("air_quality_aqi", "GET", "/air-quality/aqi/downtown"),
+    Route("air_quality_pollutants", "GET", "/air-quality/pollutants/downtown"),
+    Route("emergency_alerts", "GET", "/emergency/alerts/Zone Centre"),
+    Route("events", "GET", "/events"),
+    Route("dashboard", "GET", "/dashboard"),
+    Route("batch", "POST", "/batch", {"requests": ["horaires/L1", "aqi/downtown", "alerts/Zone Centre"]}),
+]
+
+
+@dataclass
+class RouteSamples:
+    """Mesures brutes d'une route"""
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    duration: float = 0.0
+
+
+# ============================================================================
+# SERVICES LOCAUX
+# ============================================================================
+
+def _service_commands(ports: Dict[str, int]) -> List[Dict[str, Any]]:
+    """Commandes de lancement des services (chaque service dans son propre processus)"""
+    python = sys.executable
+    gateway_env = {
+        "MOBILITY_SERVICE_URL": f"http://127.0.0.1:{ports['mobility']}",
+        "AIR_QUALITY_SERVICE_URL": f"http://127.0.0.1:{ports['air_quality']}/",
+        "EMERGENCY_SERVICE_TARGET": f"127.0.0.1:{ports['emergency']}",
+        "URBAN_EVENTS_SERVICE_URL": f"http://127.0.0.1:{ports['urban_events']}/graphql",
+        "DEBUG": "false",
+    }
+    uvicorn = [python, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--log-level", "warning"]
+    return [
+        {"name": "mobility", "cwd": SERVICES_DIR / "mobility-service",
+         "cmd": uvicorn + ["--port", str(ports["mobility"])], "env": {}},
+        {"name": "air_quality", "cwd": SERVICES_DIR / "air-quality-soap-service",
+         "cmd": [python, "main.py"], "env": {"HOST": "127.0.0.1", "PORT": str(ports["air_quality"])}},
+        {"name": "emergency", "cwd": SERVICES_DIR / "emergency-grpc-service",
+         "cmd": [python, "-m", "src.server"], "env": {"GRPC_PORT": str(ports["emergency"])}},
+        {"name": "urban_events", "cwd": SERVICES_DIR / "urban-events-graphql-service",
+         "cmd": uvicorn + ["--port", str(ports["urban_events"])], "env": {}},
+        {"name": "gateway", "cwd": GATEWAY_DIR,
+         "cmd": uvicorn + ["--port", str(ports["gateway"])], "env": gateway_env},
+    ]
+
+
+def _wait_for_port(port: int, timeout: float) -> bool:
+    """Attend qu'un port TCP local accepte les connexions"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.settimeout(0.5)
+            if sock.connect_ex(("127.0.0.1", port)) == 0:
+                return True
+        time.sleep(0.2)
+    return False
+
+
+def start_services(ports: Dict[str, int], startup_timeout: float) -> List[subprocess.Popen]:
+    """Lance les backends puis la gateway ; arrête tout si un service ne démarre pas"""
+    processes = []
+    try:
+        for service in _service_commands(ports):
+            process = subprocess.Popen(
+                service["cmd"],
+                cwd=service["cwd"],
+                env={**os.environ, **service["env"]},
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+            )
+            processes.append(process)
+            if not _wait_for_port(ports[service["name"]], startup_timeout):
+                error = process.stderr.read().decode(errors="replace")[-2000:] if process.poll() is not None else ""
+                raise RuntimeError(f"Le service {service['name']} n'a pas démarré\n{error}")
+            print(f"✅ {service['name']} prêt sur le port {ports[service['name']]}")
+    except BaseException:
+        stop_services(processes)
+        raise
+    return processes
+
+
+def stop_services(processes: List[subprocess.Popen]):
+    for process in reversed(processes):
+        process.terminate()
+    for process in processes:
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+# ============================================================================
+# GÉNÉRATION DE CHARGE
+# ============================================================================
+
+async def run_route(client: httpx.AsyncClient, route: Route, concurrency: int, duration: float) -> RouteSamples:
+    """`concurrency` clients enchaînent des requêtes sur la route pendant `duration` secondes"""
+    samples = RouteSamples()
+    start = time.perf_counter()
+    deadline = start + duration
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            request_start = time.perf_counter()
+            try:
+                response = await client.request(route.method, route.path, json=route.json)
+                await response.aread()
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            samples.latencies.append(time.perf_counter() - request_start)
+            samples.errors += failed
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    samples.duration = time.perf_counter() - start
+    return samples
+
+
+def percentile(sorted_values: List[float], q: float) -> Optional[float]:
+    """Percentile par rang le plus proche sur une liste triée"""
+    if not sorted_values:
+        return None
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(q * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def summarize(samples: RouteSamples) -> Dict[str, Any]:
+    """RPS, latences (ms) et taux d'erreur d'une route"""
+    latencies = sorted(samples.latencies)
+    count = len(latencies)
+
+    def ms(value: Optional[float]) -> Optional[float]:
+        return round(value * 1000, 3) if value is not None else None
+
+    return {
+        "requests": count,
+        "errors": samples.errors,
+        "error_rate": round(samples.errors / count, 4) if count else 0.0,
+        "rps": round(count / samples.duration, 2) if samples.duration else 0.0,
+        "latency_ms": {
+            "mean": ms(sum(latencies) / count) if count else None,
+            "p50": ms(percentile(latencies, 0.50)),
+            "p95": ms(percentile(latencies, 0.95)),
+            "p99": ms(percentile(latencies, 0.99)),
+            "max": ms(latencies[-1]) if count else None,
+        },
+    }
+
+
+async def run_benchmark(
+    gateway_url: str, routes: List[Route], concurrency: int, duration: float, warmup: float
+) -> Dict[str, Any]:
+    """Exécute la charge route par route (une route à la fois, pour des mesures isolées)"""
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    results = {}
+    async with httpx.AsyncClient(base_url=gateway_url, limits=limits, timeout=30.0) as client:
+        for route in routes:
+            if warmup > 0:
+                await run_route(client, route, concurrency, warmup)
+            results[route.name] = {
+                "method": route.method,
+                "path": route.path,
+                **summarize(await run_route(client, route, concurrency, duration)),
+            }
+            line = results[route.name]
+            print(
+                f"📊 {route.name:<24} {line['rps']:>9.1f} req/s  "
+                f"p50 {line['latency_ms']['p50']}ms  p95 {line['latency_ms']['p95']}ms  "
+                f"p99 {line['latency_ms']['p99']}ms  erreurs {line['error_rate']:.2%}"
+            )
+    return results
+
+
+# ============================================================================
+# RAPPORT
+# ============================================================================
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=GATEWAY_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_report(results: Dict[str, Any], args: argparse.Namespace) -> Dict[str, Any]:
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_revision": _git_revision(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "parameters": {
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "external": args.external,
+        },
+        "routes": results,
+    }
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any]):
+    """Affiche l'évolution du débit et du p95 par rapport à un rapport précédent"""
+    print(f"\n🔍 Comparaison avec {baseline.get('git_revision') or baseline.get('timestamp')}")
+    for name, current in report["routes"].items():
+        previous = baseline.get("routes", {}).get(name)
+        if not previous:
+            continue
+        rps_delta = (current["rps"] - previous["rps"]) / previous["rps"] if previous["rps"] else 0.0
+        p95_now, p95_before = current["latency_ms"]["p95"], previous["latency_ms"]["p95"]
+        p95_delta = (p95_now - p95_before) / p95_before if p95_now and p95_before else 0.0
+        print(f"   {name:<24} rps {rps_delta:+.1%}  p95 {p95_delta:+.1%}")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Banc d'essai de l'API Gateway")
+    parser.add_argument("--concurrency", type=int, default=20, help="Clients simultanés par route")
+    parser.add_argument("--duration", type=float, default=10.0, help="Durée de mesure par route (s)")
+    parser.add_argument("--warmup", type=float, default=1.0, help="Durée de chauffe par route (s)")
+    parser.add_argument("--routes", nargs="*", help="Routes à mesurer (noms), toutes par défaut")
+    parser.add_argument("--external", action="store_true", help="Utiliser des services déjà démarrés")
+    parser.add_argument("--gateway-url", default=None, help="URL de la gateway (mode --external)")
+    parser.add_argument("--startup-timeout", type=float, default=30.0, help="Délai de démarrage par service (s)")
+    parser.add_argument("--output", type=Path, default=None, help="Fichier JSON de résultats")
+    parser.add_argument("--baseline", type=Path, default=None, help="Rapport précédent à comparer")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    routes = [route for route in DEFAULT_ROUTES if not args.routes or route.name in args.routes]
+    if not routes:
+        sys.exit(f"Aucune route connue parmi {args.routes}")
+
+    processes = []
+    gateway_url = args.gateway_url or "http://localhost:8080"
+    if not args.external:
+        processes = start_services(DEFAULT_PORTS, args.startup_timeout)
+        gateway_url = f"http://127.0.0.1:{DEFAULT_PORTS['gateway']}"
+
+    try:
+        results = asyncio.run(run_benchmark(gateway_url, routes, args.concurrency, args.duration, args.warmup))
+    finally:
+        stop_services(processes)
+
+    report = build_report(results, args)
+    output = args.output or RESULTS_DIR / f"benchmark-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, sort_keys=True, ensure_ascii=False) + "\n")
+    print(f"\n💾 Résultats écrits dans {output}")
+
+    if args.baseline:
+        compare(report, json.loads(args.baseline.read_text()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Diffusion des alertes temps réel (gRPC SubscribeAlerts) vers les navigateurs
+Un seul flux gRPC amont par filtre distinct (zones, types, priorité minimale),
+partagé entre tous les clients SSE / WebSocket abonnés au même filtre.
+"""
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from clients.base import BackendError, BackendUnavailableError
+from clients.grpc_client import EmergencyClient
+
+logger = logging.getLogger("api-gateway")
+
+FilterKey = Tuple[Tuple[str, ...], Tuple[int, ...], int]
+
+EVICTED_EVENT = {"event": "evicted", "data": {"message": "Client trop lent, abonnement interrompu"}}
+
+
+class AlertSubscriber:
+    """
+    Abonné côté gateway : une file bornée alimentée par le flux amont.
+    Si la file est pleine (client qui ne consomme plus), l'abonné est évincé
+    plutôt que de ralentir le flux partagé ou d'accumuler de la mémoire.
+    """
+
+    def __init__(self, stream: "_UpstreamStream", queue_size: int):
+        self.stream = stream
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size)
+        self.evicted = False
+
+    def push(self, event: Dict[str, Any]) -> bool:
+        """Dépose un événement sans jamais bloquer le flux amont"""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    async def next(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """Prochain événement, ou None après `timeout` secondes (heartbeat)"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class _UpstreamStream:
+    """Flux gRPC amont d'un filtre et ses abonnés"""
+
+    def __init__(self, key: FilterKey, request):
+        self.key = key
+        self.request = request
+        self.subscribers: Set[AlertSubscriber] = set()
+        # Dernier état connu de chaque alerte, rejoué aux nouveaux abonnés
+        self.alerts: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.task: Optional[asyncio.Task] = None
+        self.connected = False
+
+
+class AlertStreamHub:
+    """Multiplexe les abonnements navigateur sur un nombre borné de flux gRPC"""
+
+    def __init__(
+        self,
+        client: EmergencyClient,
+        queue_size: int = 100,
+        replay_size: int = 100,
+        max_upstreams: int = 5,
+        retry_max_delay: float = 30.0,
+    ):
+        self._client = client
+        self._queue_size = queue_size
+        self._replay_size = replay_size
+        self._max_upstreams = max_upstreams
+        self._retry_max_delay = retry_max_delay
+        self._streams: Dict[FilterKey, _UpstreamStream] = {}
+        self.stats = {"subscribed": 0, "evicted": 0, "upstream_errors": 0}
+
+    def subscribe(
+        self,
+        zones: List[str],
+        types: Optional[List[str]] = None,
+        min_priority: Optional[str] = None,
+    ) -> AlertSubscriber:
+        """Abonne un client, en réutilisant le flux amont du même filtre s'il existe"""
+        request = self._client.subscribe_request(zones, types, min_priority)
+        key = (tuple(request.zones), tuple(request.types), request.min_priority)
+
+        stream = self._streams.get(key)
+        if stream is None:
+            if len(self._streams) >= self._max_upstreams:
+                raise BackendUnavailableError(
+                    self._client.backend,
+                    f"Limite de {self._max_upstreams} flux d'alertes distincts atteinte",
+                    503
+                )
+            stream = _UpstreamStream(key, request)
+            stream.task = asyncio.create_task(self._run(stream))
+            self._streams[key] = stream
+            logger.info(f"📡 Flux d'alertes ouvert pour {key}")
+
+        # File dimensionnée pour le rejeu en plus de la marge normale : un abonné
+        # d'un filtre chargé ne démarre pas avec une file pleine (éviction immédiate)
+        replay = list(stream.alerts.values())
+        subscriber = AlertSubscriber(stream, self._queue_size + len(replay))
+        for alert in replay:
+            subscriber.push({"event": "alert", "data": alert})
+        stream.subscribers.add(subscriber)
+        self.stats["subscribed"] += 1
+        return subscriber
+
+    def unsubscribe(self, subscriber: AlertSubscriber):
+        """Désabonne un client ; le flux amont est fermé avec son dernier abonné"""
+        stream = subscriber.stream
+        stream.subscribers.discard(subscriber)
+        if not stream.subscribers and self._streams.get(stream.key) is stream:
+            del self._streams[stream.key]
+            stream.task.cancel()
+            logger.info(f"📡 Flux d'alertes fermé pour {stream.key}")
+
+    async def _run(self, stream: _UpstreamStream):
+        """Lit le flux amont et le rediffuse, avec reconnexion en backoff exponentiel"""
+        delay = 1.0
+        while True:
+            try:
+                async for alert in self._client.subscribe_alerts(stream.request):
+                    stream.connected = True
+                    delay = 1.0
+                    self._broadcast(stream, alert)
+            except BackendError as e:
+                self.stats["upstream_errors"] += 1
+                logger.warning(f"⚠️ Flux d'alertes {stream.key} interrompu: {e.message}")
+            except Exception as e:
+                # Erreur inattendue (alerte malformée, erreur gRPC non traduite) : sans
+                # reconnexion, les abonnés de ce filtre ne recevraient plus que des heartbeats
+                self.stats["upstream_errors"] += 1
+                logger.exception(f"❌ Flux d'alertes {stream.key} interrompu (erreur inattendue): {e}")
+            stream.connected = False
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self._retry_max_delay)
+
+    def _broadcast(self, stream: _UpstreamStream, alert: Dict[str, Any]):
+        """Diffuse une alerte sans attendre les clients ; les clients saturés sont évincés"""
+        alert_id = alert["alert_id"]
+        if stream.alerts.get(alert_id) == alert:
+            # Alerte déjà diffusée (ex: renvoyée par le serveur après reconnexion)
+            return
+        stream.alerts[alert_id] = alert
+        stream.alerts.move_to_end(alert_id)
+        while len(stream.alerts) > self._replay_size:
+            stream.alerts.popitem(last=False)
+
+        event = {"event": "alert", "data": alert}
+        for subscriber in list(stream.subscribers):
+            if not subscriber.push(event):
+                self._evict(subscriber)
+
+    def _evict(self, subscriber: AlertSubscriber):
+        """Remplace la file d'un client saturé par l'événement d'éviction"""
+        subscriber.evicted = True
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        subscriber.queue.put_nowait(EVICTED_EVENT)
+        self.stats["evicted"] += 1
+        logger.warning(f"🐢 Client lent évincé du flux {subscriber.stream.key}")
+        self.unsubscribe(subscriber)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Flux amont ouverts et nombre d'abonnés par filtre"""
+        return {
+            "upstreams": len(self._streams),
+            "max_upstreams": self._max_upstreams,
+            "streams": [
+                {
+                    "zones": list(stream.key[0]),
+                    "types": list(stream.key[1]),
+                    "min_priority": stream.key[2],
+                    "subscribers": len(stream.subscribers),
+                    "connected": stream.connected,
+                }
+                for stream in self._streams.values()
+            ],
+            **self.stats,
+        }
+
+    async def aclose(self):
+        """Ferme tous les flux amont"""
+        tasks = [stream.task for stream in self._streams.values()]
+        self._streams.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
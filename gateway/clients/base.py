@@ -0,0 +1,107 @@
+"""
+Éléments communs aux clients des services backend
+"""
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Hashable, Optional
+import time
+import httpx
+
+from utils.cache import SWRCache
+from utils.metrics import metrics
+from utils.singleflight import SingleFlight
+
+if TYPE_CHECKING:
+    from clients.resilience import BackendGuard
+
+
+class BackendError(Exception):
+    """Erreur renvoyée (ou provoquée) par un service backend"""
+
+    def __init__(self, backend: str, message: str, status_code: Optional[int] = None):
+        super().__init__(f"[{backend}] {message}")
+        self.backend = backend
+        self.message = message
+        self.status_code = status_code
+
+
+class BackendTimeoutError(BackendError):
+    """Le service backend n'a pas répondu dans le délai imparti"""
+
+
+class BackendUnavailableError(BackendError):
+    """Le service backend est injoignable (connexion refusée, réseau...)"""
+
+
+class BackendClient:
+    """
+    Client de base : les appels identiques concurrents (backend + opération +
+    arguments) sont coalescés par un SingleFlight partagé s'il est fourni, et
+    chaque appel réel passe par le disjoncteur et la cloison du backend.
+    """
+
+    backend = "backend"
+
+    def __init__(self, singleflight: Optional[SingleFlight] = None, guard: Optional["BackendGuard"] = None):
+        self._singleflight = singleflight
+        self._guard = guard
+
+    async def _guarded(self, loader: Callable[[], Awaitable[Any]], operation: str) -> Any:
+        """Exécute `loader` derrière le disjoncteur et la cloison du backend, en mesurant sa durée"""
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            result = await (loader() if self._guard is None else self._guard.call(loader))
+            outcome = "ok"
+            return result
+        except BackendTimeoutError:
+            outcome = "timeout"
+            raise
+        finally:
+            metrics.observe_backend(self.backend, operation, outcome, time.perf_counter() - start)
+
+    async def _shared(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Exécute `loader` ou rejoint l'appel identique déjà en cours"""
+        operation = key[0] if isinstance(key, tuple) else str(key)
+        guarded_loader = lambda: self._guarded(loader, operation)
+        if self._singleflight is None:
+            return await guarded_loader()
+        return await self._singleflight.do((self.backend, key), guarded_loader)
+
+
+class HttpBackendClient(BackendClient):
+    """
+    Client de base pour les backends HTTP.
+    Le client httpx est injecté : il est partagé et réutilisé entre les requêtes
+    (pool de connexions keep-alive), jamais créé à la volée.
+    Les opérations peu volatiles passent par un cache SWR optionnel.
+    """
+
+    backend = "http"
+
+    def __init__(
+        self,
+        http: httpx.AsyncClient,
+        cache: Optional[SWRCache] = None,
+        cache_ttl: float = 0.0,
+        singleflight: Optional[SingleFlight] = None,
+        guard: Optional["BackendGuard"] = None
+    ):
+        super().__init__(singleflight, guard)
+        self._http = http
+        self._cache = cache
+        self._cache_ttl = cache_ttl
+
+    async def _cached(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Sert `loader` depuis le cache du backend s'il est configuré (coalescé sinon)"""
+        shared_loader = lambda: self._shared(key, loader)
+        if self._cache is None:
+            return await shared_loader()
+        return await self._cache.get_or_load(key, shared_loader, self._cache_ttl)
+
+    async def _request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """Envoie une requête et traduit les erreurs réseau en BackendError"""
+        try:
+            return await self._http.request(method, url, **kwargs)
+        except httpx.TimeoutException as e:
+            raise BackendTimeoutError(self.backend, f"Délai dépassé: {e!r}", 504) from e
+        except httpx.TransportError as e:
+            raise BackendUnavailableError(self.backend, f"Service injoignable: {e!r}", 503) from e
@@ -0,0 +1,98 @@
+"""
+Client du service GraphQL Événements Urbains
+"""
+from typing import Any, Dict, List, Optional
+import httpx
+
+from clients.base import BackendError, HttpBackendClient
+from clients.resilience import BackendGuard
+from utils.cache import SWRCache
+from utils.singleflight import SingleFlight
+
+EVENT_FIELDS = "id name description eventTypeId zoneId date priority status createdAt updatedAt"
+
+EVENTS_QUERY = """
+query Events($eventTypeId: String, $zoneId: String, $status: String, $priority: String) {
+  events(eventTypeId: $eventTypeId, zoneId: $zoneId, status: $status, priority: $priority) {
+    %s
+  }
+}
+""" % EVENT_FIELDS
+
+EVENT_QUERY = """
+query Event($eventId: String!) {
+  event(eventId: $eventId) { %s }
+}
+""" % EVENT_FIELDS
+
+ZONES_QUERY = "query { zones { id name description } }"
+
+EVENT_TYPES_QUERY = "query { eventTypes { id name description } }"
+
+
+class GraphQLClient(HttpBackendClient):
+    """Client asynchrone du service GraphQL, adossé au pool HTTP partagé"""
+
+    backend = "urban_events"
+
+    def __init__(
+        self,
+        http: httpx.AsyncClient,
+        url: str,
+        cache: Optional[SWRCache] = None,
+        cache_ttl: float = 0.0,
+        singleflight: Optional[SingleFlight] = None,
+        guard: Optional[BackendGuard] = None
+    ):
+        super().__init__(http, cache, cache_ttl, singleflight, guard)
+        self._url = url
+
+    async def execute(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Exécute une requête GraphQL et retourne le champ `data`"""
+        response = await self._request("POST", self._url, json={"query": query, "variables": variables or {}})
+        try:
+            payload = response.json()
+        except ValueError as e:
+            raise BackendError(self.backend, f"Réponse GraphQL invalide: {response.text[:200]}", 502) from e
+
+        if payload.get("errors"):
+            message = "; ".join(error.get("message", "") for error in payload["errors"])
+            raise BackendError(self.backend, message, 400 if response.status_code == 400 else 502)
+        if response.status_code >= 400:
+            raise BackendError(self.backend, response.text[:200], response.status_code)
+        return payload.get("data") or {}
+
+    async def get_events(
+        self,
+        event_type_id: Optional[str] = None,
+        zone_id: Optional[str] = None,
+        status: Optional[str] = None,
+        priority: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Liste des événements avec filtres optionnels"""
+        variables = {
+            "eventTypeId": event_type_id,
+            "zoneId": zone_id,
+            "status": status,
+            "priority": priority,
+        }
+        data = await self._shared(
+            ("events", event_type_id, zone_id, status, priority),
+            lambda: self.execute(EVENTS_QUERY, variables)
+        )
+        return data.get("events") or []
+
+    async def get_event(self, event_id: str) -> Optional[Dict[str, Any]]:
+        """Un événement par son ID"""
+        data = await self._shared(("event", event_id), lambda: self.execute(EVENT_QUERY, {"eventId": event_id}))
+        return data.get("event")
+
+    async def get_zones(self) -> List[Dict[str, Any]]:
+        """Liste des zones urbaines (référentiel, mis en cache)"""
+        data = await self._cached("zones", lambda: self.execute(ZONES_QUERY))
+        return data.get("zones") or []
+
+    async def get_event_types(self) -> List[Dict[str, Any]]:
+        """Liste des types d'événements (référentiel, mis en cache)"""
+        data = await self._cached("eventTypes", lambda: self.execute(EVENT_TYPES_QUERY))
+        return data.get("eventTypes") or []
@@ -0,0 +1,169 @@
+"""
+Client gRPC du service Alertes d'Urgence (EmergencyAlertService)
+"""
+from typing import Any, AsyncIterator, Dict, List, Optional
+import grpc
+
+from clients.base import BackendClient, BackendError, BackendTimeoutError, BackendUnavailableError
+from clients.resilience import BackendGuard
+from protos import emergency_pb2, emergency_pb2_grpc
+from utils.singleflight import SingleFlight
+
+# Traduction des codes gRPC en codes HTTP
+STATUS_CODE_MAPPING = {
+    grpc.StatusCode.INVALID_ARGUMENT: 400,
+    grpc.StatusCode.NOT_FOUND: 404,
+    grpc.StatusCode.DEADLINE_EXCEEDED: 504,
+    grpc.StatusCode.UNAVAILABLE: 503,
+}
+
+
+def create_channel(target: str, keepalive_time_ms: int, keepalive_timeout_ms: int) -> grpc.aio.Channel:
+    """
+    Crée le canal grpc.aio unique de la gateway.
+    Un seul canal HTTP/2 multiplexe tous les appels concurrents vers le service.
+    """
+    return grpc.aio.insecure_channel(
+        target,
+        options=[
+            ("grpc.keepalive_time_ms", keepalive_time_ms),
+            ("grpc.keepalive_timeout_ms", keepalive_timeout_ms),
+            ("grpc.keepalive_permit_without_calls", 1),
+            ("grpc.http2.max_pings_without_data", 0),
+            ("grpc.max_receive_message_length", 50 * 1024 * 1024),
+        ],
+        compression=grpc.Compression.Gzip,
+    )
+
+
+def alert_to_dict(alert: emergency_pb2.AlertResponse) -> Dict[str, Any]:
+    """Convertit un AlertResponse proto en dictionnaire JSON"""
+    return {
+        "alert_id": alert.alert_id,
+        "type": emergency_pb2.AlertType.Name(alert.type),
+        "description": alert.description,
+        "location": {
+            "latitude": alert.location.latitude,
+            "longitude": alert.location.longitude,
+            "address": alert.location.address,
+            "city": alert.location.city,
+            "zone": alert.location.zone,
+        },
+        "priority": emergency_pb2.Priority.Name(alert.priority),
+        "status": emergency_pb2.AlertStatus.Name(alert.status),
+        "reporter_name": alert.reporter_name,
+        "reporter_phone": alert.reporter_phone,
+        "affected_people": alert.affected_people,
+        "created_at": alert.created_at,
+        "updated_at": alert.updated_at,
+        "assigned_team": alert.assigned_team or None,
+        "notes": alert.notes or None,
+    }
+
+
+class EmergencyClient(BackendClient):
+    """Client asynchrone du service gRPC, adossé au canal partagé"""
+
+    backend = "emergency"
+
+    def __init__(
+        self,
+        channel: grpc.aio.Channel,
+        timeout: float,
+        singleflight: Optional[SingleFlight] = None,
+        guard: Optional[BackendGuard] = None
+    ):
+        super().__init__(singleflight, guard)
+        self._stub = emergency_pb2_grpc.EmergencyAlertServiceStub(channel)
+        self._timeout = timeout
+
+    def _map_error(self, error: grpc.aio.AioRpcError) -> BackendError:
+        """Traduit une erreur gRPC en BackendError"""
+        code = error.code()
+        message = error.details() or code.name
+        status_code = STATUS_CODE_MAPPING.get(code, 502)
+        if code == grpc.StatusCode.DEADLINE_EXCEEDED:
+            return BackendTimeoutError(self.backend, message, status_code)
+        if code == grpc.StatusCode.UNAVAILABLE:
+            return BackendUnavailableError(self.backend, message, status_code)
+        return BackendError(self.backend, message, status_code)
+
+    def _enum_value(self, enum, name: Optional[str]) -> int:
+        """Convertit un nom d'enum (ex: FIRE, HIGH) en valeur proto"""
+        if not name:
+            return 0
+        try:
+            return enum.Value(name.upper())
+        except ValueError as e:
+            raise BackendError(self.backend, f"Valeur invalide: {name}", 400) from e
+
+    async def get_active_alerts(
+        self,
+        zone: str,
+        alert_type: Optional[str] = None,
+        min_priority: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Alertes actives d'une zone (appels identiques concurrents coalescés)"""
+        request = emergency_pb2.ZoneRequest(
+            zone=zone,
+            type=self._enum_value(emergency_pb2.AlertType, alert_type),
+            min_priority=self._enum_value(emergency_pb2.Priority, min_priority),
+        )
+
+        async def call():
+            try:
+                response = await self._stub.GetActiveAlerts(request, timeout=self._timeout)
+            except grpc.aio.AioRpcError as e:
+                raise self._map_error(e) from e
+            return {
+                "zone": zone,
+                "total_count": response.total_count,
+                "alerts": [alert_to_dict(alert) for alert in response.alerts],
+            }
+
+        return await self._shared(("GetActiveAlerts", zone, request.type, request.min_priority), call)
+
+    def subscribe_request(
+        self,
+        zones: List[str],
+        types: Optional[List[str]] = None,
+        min_priority: Optional[str] = None,
+    ) -> emergency_pb2.SubscribeRequest:
+        """Construit (et valide) la requête d'abonnement SubscribeAlerts"""
+        if not zones:
+            raise BackendError(self.backend, "Au moins une zone est requise", 400)
+        return emergency_pb2.SubscribeRequest(
+            zones=sorted(set(zones)),
+            types=sorted({self._enum_value(emergency_pb2.AlertType, t) for t in types or []}),
+            min_priority=self._enum_value(emergency_pb2.Priority, min_priority),
+        )
+
+    async def subscribe_alerts(self, request: emergency_pb2.SubscribeRequest) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Flux SubscribeAlerts (sans délai : abonnement longue durée).
+        Chaque flux ouvert occupe un thread du serveur gRPC jusqu'à sa fermeture.
+        """
+        call = self._stub.SubscribeAlerts(request)
+        try:
+            async for alert in call:
+                yield alert_to_dict(alert)
+        except grpc.aio.AioRpcError as e:
+            raise self._map_error(e) from e
+        finally:
+            call.cancel()
+
+    async def health_check(self) -> Dict[str, Any]:
+        """État de santé du service gRPC"""
+        async def call():
+            try:
+                return await self._stub.HealthCheck(emergency_pb2.HealthCheckRequest(), timeout=self._timeout)
+            except grpc.aio.AioRpcError as e:
+                raise self._map_error(e) from e
+
+        response = await self._guarded(call, "HealthCheck")
+        return {
+            "status": response.status,
+            "version": response.version,
+            "active_alerts": response.active_alerts,
+            "subscribers": response.subscribers,
+        }
@@ -0,0 +1,122 @@
+"""
+Cycle de vie des clients backend de la gateway
+Les pools de connexions sont créés une seule fois (lifespan) puis réutilisés.
+"""
+import logging
+import httpx
+from fastapi import Request
+
+from clients.alert_stream import AlertStreamHub
+from clients.graphql_client import GraphQLClient
+from clients.grpc_client import EmergencyClient, create_channel
+from clients.mobility_client import MobilityClient
+from clients.resilience import BackendGuard, Bulkhead, CircuitBreaker
+from clients.soap_client import SoapClient
+from config.settings import Settings
+from utils.cache import SWRCache
+from utils.singleflight import SingleFlight
+
+logger = logging.getLogger("api-gateway")
+
+
+class BackendClients:
+    """Conteneur des clients backend partagés par toutes les routes"""
+
+    def __init__(self, settings: Settings):
+        # Pool HTTP partagé entre le REST Mobilité et le GraphQL
+        self._http = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_keepalive_connections,
+                keepalive_expiry=settings.http_keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(settings.http_timeout),
+        )
+        # Session keep-alive dédiée au SOAP
+        self._soap_http = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.soap_max_connections,
+                max_keepalive_connections=settings.soap_max_connections,
+                keepalive_expiry=settings.http_keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(settings.soap_timeout),
+        )
+        # Canal gRPC unique (multiplexage HTTP/2)
+        self._channel = create_channel(
+            settings.emergency_service_target,
+            settings.grpc_keepalive_time_ms,
+            settings.grpc_keepalive_timeout_ms,
+        )
+
+        # Un cache par backend, devant le client
+        self.caches = {
+            name: SWRCache(name, settings.cache_max_entries, settings.cache_stale_ttl)
+            for name in ("mobility", "air_quality", "urban_events")
+        }
+        # Coalescence des appels identiques en cours, clé = backend + opération + arguments
+        self.singleflight = SingleFlight()
+        # Disjoncteur et cloison par backend : un service lent n'accapare pas la gateway
+        self.guards = {
+            name: BackendGuard(
+                CircuitBreaker(name, settings.breaker_failure_threshold, settings.breaker_recovery_timeout),
+                Bulkhead(name, max_concurrent, settings.bulkhead_max_wait),
+            )
+            for name, max_concurrent in (
+                ("mobility", settings.bulkhead_mobility_max_concurrent),
+                # Pas plus d'appels SOAP simultanés que de connexions de sa session
+                ("air_quality", min(settings.bulkhead_air_quality_max_concurrent, settings.soap_max_connections)),
+                ("emergency", settings.bulkhead_emergency_max_concurrent),
+                ("urban_events", settings.bulkhead_urban_events_max_concurrent),
+            )
+        }
+
+        self.mobility = MobilityClient(
+            self._http, settings.mobility_service_url,
+            self.caches["mobility"], settings.cache_lignes_ttl, self.singleflight, self.guards["mobility"]
+        )
+        self.urban_events = GraphQLClient(
+            self._http, settings.urban_events_service_url,
+            self.caches["urban_events"], settings.cache_referentiel_ttl, self.singleflight,
+            self.guards["urban_events"]
+        )
+        self.air_quality = SoapClient(
+            self._soap_http, settings.air_quality_service_url,
+            self.caches["air_quality"], settings.cache_aqi_ttl, self.singleflight, self.guards["air_quality"]
+        )
+        self.emergency = EmergencyClient(
+            self._channel, settings.grpc_timeout, self.singleflight, self.guards["emergency"]
+        )
+        # Un flux SubscribeAlerts par filtre distinct, partagé entre les navigateurs
+        self.alert_hub = AlertStreamHub(
+            self.emergency,
+            settings.alert_stream_queue_size,
+            settings.alert_stream_replay_size,
+            settings.alert_stream_max_upstreams,
+            settings.alert_stream_retry_max_delay,
+        )
+        logger.info("🔌 Clients backend initialisés (pools HTTP, session SOAP, canal gRPC)")
+
+    async def aclose(self):
+        """Ferme proprement les pools de connexions"""
+        for cache in self.caches.values():
+            cache.clear()
+        await self.alert_hub.aclose()
+        await self._http.aclose()
+        await self._soap_http.aclose()
+        await self._channel.close()
+        logger.info("🔌 Clients backend fermés")
+
+    def cache_stats(self) -> dict:
+        """Compteurs hit/miss/refresh de chaque cache et de la coalescence"""
+        stats = {name: cache.snapshot() for name, cache in self.caches.items()}
+        stats["singleflight"] = self.singleflight.snapshot()
+        return stats
+
+    def backend_states(self) -> dict:
+        """État du disjoncteur et occupation de la cloison de chaque backend"""
+        return {name: guard.snapshot() for name, guard in self.guards.items()}
+
+
+def get_clients(request: Request) -> BackendClients:
+    """Dépendance FastAPI : clients backend créés dans le lifespan"""
+    return request.app.state.clients
@@ -0,0 +1,55 @@
+"""
+Client REST du service Mobilité (FastAPI)
+"""
+from typing import Any, Dict, List, Optional
+import httpx
+
+from clients.base import BackendError, HttpBackendClient
+from clients.resilience import BackendGuard
+from utils.cache import SWRCache
+from utils.singleflight import SingleFlight
+
+
+class MobilityClient(HttpBackendClient):
+    """Client asynchrone du service Mobilité, adossé au pool HTTP partagé"""
+
+    backend = "mobility"
+
+    def __init__(
+        self,
+        http: httpx.AsyncClient,
+        base_url: str,
+        cache: Optional[SWRCache] = None,
+        cache_ttl: float = 0.0,
+        singleflight: Optional[SingleFlight] = None,
+        guard: Optional[BackendGuard] = None
+    ):
+        super().__init__(http, cache, cache_ttl, singleflight, guard)
+        self._base_url = base_url.rstrip("/")
+
+    async def _get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """GET JSON sur le service Mobilité"""
+        response = await self._request("GET", f"{self._base_url}{path}", params=params)
+        if response.status_code >= 400:
+            try:
+                detail = response.json().get("detail", response.text)
+            except ValueError:
+                detail = response.text
+            raise BackendError(self.backend, str(detail), response.status_code)
+        return response.json()
+
+    async def get_lignes(self) -> List[Dict[str, Any]]:
+        """Liste des lignes de transport (catalogue peu volatil, mis en cache)"""
+        return await self._cached("lignes", lambda: self._get("/lignes"))
+
+    async def get_horaires(self, ligne: str) -> Dict[str, Any]:
+        """Horaires d'une ligne"""
+        return await self._shared(("horaires", ligne), lambda: self._get(f"/horaires/{ligne}"))
+
+    async def get_trafic(self) -> Dict[str, Any]:
+        """État du trafic en temps réel (non mis en cache, mais coalescé)"""
+        return await self._shared("trafic", lambda: self._get("/trafic"))
+
+    async def get_disponibilite(self) -> Dict[str, Any]:
+        """Disponibilité des véhicules (non mise en cache, mais coalescée)"""
+        return await self._shared("disponibilite", lambda: self._get("/disponibilite"))
@@ -0,0 +1,170 @@
+"""
+Isolation des pannes par backend : disjoncteur (circuit breaker) et cloison (bulkhead)
+Un backend lent ou en panne ne doit ni bloquer les autres routes ni épuiser la gateway.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from clients.base import BackendError, BackendUnavailableError
+
+logger = logging.getLogger("api-gateway")
+
+
+class CircuitOpenError(BackendUnavailableError):
+    """Le disjoncteur du backend est ouvert : appel refusé sans contacter le service"""
+
+
+class BulkheadFullError(BackendUnavailableError):
+    """Trop d'appels simultanés vers le backend : appel refusé"""
+
+
+def is_backend_failure(error: BaseException) -> bool:
+    """Seules les pannes du service comptent (réseau, délai, 5xx), pas les erreurs client (4xx)"""
+    if not isinstance(error, BackendError):
+        return True
+    return error.status_code is None or error.status_code >= 500
+
+
+class CircuitBreaker:
+    """
+    Disjoncteur à trois états:
+    - closed: les appels passent, les échecs consécutifs sont comptés
+    - open: après `failure_threshold` échecs, les appels sont refusés immédiatement
+    - half_open: après `recovery_timeout` secondes, un appel sonde est autorisé ;
+      son succès referme le circuit, son échec le rouvre
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probe_in_flight = False
+        self.stats = {"successes": 0, "failures": 0, "rejected": 0, "opened": 0}
+
+    def before_call(self):
+        """Autorise l'appel ou lève CircuitOpenError"""
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.recovery_timeout:
+                self._reject()
+            self.state = self.HALF_OPEN
+            logger.info(f"🔌 Disjoncteur {self.name}: half-open, appel sonde autorisé")
+        if self.state == self.HALF_OPEN:
+            if self._probe_in_flight:
+                self._reject()
+            self._probe_in_flight = True
+
+    def record_success(self):
+        self.stats["successes"] += 1
+        if self.state != self.CLOSED:
+            logger.info(f"✅ Disjoncteur {self.name}: fermé")
+        self.state = self.CLOSED
+        self.failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        self.stats["failures"] += 1
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self._open()
+        self._probe_in_flight = False
+
+    def release(self):
+        """Libère la sonde d'un appel qui n'a pas abouti (annulé, refusé par la cloison)"""
+        self._probe_in_flight = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        """État du disjoncteur pour le health check"""
+        retry_in = None
+        if self.state == self.OPEN:
+            retry_in = round(max(0.0, self.recovery_timeout - (time.monotonic() - self.opened_at)), 2)
+        return {"state": self.state, "consecutive_failures": self.failures, "retry_in": retry_in, **self.stats}
+
+    def _open(self):
+        if self.state != self.OPEN:
+            self.stats["opened"] += 1
+            logger.warning(f"⚠️ Disjoncteur {self.name}: ouvert après {self.failures} échec(s)")
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+
+    def _reject(self):
+        self.stats["rejected"] += 1
+        raise CircuitOpenError(self.name, "Circuit ouvert, service temporairement désactivé", 503)
+
+
+class Bulkhead:
+    """
+    Cloison : borne le nombre d'appels simultanés vers un backend.
+    Au-delà, l'appel attend au plus `max_wait` secondes une place puis est refusé.
+    """
+
+    def __init__(self, name: str, max_concurrent: int, max_wait: float = 0.1):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_wait = max_wait
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self.active = 0
+        self.stats = {"rejected": 0}
+
+    async def acquire(self):
+        # asyncio.timeout annule l'acquisition dans la tâche courante : contrairement
+        # à wait_for (< 3.12), une place obtenue au moment du timeout n'est pas perdue
+        try:
+            async with asyncio.timeout(self.max_wait):
+                await self._semaphore.acquire()
+        except TimeoutError:
+            self.stats["rejected"] += 1
+            raise BulkheadFullError(
+                self.name, f"Limite de {self.max_concurrent} appels simultanés atteinte", 503
+            ) from None
+        self.active += 1
+
+    def release(self):
+        self.active -= 1
+        self._semaphore.release()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"max_concurrent": self.max_concurrent, "active": self.active, **self.stats}
+
+
+class BackendGuard:
+    """Disjoncteur + cloison d'un backend, appliqués autour de chaque appel réel"""
+
+    def __init__(self, breaker: CircuitBreaker, bulkhead: Bulkhead):
+        self.breaker = breaker
+        self.bulkhead = bulkhead
+
+    async def call(self, loader: Callable[[], Awaitable[Any]]) -> Any:
+        self.breaker.before_call()
+        try:
+            await self.bulkhead.acquire()
+        except (BulkheadFullError, asyncio.CancelledError):
+            # Refus ou annulation pendant l'attente d'une place : la sonde éventuelle est libérée
+            self.breaker.release()
+            raise
+        try:
+            result = await loader()
+        except asyncio.CancelledError:
+            self.breaker.release()
+            raise
+        except Exception as e:
+            if is_backend_failure(e):
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            raise
+        finally:
+            self.bulkhead.release()
+        self.breaker.record_success()
+        return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"circuit": self.breaker.snapshot(), "bulkhead": self.bulkhead.snapshot()}
@@ -0,0 +1,120 @@
+"""
+Client du service SOAP Qualité de l'Air (Spyne)
+"""
+from typing import Any, Dict, Optional
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+import httpx
+
+from clients.base import BackendError, HttpBackendClient
+from clients.resilience import BackendGuard
+from utils.cache import SWRCache
+from utils.singleflight import SingleFlight
+
+SOAP_ENV_NS = "http://schemas.xmlsoap.org/soap/envelope/"
+SERVICE_NS = "http://smartcity.air-quality.soap"
+
+ENVELOPE_TEMPLATE = (
+    '<soapenv:Envelope xmlns:soapenv="' + SOAP_ENV_NS + '" xmlns:tns="' + SERVICE_NS + '">'
+    "<soapenv:Header/>"
+    "<soapenv:Body><tns:{operation}>{params}</tns:{operation}></soapenv:Body>"
+    "</soapenv:Envelope>"
+)
+
+
+def _local_name(tag: str) -> str:
+    """Supprime le namespace d'un tag XML ({ns}nom -> nom)"""
+    return tag.rsplit("}", 1)[-1]
+
+
+def _element_to_python(element: ElementTree.Element) -> Any:
+    """
+    Convertit un élément de réponse Spyne en structure Python.
+    Les tableaux Spyne (ex: <pollutants><Pollutant/>...</pollutants>) deviennent des listes.
+    """
+    children = list(element)
+    if not children:
+        return element.text
+    names = {_local_name(child.tag) for child in children}
+    if len(names) == 1 and next(iter(names))[0].isupper():
+        return [_element_to_python(child) for child in children]
+    return {_local_name(child.tag): _element_to_python(child) for child in children}
+
+
+class SoapClient(HttpBackendClient):
+    """
+    Client du service SOAP Air Quality.
+    Utilise une session HTTP keep-alive dédiée, limitée en connexions car le
+    backend (wsgiref) ne traite qu'une requête à la fois.
+    """
+
+    backend = "air_quality"
+
+    def __init__(
+        self,
+        http: httpx.AsyncClient,
+        url: str,
+        cache: Optional[SWRCache] = None,
+        cache_ttl: float = 0.0,
+        singleflight: Optional[SingleFlight] = None,
+        guard: Optional[BackendGuard] = None
+    ):
+        super().__init__(http, cache, cache_ttl, singleflight, guard)
+        self._url = url
+
+    async def call(self, operation: str, **params: Any) -> Any:
+        """Appelle une opération SOAP et retourne le contenu de <operation>Result"""
+        body = "".join(
+            f"<tns:{name}>{escape(str(value))}</tns:{name}>" for name, value in params.items()
+        )
+        envelope = ENVELOPE_TEMPLATE.format(operation=operation, params=body)
+        response = await self._request(
+            "POST",
+            self._url,
+            content=envelope.encode("utf-8"),
+            headers={"Content-Type": "text/xml; charset=utf-8", "SOAPAction": operation},
+        )
+        return self._parse_response(operation, response)
+
+    def _parse_response(self, operation: str, response: httpx.Response) -> Any:
+        """Extrait le résultat ou traduit un Fault SOAP en BackendError"""
+        try:
+            root = ElementTree.fromstring(response.content)
+        except ElementTree.ParseError as e:
+            raise BackendError(self.backend, f"Réponse SOAP invalide: {e}", 502) from e
+
+        fault = root.find(f".//{{{SOAP_ENV_NS}}}Fault")
+        if fault is not None:
+            faultcode = fault.findtext("faultcode", default="")
+            faultstring = fault.findtext("faultstring", default="Fault SOAP")
+            if "Client" in faultcode:
+                status_code = 400
+            elif "introuvable" in faultstring:
+                status_code = 404
+            else:
+                status_code = 502
+            raise BackendError(self.backend, faultstring, status_code)
+
+        result = root.find(f".//{{{SERVICE_NS}}}{operation}Result")
+        if result is None:
+            raise BackendError(self.backend, f"Résultat {operation} absent de la réponse", 502)
+        return _element_to_python(result)
+
+    async def get_aqi(self, zone: str) -> Dict[str, Any]:
+        """Indice de qualité de l'air d'une zone (mis en cache par zone)"""
+        return await self._cached(("GetAQI", zone), lambda: self.call("GetAQI", zone=zone))
+
+    async def get_pollutants(self, zone: str) -> Dict[str, Any]:
+        """Mesures des polluants d'une zone"""
+        return await self._shared(("GetPollutants", zone), lambda: self.call("GetPollutants", zone=zone))
+
+    async def compare_zones(self, zone_a: str, zone_b: str) -> Dict[str, Any]:
+        """Comparaison de deux zones"""
+        return await self._shared(
+            ("CompareZones", zone_a, zone_b),
+            lambda: self.call("CompareZones", zoneA=zone_a, zoneB=zone_b)
+        )
+
+    async def health_check(self) -> Dict[str, Any]:
+        """État de santé du service SOAP"""
+        return await self._guarded(lambda: self.call("HealthCheck"), "HealthCheck")
@@ -0,0 +1,81 @@
+"""
+Configuration centralisée de l'API Gateway
+"""
+from typing import List
+from pydantic_settings import BaseSettings
+
+class Settings(BaseSettings):
+    app_name: str = "API Gateway - Plateforme Urbaine Intelligente"
+    app_version: str = "1.0.0"
+    debug: bool = True
+    host: str = "0.0.0.0"
+    port: int = 8080
+
+    # Adresses des services backend
+    mobility_service_url: str = "http://localhost:8000"
+    air_quality_service_url: str = "http://localhost:8081/"
+    emergency_service_target: str = "localhost:50051"
+    urban_events_service_url: str = "http://localhost:8004/graphql"
+
+    # Pool HTTP partagé (REST Mobilité + GraphQL)
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 30.0
+    http_timeout: float = 5.0
+
+    # Session SOAP persistante (serveur wsgiref mono-thread côté backend)
+    soap_max_connections: int = 4
+    soap_timeout: float = 5.0
+
+    # Canal gRPC multiplexé
+    grpc_timeout: float = 5.0
+    grpc_keepalive_time_ms: int = 30000
+    grpc_keepalive_timeout_ms: int = 10000
+
+    # Cache stale-while-revalidate (TTL en secondes, 0 = désactivé)
+    cache_max_entries: int = 1024
+    cache_stale_ttl: float = 300.0
+    cache_lignes_ttl: float = 60.0
+    cache_aqi_ttl: float = 30.0
+    cache_referentiel_ttl: float = 600.0
+
+    # Disjoncteur par backend : échecs consécutifs avant ouverture, délai avant sonde (secondes)
+    breaker_failure_threshold: int = 5
+    breaker_recovery_timeout: float = 30.0
+
+    # Cloison par backend : appels simultanés maximum, attente maximale d'une place (secondes)
+    # (SOAP : bornée à soap_max_connections, les appels en trop attendraient dans le pool httpx)
+    bulkhead_mobility_max_concurrent: int = 50
+    bulkhead_air_quality_max_concurrent: int = 4
+    bulkhead_emergency_max_concurrent: int = 50
+    bulkhead_urban_events_max_concurrent: int = 50
+    bulkhead_max_wait: float = 0.1
+
+    # Diffusion des alertes temps réel (SSE / WebSocket)
+    alert_stream_queue_size: int = 100
+    alert_stream_replay_size: int = 100
+    alert_stream_max_upstreams: int = 5
+    alert_stream_heartbeat: float = 15.0
+    alert_stream_retry_max_delay: float = 30.0
+
+    # Tableau de bord : zones interrogées et délai maximal par backend (secondes)
+    air_quality_zones: List[str] = ["downtown", "industrial", "residential", "park"]
+    emergency_zones: List[str] = ["Zone Centre", "Zone Nord", "Zone Sud"]
+    dashboard_mobility_timeout: float = 1.0
+    dashboard_air_quality_timeout: float = 1.5
+    dashboard_emergency_timeout: float = 1.0
+    dashboard_urban_events_timeout: float = 1.0
+
+    # Requêtes groupées (POST /batch)
+    batch_max_requests: int = 50
+    batch_timeout: float = 5.0
+
+    # Encodage des réponses : compression au-delà de `compression_min_size` octets
+    compression_min_size: int = 1024
+    gzip_level: int = 5
+    brotli_quality: int = 4
+
+    class Config:
+        env_file = ".env"
+
+settings = Settings()
@@ -0,0 +1,168 @@
+"""
+Point d'entrée principal de l'API Gateway
+Façade unique vers les services de la plateforme urbaine intelligente
+"""
+from fastapi import FastAPI, Depends
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+from contextlib import asynccontextmanager
+
+# Import des routes
+from routers import mobility, air_quality, urban_events, emergency, dashboard, batch
+
+# Clients backend et gestion des erreurs
+from clients.manager import BackendClients, get_clients
+from middleware.error_handler import register_error_handlers
+from middleware.logging_middleware import TimingMiddleware
+
+# Import de la configuration
+from config.settings import settings
+from utils.logger import setup_logger, shutdown_logger
+from utils.metrics import metrics, render_gauge
+
+# Configuration du logging
+logger = setup_logger("api-gateway")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Gestion du cycle de vie : création unique des pools de connexions"""
+    logger.info("🚀 Démarrage de l'API Gateway")
+    logger.info(f"📍 Version: {settings.app_version}")
+
+    app.state.clients = BackendClients(settings)
+
+    yield
+
+    await app.state.clients.aclose()
+    logger.info("🛑 Arrêt de l'API Gateway")
+    shutdown_logger()
+
+# Création de l'application FastAPI
+app = FastAPI(
+    title=settings.app_name,
+    description="""
+    ## API Gateway de la plateforme urbaine intelligente
+
+    Point d'entrée unique vers les services:
+
+    * 🚌 **Mobilité** (REST) - `/mobility`
+    * 🌫️ **Qualité de l'air** (SOAP) - `/air-quality`
+    * 🚨 **Alertes d'urgence** (gRPC) - `/emergency`
+    * 🏙️ **Événements urbains** (GraphQL) - `/events`
+    * 📊 **Tableau de bord agrégé** - `/dashboard`
+    * 📦 **Requêtes groupées** (NDJSON) - `/batch`
+    """,
+    version=settings.app_version,
+    lifespan=lifespan,
+    docs_url="/docs",
+    redoc_url="/redoc",
+    openapi_url="/openapi.json"
+)
+
+# Configuration CORS
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],  # À restreindre en production
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+# Mesure des latences par route (ASGI pur, compatible streaming)
+app.add_middleware(TimingMiddleware)
+
+# Gestion des erreurs
+register_error_handlers(app)
+
+# Enregistrement des routes
+app.include_router(mobility.router)
+app.include_router(air_quality.router)
+app.include_router(urban_events.router)
+app.include_router(emergency.router)
+app.include_router(dashboard.router)
+app.include_router(batch.router)
+
+# ============================================================================
+# ROUTES SYSTÈME
+# ============================================================================
+
+@app.get("/", tags=["Système"], summary="Page d'accueil")
+async def root():
+    """Informations de base de la gateway"""
+    return {
+        "service": settings.app_name,
+        "version": settings.app_version,
+        "status": "operational",
+        "documentation": "/docs",
+        "endpoints": {
+            "mobility": "/mobility",
+            "air_quality": "/air-quality",
+            "emergency": "/emergency",
+            "events": "/events",
+            "dashboard": "/dashboard",
+            "batch": "/batch"
+        }
+    }
+
+@app.get("/health", tags=["Système"], summary="Health check")
+async def health_check(clients: BackendClients = Depends(get_clients)):
+    """
+    Endpoint de vérification de santé de la gateway.
+    `degraded` si au moins un disjoncteur backend n'est pas fermé.
+    """
+    backends = clients.backend_states()
+    degraded = any(state["circuit"]["state"] != "closed" for state in backends.values())
+    return {
+        "status": "degraded" if degraded else "healthy",
+        "service": settings.app_name,
+        "version": settings.app_version,
+        "backends": backends
+    }
+
+@app.get("/cache/stats", tags=["Système"], summary="Statistiques du cache")
+async def cache_stats(clients: BackendClients = Depends(get_clients)):
+    """
+    Compteurs des caches stale-while-revalidate, par backend:
+    hits, stale_hits, misses, refreshes, refresh_errors, evictions.
+    La clé `singleflight` donne les appels coalescés (calls, shared, inflight).
+    """
+    return clients.cache_stats()
+
+@app.get("/metrics", tags=["Système"], summary="Métriques Prometheus", response_class=PlainTextResponse)
+async def prometheus_metrics(clients: BackendClients = Depends(get_clients)):
+    """
+    Latences par route et par appel backend (histogrammes et quantiles p50/p95/p99),
+    état des disjoncteurs, au format texte Prometheus.
+    """
+    circuit_states = render_gauge(
+        "gateway_backend_circuit_open",
+        "1 si le disjoncteur du backend n'est pas fermé",
+        (
+            ({"backend": name}, int(state["circuit"]["state"] != "closed"))
+            for name, state in clients.backend_states().items()
+        ),
+    )
+    return PlainTextResponse(
+        metrics.render_prometheus(circuit_states),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+@app.get("/metrics/summary", tags=["Système"], summary="Résumé des latences")
+async def metrics_summary():
+    """Nombre d'appels, moyenne et p50/p95/p99 (ms) par route et par backend"""
+    return metrics.snapshot()
+
+# ============================================================================
+# POINT D'ENTRÉE POUR EXÉCUTION DIRECTE
+# ============================================================================
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(
+        "main:app",
+        host=settings.host,
+        port=settings.port,
+        reload=settings.debug,
+        log_level="info"
+    )
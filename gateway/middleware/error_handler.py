@@ -0,0 +1,48 @@
+"""
+Gestionnaires d'erreurs de la gateway
+Traduit les erreurs des services backend en réponses HTTP homogènes.
+"""
+import logging
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
+
+from clients.base import BackendError
+from config.settings import settings
+
+logger = logging.getLogger("api-gateway")
+
+async def backend_error_handler(request: Request, exc: BackendError):
+    """Erreur remontée par un client backend"""
+    status_code = exc.status_code or status.HTTP_502_BAD_GATEWAY
+    if status_code >= 500:
+        logger.error(f"Erreur backend {exc.backend}: {exc.message}")
+    else:
+        logger.info(f"Erreur backend {exc.backend} ({status_code}): {exc.message}")
+
+    return JSONResponse(
+        status_code=status_code,
+        content={
+            "error": "Erreur du service backend",
+            "backend": exc.backend,
+            "message": exc.message,
+            "path": str(request.url)
+        }
+    )
+
+async def global_exception_handler(request: Request, exc: Exception):
+    """Gestionnaire d'erreurs global pour capturer toutes les exceptions non gérées"""
+    logger.error(f"Erreur non gérée: {exc}", exc_info=True)
+
+    return JSONResponse(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        content={
+            "error": "Erreur interne de la gateway",
+            "message": str(exc) if settings.debug else "Une erreur s'est produite",
+            "path": str(request.url)
+        }
+    )
+
+def register_error_handlers(app: FastAPI):
+    """Enregistre les gestionnaires d'erreurs sur l'application"""
+    app.add_exception_handler(BackendError, backend_error_handler)
+    app.add_exception_handler(Exception, global_exception_handler)
@@ -0,0 +1,56 @@
+"""
+Middleware ASGI de mesure et de journalisation des requêtes
+Implémenté en ASGI pur (et non BaseHTTPMiddleware) : pas de tâche ni de file
+intermédiaire par requête, et les réponses en streaming (SSE) ne sont pas bufferisées.
+"""
+import logging
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from utils.metrics import MetricsRegistry, metrics
+
+logger = logging.getLogger("api-gateway")
+
+# Routes non mesurées (sinon le scraping Prometheus se mesure lui-même)
+EXCLUDED_PATHS = {"/metrics"}
+
+
+class TimingMiddleware:
+    """
+    Mesure la durée de chaque requête HTTP et l'enregistre par route (template,
+    ex: /mobility/horaires/{ligne}) pour borner la cardinalité des métriques.
+    Ajoute l'en-tête X-Process-Time (temps jusqu'à l'envoi des en-têtes).
+    """
+
+    def __init__(self, app: ASGIApp, registry: MetricsRegistry = metrics):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"] in EXCLUDED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"x-process-time", f"{time.perf_counter() - start:.6f}".encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            self.registry.observe_request(scope["method"], route_path, status_code, duration)
+            logger.info(
+                f"{scope['method']} {scope['path']} - Status: {status_code} - Durée: {duration * 1000:.1f}ms"
+            )
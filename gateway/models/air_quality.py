@@ -0,0 +1,39 @@
+"""
+Schémas Pydantic des réponses du service Qualité de l'Air
+Les valeurs sont transmises telles que décodées du XML SOAP (texte).
+"""
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+class AQIResult(BaseModel):
+    """Indice de qualité de l'air d'une zone"""
+    zone: str
+    aqi: str = Field(..., example="85")
+    category: str = Field(..., example="Moderate")
+    timestamp: str
+    description: Optional[str] = None
+
+class Pollutant(BaseModel):
+    """Mesure d'un polluant"""
+    name: str = Field(..., example="PM2.5")
+    value: str
+    unit: str
+    timestamp: str
+    status: str
+
+class PollutantsResult(BaseModel):
+    """Polluants mesurés dans une zone"""
+    zone: str
+    pollutants: Optional[List[Pollutant]] = None
+    timestamp: str
+
+class ZoneComparison(BaseModel):
+    """Comparaison de deux zones"""
+    zoneA: str
+    zoneB: str
+    aqiA: str
+    aqiB: str
+    cleanest_zone: str
+    difference: str
+    recommendations: Optional[str] = None
+    timestamp: str
@@ -0,0 +1,23 @@
+"""
+Schémas Pydantic des requêtes groupées (POST /batch)
+"""
+from pydantic import BaseModel, Field
+from typing import Any, List, Optional
+
+class BatchRequest(BaseModel):
+    """Liste de sous-requêtes exécutées en parallèle"""
+    requests: List[str] = Field(
+        ...,
+        min_length=1,
+        description="Sous-requêtes au format ressource/paramètre",
+        example=["horaires/L1", "aqi/downtown", "alerts/Zone Centre"]
+    )
+
+class BatchResult(BaseModel):
+    """Résultat d'une sous-requête (une ligne NDJSON)"""
+    index: int = Field(..., description="Position de la sous-requête dans la liste")
+    request: str
+    status: int = Field(..., description="Code HTTP équivalent (200, 404, 504...)")
+    duration_ms: float
+    data: Optional[Any] = None
+    error: Optional[str] = None
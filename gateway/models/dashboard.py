@@ -0,0 +1,25 @@
+"""
+Schémas Pydantic du tableau de bord agrégé
+"""
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+
+class BackendStatus(BaseModel):
+    """État d'un appel backend lors de l'agrégation"""
+    name: str = Field(..., description="Appel concerné", example="air_quality:downtown")
+    status: str = Field(..., description="ok, timeout ou error")
+    duration_ms: float
+    error: Optional[str] = None
+
+class DashboardResponse(BaseModel):
+    """Vue agrégée de la ville, éventuellement partielle"""
+    timestamp: datetime
+    degraded: bool = Field(..., description="Vrai si au moins un backend a échoué ou expiré")
+    duration_ms: float
+    trafic: Optional[List[Dict[str, Any]]] = Field(None, description="État du trafic (REST Mobilité)")
+    disponibilite: Optional[List[Dict[str, Any]]] = Field(None, description="Disponibilité des véhicules (REST Mobilité)")
+    air_quality: List[Dict[str, Any]] = Field(default_factory=list, description="AQI par zone (SOAP)")
+    alerts: List[Dict[str, Any]] = Field(default_factory=list, description="Alertes actives (gRPC)")
+    events: Optional[List[Dict[str, Any]]] = Field(None, description="Événements urbains (GraphQL)")
+    backends: List[BackendStatus]
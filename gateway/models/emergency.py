@@ -0,0 +1,35 @@
+"""
+Schémas Pydantic des alertes d'urgence (conversion des messages gRPC)
+"""
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+class Location(BaseModel):
+    """Localisation d'une alerte"""
+    latitude: float
+    longitude: float
+    address: str
+    city: str
+    zone: str = Field(..., example="Zone Centre")
+
+class Alert(BaseModel):
+    """Alerte d'urgence"""
+    alert_id: str
+    type: str = Field(..., description="ACCIDENT, FIRE, MEDICAL, ...")
+    description: str
+    location: Location
+    priority: str = Field(..., description="LOW, MEDIUM, HIGH, CRITICAL")
+    status: str
+    reporter_name: str
+    reporter_phone: str
+    affected_people: int
+    created_at: str
+    updated_at: str
+    assigned_team: Optional[str] = None
+    notes: Optional[str] = None
+
+class ZoneAlerts(BaseModel):
+    """Alertes actives d'une zone"""
+    zone: str
+    total_count: int
+    alerts: List[Alert]
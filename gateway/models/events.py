@@ -0,0 +1,30 @@
+"""
+Schémas Pydantic des événements urbains (champs GraphQL)
+"""
+from pydantic import BaseModel, Field
+from typing import Optional
+
+class Event(BaseModel):
+    """Événement urbain"""
+    id: str
+    name: str
+    description: Optional[str] = None
+    eventTypeId: str
+    zoneId: str
+    date: Optional[str] = None
+    priority: str = Field(..., description="LOW, MEDIUM, HIGH, CRITICAL")
+    status: str = Field(..., description="PENDING, IN_PROGRESS, RESOLVED, CANCELLED")
+    createdAt: Optional[str] = None
+    updatedAt: Optional[str] = None
+
+class Zone(BaseModel):
+    """Zone urbaine"""
+    id: str
+    name: str
+    description: Optional[str] = None
+
+class EventType(BaseModel):
+    """Type d'événement"""
+    id: str
+    name: str
+    description: Optional[str] = None
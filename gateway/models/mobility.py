@@ -0,0 +1,62 @@
+"""
+Schémas Pydantic des réponses du service Mobilité (documentation des routes)
+"""
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+
+class Ligne(BaseModel):
+    """Ligne de transport"""
+    id: str
+    numero: str = Field(..., example="L1")
+    nom: str
+    type_transport: str = Field(..., description="bus, metro, train, tramway")
+    terminus_debut: str
+    terminus_fin: str
+    actif: bool = True
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+class Horaire(BaseModel):
+    """Horaire de passage"""
+    id: str
+    ligne_id: str
+    destination: str
+    heure_depart: str = Field(..., example="08:00")
+    heure_arrivee: str = Field(..., example="08:25")
+    station: str
+    quai: str
+
+class HorairesResponse(BaseModel):
+    """Horaires d'une ligne"""
+    ligne: str
+    nombre_horaires: int
+    horaires: List[Horaire]
+
+class EtatTrafic(BaseModel):
+    """État du trafic d'une ligne"""
+    ligne_id: str
+    statut: str = Field(..., description="normal, retard, annule, perturbe")
+    retard_minutes: int = 0
+    message: str = ""
+    timestamp: datetime
+
+class TraficResponse(BaseModel):
+    """État du trafic de toutes les lignes"""
+    derniere_maj: datetime
+    nombre_lignes: int
+    trafic: List[EtatTrafic]
+
+class Disponibilite(BaseModel):
+    """Disponibilité des véhicules d'une ligne"""
+    ligne_id: str
+    vehicules_total: int
+    vehicules_en_service: int
+    taux_disponibilite: float
+    derniere_maj: datetime
+
+class DisponibiliteResponse(BaseModel):
+    """Disponibilité des véhicules de toutes les lignes"""
+    timestamp: datetime
+    nombre_lignes: int
+    disponibilites: List[Disponibilite]
@@ -0,0 +1,38 @@
+"""
+Routes de la gateway vers le service SOAP Qualité de l'Air
+"""
+from fastapi import APIRouter, Depends, Path, Query, Request
+
+from clients.manager import BackendClients, get_clients
+from models.air_quality import AQIResult, PollutantsResult, ZoneComparison
+from utils.encoding import respond
+
+router = APIRouter(prefix="/air-quality", tags=["Qualité de l'air"])
+
+@router.get("/aqi/{zone}", response_model=AQIResult, summary="Indice de qualité de l'air d'une zone")
+async def get_aqi(
+    request: Request,
+    zone: str = Path(..., description="Zone (ex: downtown, park)"),
+    clients: BackendClients = Depends(get_clients)
+):
+    """Indice AQI d'une zone (opération SOAP `GetAQI`)"""
+    return respond(request, await clients.air_quality.get_aqi(zone))
+
+@router.get("/pollutants/{zone}", response_model=PollutantsResult, summary="Polluants mesurés dans une zone")
+async def get_pollutants(
+    request: Request,
+    zone: str = Path(..., description="Zone (ex: downtown, park)"),
+    clients: BackendClients = Depends(get_clients)
+):
+    """Mesures des polluants d'une zone (opération SOAP `GetPollutants`)"""
+    return respond(request, await clients.air_quality.get_pollutants(zone))
+
+@router.get("/compare", response_model=ZoneComparison, summary="Comparer deux zones")
+async def compare_zones(
+    request: Request,
+    zone_a: str = Query(..., alias="zoneA"),
+    zone_b: str = Query(..., alias="zoneB"),
+    clients: BackendClients = Depends(get_clients)
+):
+    """Comparaison de la qualité de l'air de deux zones (opération SOAP `CompareZones`)"""
+    return respond(request, await clients.air_quality.compare_zones(zone_a, zone_b))
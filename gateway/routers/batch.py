@@ -0,0 +1,115 @@
+"""
+Requêtes groupées : plusieurs lectures backend en un seul aller-retour
+Les sous-requêtes sont exécutées en parallèle et chaque résultat est renvoyé
+(NDJSON) dès qu'il est disponible, sans attendre la plus lente.
+"""
+import asyncio
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+
+from clients.manager import BackendClients, get_clients
+from config.settings import settings
+from models.batch import BatchRequest, BatchResult
+from utils.encoding import encode
+from utils.fanout import call_with_deadline
+
+router = APIRouter(prefix="/batch", tags=["Requêtes groupées"])
+
+# ressource -> fabrique d'appel (sans paramètre / avec paramètre)
+StaticOperation = Callable[[BackendClients], Awaitable]
+ParamOperation = Callable[[BackendClients, str], Awaitable]
+
+STATIC_OPERATIONS: Dict[str, StaticOperation] = {
+    "lignes": lambda c: c.mobility.get_lignes(),
+    "trafic": lambda c: c.mobility.get_trafic(),
+    "disponibilite": lambda c: c.mobility.get_disponibilite(),
+    "events": lambda c: c.urban_events.get_events(),
+    "zones": lambda c: c.urban_events.get_zones(),
+    "types": lambda c: c.urban_events.get_event_types(),
+}
+
+PARAM_OPERATIONS: Dict[str, ParamOperation] = {
+    "horaires": lambda c, ligne: c.mobility.get_horaires(ligne),
+    "aqi": lambda c, zone: c.air_quality.get_aqi(zone),
+    "pollutants": lambda c, zone: c.air_quality.get_pollutants(zone),
+    "alerts": lambda c, zone: c.emergency.get_active_alerts(zone),
+    "events": lambda c, event_id: c.urban_events.get_event(event_id),
+}
+
+
+def resolve(clients: BackendClients, request: str) -> Optional[Awaitable]:
+    """Traduit `ressource` ou `ressource/paramètre` en appel client, None si inconnu"""
+    resource, _, param = request.strip("/").partition("/")
+    if param:
+        operation = PARAM_OPERATIONS.get(resource)
+        return operation(clients, param) if operation else None
+    operation = STATIC_OPERATIONS.get(resource)
+    return operation(clients) if operation else None
+
+
+async def _run(index: int, request: str, awaitable: Awaitable) -> Tuple[int, BatchResult]:
+    result = await call_with_deadline(request, awaitable, settings.batch_timeout)
+    status = result.status_code
+    if result.ok and result.value is None:
+        status = 404  # ex: événement inexistant
+    return index, BatchResult(
+        index=index,
+        request=request,
+        status=status,
+        duration_ms=result.duration_ms,
+        data=result.value,
+        error=result.error if not result.ok else (None if status == 200 else f"{request} introuvable"),
+    )
+
+
+def _line(result: BatchResult) -> bytes:
+    """Ligne NDJSON, encodée comme les réponses JSON des autres routes"""
+    return encode(result) + b"\n"
+
+
+@router.post("", summary="Exécuter plusieurs lectures en une requête")
+async def batch(body: BatchRequest, clients: BackendClients = Depends(get_clients)):
+    """
+    Exécute en parallèle des sous-requêtes `ressource[/paramètre]`:
+
+    - Mobilité : `lignes`, `horaires/{ligne}`, `trafic`, `disponibilite`
+    - Qualité de l'air : `aqi/{zone}`, `pollutants/{zone}`
+    - Urgences : `alerts/{zone}`
+    - Événements : `events`, `events/{id}`, `zones`, `types`
+
+    La réponse est un flux NDJSON : une ligne par sous-requête, dans l'ordre
+    de complétion (champ `index` pour la position d'origine). Chaque
+    sous-requête a son propre statut ; une erreur n'interrompt pas les autres.
+    """
+    if len(body.requests) > settings.batch_max_requests:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Au plus {settings.batch_max_requests} sous-requêtes par lot"
+        )
+
+    immediate = []
+    tasks = []
+    for index, request in enumerate(body.requests):
+        awaitable = resolve(clients, request)
+        if awaitable is None:
+            immediate.append(BatchResult(
+                index=index, request=request, status=400, duration_ms=0.0,
+                error=f"Sous-requête inconnue: {request}"
+            ))
+        else:
+            tasks.append(asyncio.ensure_future(_run(index, request, awaitable)))
+
+    async def results():
+        try:
+            for result in immediate:
+                yield _line(result)
+            for next_done in asyncio.as_completed(tasks):
+                _, result = await next_done
+                yield _line(result)
+        finally:
+            # Client déconnecté : inutile de poursuivre les appels restants
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
@@ -0,0 +1,72 @@
+"""
+Tableau de bord agrégé : appel parallèle des quatre services backend
+"""
+import time
+from datetime import datetime
+from fastapi import APIRouter, Depends, Request
+
+from clients.manager import BackendClients, get_clients
+from config.settings import settings
+from models.dashboard import BackendStatus, DashboardResponse
+from utils.encoding import respond
+from utils.fanout import fan_out
+
+router = APIRouter(prefix="/dashboard", tags=["Tableau de bord"])
+
+@router.get("", response_model=DashboardResponse, summary="Tableau de bord de la ville")
+async def get_dashboard(request: Request, clients: BackendClients = Depends(get_clients)):
+    """
+    Agrège en parallèle :
+    - le trafic et la disponibilité (REST `/trafic`, `/disponibilite`)
+    - l'AQI de chaque zone (SOAP `GetAQI`)
+    - les alertes actives de chaque zone (gRPC `GetActiveAlerts`)
+    - les événements urbains (GraphQL `events`)
+
+    Chaque backend dispose de son propre délai : un service lent ou en panne
+    est signalé dans `backends` et la réponse est marquée `degraded`.
+    """
+    start = time.perf_counter()
+
+    calls = [
+        ("mobility:trafic", clients.mobility.get_trafic(), settings.dashboard_mobility_timeout),
+        ("mobility:disponibilite", clients.mobility.get_disponibilite(), settings.dashboard_mobility_timeout),
+        ("urban_events:events", clients.urban_events.get_events(), settings.dashboard_urban_events_timeout),
+    ]
+    calls += [
+        (f"air_quality:{zone}", clients.air_quality.get_aqi(zone), settings.dashboard_air_quality_timeout)
+        for zone in settings.air_quality_zones
+    ]
+    calls += [
+        (f"emergency:{zone}", clients.emergency.get_active_alerts(zone), settings.dashboard_emergency_timeout)
+        for zone in settings.emergency_zones
+    ]
+
+    results = await fan_out(calls)
+
+    trafic = results["mobility:trafic"]
+    disponibilite = results["mobility:disponibilite"]
+    events = results["urban_events:events"]
+
+    return respond(request, DashboardResponse(
+        timestamp=datetime.now(),
+        degraded=not all(r.ok for r in results.values()),
+        duration_ms=round((time.perf_counter() - start) * 1000, 2),
+        trafic=trafic.value["trafic"] if trafic.ok else None,
+        disponibilite=disponibilite.value["disponibilites"] if disponibilite.ok else None,
+        air_quality=[
+            results[f"air_quality:{zone}"].value
+            for zone in settings.air_quality_zones
+            if results[f"air_quality:{zone}"].ok
+        ],
+        alerts=[
+            alert
+            for zone in settings.emergency_zones
+            if results[f"emergency:{zone}"].ok
+            for alert in results[f"emergency:{zone}"].value["alerts"]
+        ],
+        events=events.value if events.ok else None,
+        backends=[
+            BackendStatus(name=r.name, status=r.status, duration_ms=r.duration_ms, error=r.error)
+            for r in results.values()
+        ]
+    ))
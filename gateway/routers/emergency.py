@@ -0,0 +1,104 @@
+"""
+Routes de la gateway vers le service gRPC Alertes d'Urgence
+"""
+import json
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Depends, Path, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+from clients.base import BackendError
+from clients.manager import BackendClients, get_clients
+from config.settings import settings
+from models.emergency import ZoneAlerts
+from utils.encoding import respond
+
+router = APIRouter(prefix="/emergency", tags=["Urgences"])
+
+@router.get("/alerts/{zone}", response_model=ZoneAlerts, summary="Alertes actives d'une zone")
+async def get_active_alerts(
+    request: Request,
+    zone: str = Path(..., description="Zone administrative (ex: Zone Centre)"),
+    type: Optional[str] = Query(None, description="Type d'alerte (ex: FIRE, ACCIDENT)"),
+    min_priority: Optional[str] = Query(None, description="Priorité minimale (LOW, MEDIUM, HIGH, CRITICAL)"),
+    clients: BackendClients = Depends(get_clients)
+):
+    """Alertes actives d'une zone (RPC `GetActiveAlerts`)"""
+    return respond(request, await clients.emergency.get_active_alerts(zone, type, min_priority))
+
+# ============================================================================
+# ALERTES TEMPS RÉEL (pont SubscribeAlerts -> SSE / WebSocket)
+# ============================================================================
+
+def _sse(event: Dict[str, Any]) -> str:
+    """Formate un événement Server-Sent Events"""
+    return f"event: {event['event']}\ndata: {json.dumps(event['data'], ensure_ascii=False)}\n\n"
+
+@router.get("/stream", summary="Alertes temps réel (Server-Sent Events)")
+async def stream_alerts(
+    zones: List[str] = Query(..., description="Zones suivies (paramètre répétable)"),
+    types: Optional[List[str]] = Query(None, description="Types d'alerte (paramètre répétable)"),
+    min_priority: Optional[str] = Query(None, description="Priorité minimale"),
+    clients: BackendClients = Depends(get_clients)
+):
+    """
+    Flux SSE des alertes correspondant au filtre.
+    Les alertes actives connues sont envoyées d'abord, puis les nouvelles au fil de l'eau.
+    Un commentaire `: heartbeat` est émis périodiquement pendant les périodes calmes.
+    """
+    hub = clients.alert_hub
+    subscriber = hub.subscribe(zones, types, min_priority)
+
+    async def events():
+        try:
+            while True:
+                event = await subscriber.next(settings.alert_stream_heartbeat)
+                if event is None:
+                    yield ": heartbeat\n\n"
+                    continue
+                yield _sse(event)
+                if event["event"] == "evicted":
+                    return
+        finally:
+            hub.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.websocket("/ws")
+async def alerts_websocket(
+    websocket: WebSocket,
+    zones: List[str] = Query(...),
+    types: Optional[List[str]] = Query(None),
+    min_priority: Optional[str] = Query(None),
+):
+    """Alertes temps réel via WebSocket (messages JSON {event, data})"""
+    hub = websocket.app.state.clients.alert_hub
+    await websocket.accept()
+    try:
+        subscriber = hub.subscribe(zones, types, min_priority)
+    except BackendError as e:
+        await websocket.send_json({"event": "error", "data": {"message": e.message}})
+        await websocket.close(code=1008 if (e.status_code or 500) < 500 else 1013)
+        return
+
+    try:
+        while True:
+            event = await subscriber.next(settings.alert_stream_heartbeat)
+            if event is None:
+                event = {"event": "heartbeat", "data": {}}
+            await websocket.send_json(event)
+            if event["event"] == "evicted":
+                await websocket.close(code=1013)
+                return
+    except WebSocketDisconnect:
+        pass
+    finally:
+        hub.unsubscribe(subscriber)
+
+@router.get("/streams", summary="Flux d'alertes ouverts")
+async def stream_stats(clients: BackendClients = Depends(get_clients)):
+    """Flux gRPC amont ouverts, abonnés par filtre et clients évincés"""
+    return clients.alert_hub.snapshot()
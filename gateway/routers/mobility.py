@@ -0,0 +1,34 @@
+"""
+Routes de la gateway vers le service REST Mobilité
+"""
+from fastapi import APIRouter, Depends, Path, Request
+
+from clients.manager import BackendClients, get_clients
+from models.mobility import DisponibiliteResponse, HorairesResponse, Ligne, TraficResponse
+from utils.encoding import respond
+
+router = APIRouter(prefix="/mobility", tags=["Mobilité"])
+
+@router.get("/lignes", response_model=list[Ligne], summary="Lister les lignes de transport")
+async def get_lignes(request: Request, clients: BackendClients = Depends(get_clients)):
+    """Liste complète des lignes (proxy vers `GET /lignes`)"""
+    return respond(request, await clients.mobility.get_lignes())
+
+@router.get("/horaires/{ligne}", response_model=HorairesResponse, summary="Horaires d'une ligne")
+async def get_horaires(
+    request: Request,
+    ligne: str = Path(..., description="Numéro de la ligne (ex: L1, B15)"),
+    clients: BackendClients = Depends(get_clients)
+):
+    """Horaires de passage d'une ligne (proxy vers `GET /horaires/{ligne}`)"""
+    return respond(request, await clients.mobility.get_horaires(ligne))
+
+@router.get("/trafic", response_model=TraficResponse, summary="État du trafic")
+async def get_trafic(request: Request, clients: BackendClients = Depends(get_clients)):
+    """État du trafic en temps réel (proxy vers `GET /trafic`)"""
+    return respond(request, await clients.mobility.get_trafic())
+
+@router.get("/disponibilite", response_model=DisponibiliteResponse, summary="Disponibilité des véhicules")
+async def get_disponibilite(request: Request, clients: BackendClients = Depends(get_clients)):
+    """Disponibilité des véhicules (proxy vers `GET /disponibilite`)"""
+    return respond(request, await clients.mobility.get_disponibilite())
@@ -0,0 +1,45 @@
+"""
+Routes de la gateway vers le service GraphQL Événements Urbains
+"""
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request
+
+from clients.manager import BackendClients, get_clients
+from models.events import Event, EventType, Zone
+from utils.encoding import respond
+
+router = APIRouter(prefix="/events", tags=["Événements urbains"])
+
+@router.get("", response_model=list[Event], summary="Lister les événements urbains")
+async def get_events(
+    request: Request,
+    event_type_id: Optional[str] = Query(None, description="Filtrer par type d'événement"),
+    zone_id: Optional[str] = Query(None, description="Filtrer par zone"),
+    status: Optional[str] = Query(None, description="PENDING, IN_PROGRESS, RESOLVED, CANCELLED"),
+    priority: Optional[str] = Query(None, description="LOW, MEDIUM, HIGH, CRITICAL"),
+    clients: BackendClients = Depends(get_clients)
+):
+    """Liste des événements avec filtres optionnels (query GraphQL `events`)"""
+    return respond(request, await clients.urban_events.get_events(event_type_id, zone_id, status, priority))
+
+@router.get("/zones", response_model=list[Zone], summary="Lister les zones urbaines")
+async def get_zones(request: Request, clients: BackendClients = Depends(get_clients)):
+    """Liste des zones (query GraphQL `zones`)"""
+    return respond(request, await clients.urban_events.get_zones())
+
+@router.get("/types", response_model=list[EventType], summary="Lister les types d'événements")
+async def get_event_types(request: Request, clients: BackendClients = Depends(get_clients)):
+    """Liste des types d'événements (query GraphQL `eventTypes`)"""
+    return respond(request, await clients.urban_events.get_event_types())
+
+@router.get("/{event_id}", response_model=Event, summary="Détail d'un événement")
+async def get_event(
+    request: Request,
+    event_id: str = Path(..., description="Identifiant de l'événement"),
+    clients: BackendClients = Depends(get_clients)
+):
+    """Un événement par son ID (query GraphQL `event`)"""
+    event = await clients.urban_events.get_event(event_id)
+    if event is None:
+        raise HTTPException(status_code=404, detail=f"Événement {event_id} introuvable")
+    return respond(request, event)
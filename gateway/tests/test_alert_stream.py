@@ -0,0 +1,159 @@
+"""
+Tests de la diffusion des alertes temps réel (un flux gRPC par filtre)
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from clients.alert_stream import AlertStreamHub
+from clients.base import BackendUnavailableError
+
+
+class FakeEmergency:
+    """Client gRPC simulé : chaque flux ouvert lit une file d'alertes"""
+
+    backend = "emergency"
+
+    def __init__(self):
+        self.opened = 0
+        self.feed: asyncio.Queue = asyncio.Queue()
+
+    def subscribe_request(self, zones, types=None, min_priority=None):
+        return SimpleNamespace(zones=sorted(set(zones)), types=sorted(types or []), min_priority=0)
+
+    async def subscribe_alerts(self, request):
+        self.opened += 1
+        while True:
+            yield await self.feed.get()
+
+
+def alert(alert_id, status="PENDING"):
+    return {"alert_id": alert_id, "status": status, "location": {"zone": "Zone Centre"}}
+
+
+@pytest.mark.asyncio
+async def test_same_filter_shares_one_upstream():
+    """Test N abonnés au même filtre -> un seul flux gRPC, alerte reçue par tous"""
+    client = FakeEmergency()
+    hub = AlertStreamHub(client)
+    subscribers = [hub.subscribe(["Zone Nord", "Zone Centre"]) for _ in range(3)]
+    subscribers.append(hub.subscribe(["Zone Centre", "Zone Nord"]))
+    await asyncio.sleep(0)
+
+    await client.feed.put(alert("A1"))
+    events = [await subscriber.next(1.0) for subscriber in subscribers]
+
+    assert client.opened == 1
+    assert all(event == {"event": "alert", "data": alert("A1")} for event in events)
+    assert hub.snapshot()["upstreams"] == 1
+    await hub.aclose()
+
+
+@pytest.mark.asyncio
+async def test_late_subscriber_gets_replay_and_upstream_closes_with_last():
+    """Test un nouvel abonné reçoit les alertes connues ; le flux se ferme avec le dernier"""
+    client = FakeEmergency()
+    hub = AlertStreamHub(client)
+    first = hub.subscribe(["Zone Centre"])
+    await asyncio.sleep(0)
+    await client.feed.put(alert("A1"))
+    assert (await first.next(1.0))["data"]["alert_id"] == "A1"
+
+    late = hub.subscribe(["Zone Centre"])
+    assert (await late.next(1.0))["data"]["alert_id"] == "A1"
+
+    hub.unsubscribe(first)
+    assert hub.snapshot()["upstreams"] == 1
+    hub.unsubscribe(late)
+    assert hub.snapshot()["upstreams"] == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_is_evicted_without_blocking_others():
+    """Test un client qui ne lit plus est évincé, les autres continuent"""
+    client = FakeEmergency()
+    hub = AlertStreamHub(client, queue_size=2)
+    slow = hub.subscribe(["Zone Centre"])
+    fast = hub.subscribe(["Zone Centre"])
+    await asyncio.sleep(0)
+
+    for i in range(3):
+        await client.feed.put(alert(f"A{i}"))
+        await asyncio.sleep(0.01)
+        assert (await fast.next(1.0))["data"]["alert_id"] == f"A{i}"
+
+    assert slow.evicted
+    assert (await slow.next(1.0))["event"] == "evicted"
+    assert hub.stats["evicted"] == 1
+    assert hub.snapshot()["streams"][0]["subscribers"] == 1
+    await hub.aclose()
+
+
+@pytest.mark.asyncio
+async def test_duplicate_alerts_are_not_rebroadcast():
+    """Test une alerte identique (renvoyée après reconnexion) n'est pas rediffusée"""
+    client = FakeEmergency()
+    hub = AlertStreamHub(client)
+    subscriber = hub.subscribe(["Zone Centre"])
+    await asyncio.sleep(0)
+
+    for item in (alert("A1"), alert("A1"), alert("A1", status="RESOLVED")):
+        await client.feed.put(item)
+    await asyncio.sleep(0.01)
+
+    assert (await subscriber.next(1.0))["data"]["status"] == "PENDING"
+    assert (await subscriber.next(1.0))["data"]["status"] == "RESOLVED"
+    assert await subscriber.next(0.01) is None
+    await hub.aclose()
+
+
+@pytest.mark.asyncio
+async def test_distinct_filters_are_bounded():
+    """Test le nombre de flux amont distincts est borné"""
+    hub = AlertStreamHub(FakeEmergency(), max_upstreams=1)
+    hub.subscribe(["Zone Centre"])
+    with pytest.raises(BackendUnavailableError):
+        hub.subscribe(["Zone Nord"])
+    await hub.aclose()
+
+
+@pytest.mark.asyncio
+async def test_replay_leaves_room_for_live_alerts():
+    """Test un abonné rejoué avec une file pleine d'historique n'est pas évincé à la prochaine alerte"""
+    client = FakeEmergency()
+    hub = AlertStreamHub(client, queue_size=3, replay_size=3)
+    first = hub.subscribe(["Zone Centre"])
+    await asyncio.sleep(0)
+    for i in range(3):
+        await client.feed.put(alert(f"A{i}"))
+        await first.next(1.0)
+
+    late = hub.subscribe(["Zone Centre"])
+    await client.feed.put(alert("A3"))
+    await first.next(1.0)
+
+    received = [(await late.next(1.0))["data"]["alert_id"] for _ in range(4)]
+    assert received == ["A0", "A1", "A2", "A3"]
+    assert not late.evicted and hub.stats["evicted"] == 0
+    await hub.aclose()
+
+
+@pytest.mark.asyncio
+async def test_upstream_reconnects_after_unexpected_error():
+    """Test une erreur inattendue du flux amont est comptée et le flux est rouvert"""
+    client = FakeEmergency()
+    hub = AlertStreamHub(client, retry_max_delay=0.01)
+    subscriber = hub.subscribe(["Zone Centre"])
+    await asyncio.sleep(0)
+
+    await client.feed.put({"status": "PENDING"})  # sans alert_id : KeyError
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert hub.stats["upstream_errors"] == 1
+
+    await asyncio.sleep(1.05)
+    await client.feed.put(alert("A1"))
+    assert (await subscriber.next(1.0))["data"]["alert_id"] == "A1"
+    assert client.opened == 2
+    await hub.aclose()
@@ -0,0 +1,88 @@
+"""
+Tests des requêtes groupées (POST /batch)
+"""
+import asyncio
+import json
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from clients.base import BackendError
+from clients.manager import get_clients
+from config.settings import settings
+from main import app
+
+
+class FakeMobility:
+    async def get_horaires(self, ligne):
+        await asyncio.sleep(0.1)
+        if ligne == "X9":
+            raise BackendError("mobility", "Ligne X9 introuvable", 404)
+        return {"ligne": ligne, "horaires": ["07:00", "07:15"]}
+
+
+class FakeAirQuality:
+    async def get_aqi(self, zone):
+        return {"zone": zone, "aqi": "42"}
+
+    async def get_pollutants(self, zone):
+        return {"zone": zone, "mesure": datetime(2024, 3, 15, 8, 30)}
+
+
+class SlowEmergency:
+    async def get_active_alerts(self, zone):
+        await asyncio.sleep(10)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(settings, "batch_timeout", 0.3)
+    fake = SimpleNamespace(
+        mobility=FakeMobility(),
+        air_quality=FakeAirQuality(),
+        emergency=SlowEmergency(),
+    )
+    app.dependency_overrides[get_clients] = lambda: fake
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_batch_streams_results_in_completion_order(client):
+    """Test les résultats arrivent au fil de l'eau, chacun avec son statut"""
+    response = client.post("/batch", json={"requests": [
+        "horaires/L1", "aqi/downtown", "alerts/Zone Centre", "horaires/X9", "inconnu/1"
+    ]})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    order = [line["request"] for line in lines]
+    by_request = {line["request"]: line for line in lines}
+
+    assert len(lines) == 5
+    # Sous-requête invalide puis la plus rapide en tête, la plus lente (timeout) en dernier
+    assert order[:2] == ["inconnu/1", "aqi/downtown"]
+    assert order[-1] == "alerts/Zone Centre"
+    assert by_request["aqi/downtown"]["data"] == {"zone": "downtown", "aqi": "42"}
+    assert by_request["horaires/L1"]["status"] == 200
+    assert by_request["horaires/X9"]["status"] == 404
+    assert by_request["alerts/Zone Centre"]["status"] == 504
+    assert by_request["inconnu/1"]["status"] == 400
+    assert by_request["horaires/L1"]["index"] == 0
+
+
+def test_batch_size_is_bounded(client, monkeypatch):
+    """Test le nombre de sous-requêtes est limité"""
+    monkeypatch.setattr(settings, "batch_max_requests", 2)
+    response = client.post("/batch", json={"requests": ["aqi/a", "aqi/b", "aqi/c"]})
+    assert response.status_code == 400
+
+
+def test_batch_lines_use_shared_encoder(client):
+    """Test les lignes NDJSON sont encodées comme les autres réponses (dates ISO 8601)"""
+    response = client.post("/batch", json={"requests": ["pollutants/downtown"]})
+
+    line = json.loads(response.text)
+    assert line["data"] == {"zone": "downtown", "mesure": "2024-03-15T08:30:00"}
@@ -0,0 +1,24 @@
+"""
+Tests des calculs du banc d'essai
+"""
+from benchmarks.run_benchmark import RouteSamples, percentile, summarize
+
+
+def test_percentile_nearest_rank():
+    """Test percentiles par rang le plus proche"""
+    values = [i / 1000 for i in range(1, 101)]  # 1..100 ms
+    assert percentile(values, 0.50) == 0.050
+    assert percentile(values, 0.99) == 0.099
+    assert percentile([], 0.5) is None
+
+
+def test_summarize_route():
+    """Test RPS, taux d'erreur et latences en millisecondes"""
+    samples = RouteSamples(latencies=[0.010, 0.020, 0.030, 0.040], errors=1, duration=2.0)
+    summary = summarize(samples)
+
+    assert summary["requests"] == 4
+    assert summary["rps"] == 2.0
+    assert summary["error_rate"] == 0.25
+    assert summary["latency_ms"]["mean"] == 25.0
+    assert summary["latency_ms"]["max"] == 40.0
@@ -0,0 +1,113 @@
+"""
+Tests unitaires pour le cache stale-while-revalidate
+"""
+import asyncio
+
+import pytest
+
+from utils.cache import SWRCache
+
+
+class CountingLoader:
+    """Loader simulé qui compte les appels backend"""
+
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.calls = 0
+        self.delay = delay
+        self.fail = fail
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("backend indisponible")
+        return f"valeur-{self.calls}"
+
+
+@pytest.mark.asyncio
+async def test_hit_after_miss():
+    """Test miss puis hit"""
+    cache = SWRCache("test")
+    loader = CountingLoader()
+
+    assert await cache.get_or_load("k", loader, ttl=60) == "valeur-1"
+    assert await cache.get_or_load("k", loader, ttl=60) == "valeur-1"
+    assert loader.calls == 1
+    assert cache.stats["misses"] == 1
+    assert cache.stats["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_call():
+    """Test ruée sur une clé absente : un seul appel backend"""
+    cache = SWRCache("test")
+    loader = CountingLoader(delay=0.05)
+
+    results = await asyncio.gather(*(cache.get_or_load("k", loader, ttl=60) for _ in range(50)))
+
+    assert set(results) == {"valeur-1"}
+    assert loader.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_served_while_single_refresh():
+    """Test valeur périmée servie immédiatement, un seul rafraîchissement en fond"""
+    cache = SWRCache("test", stale_ttl=60)
+    loader = CountingLoader(delay=0.05)
+
+    await cache.get_or_load("k", loader, ttl=0.01)
+    await asyncio.sleep(0.02)
+
+    results = await asyncio.gather(*(cache.get_or_load("k", loader, ttl=0.01) for _ in range(20)))
+    assert set(results) == {"valeur-1"}
+    assert cache.stats["stale_hits"] == 20
+    assert cache.stats["refreshes"] == 1
+
+    await asyncio.sleep(0.1)
+    assert loader.calls == 2
+    assert await cache.get_or_load("k", loader, ttl=60) == "valeur-2"
+
+
+@pytest.mark.asyncio
+async def test_refresh_error_keeps_stale_value():
+    """Test échec du rafraîchissement : la valeur périmée reste servie"""
+    cache = SWRCache("test", stale_ttl=60)
+    await cache.get_or_load("k", CountingLoader(), ttl=0.01)
+    await asyncio.sleep(0.02)
+
+    assert await cache.get_or_load("k", CountingLoader(fail=True), ttl=0.01) == "valeur-1"
+    await asyncio.sleep(0.01)
+    assert cache.stats["refresh_errors"] == 1
+    assert await cache.get_or_load("k", CountingLoader(fail=True), ttl=0.01) == "valeur-1"
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction():
+    """Test éviction de l'entrée la moins récemment utilisée"""
+    cache = SWRCache("test", max_entries=2)
+    loader = CountingLoader()
+
+    await cache.get_or_load("a", loader, ttl=60)
+    await cache.get_or_load("b", loader, ttl=60)
+    await cache.get_or_load("a", loader, ttl=60)
+    await cache.get_or_load("c", loader, ttl=60)
+
+    assert len(cache) == 2
+    assert cache.stats["evictions"] == 1
+    calls = loader.calls
+    await cache.get_or_load("a", loader, ttl=60)
+    assert loader.calls == calls
+    await cache.get_or_load("b", loader, ttl=60)
+    assert loader.calls == calls + 1
+
+
+@pytest.mark.asyncio
+async def test_zero_ttl_bypasses_cache():
+    """Test TTL nul : pas de mise en cache"""
+    cache = SWRCache("test")
+    loader = CountingLoader()
+
+    await cache.get_or_load("k", loader, ttl=0)
+    await cache.get_or_load("k", loader, ttl=0)
+    assert loader.calls == 2
+    assert len(cache) == 0
@@ -0,0 +1,124 @@
+"""
+Tests unitaires pour les clients backend
+"""
+import httpx
+import pytest
+
+from clients.base import BackendError, BackendUnavailableError
+from clients.graphql_client import GraphQLClient
+from clients.mobility_client import MobilityClient
+from clients.soap_client import SoapClient
+
+AQI_RESPONSE = (
+    "<?xml version='1.0' encoding='UTF-8'?>"
+    '<soap11env:Envelope xmlns:soap11env="http://schemas.xmlsoap.org/soap/envelope/" '
+    'xmlns:tns="http://smartcity.air-quality.soap" xmlns:s0="http://smartcity.air-quality.soap/models">'
+    "<soap11env:Body><tns:GetAQIResponse><tns:GetAQIResult>"
+    "<s0:zone>downtown</s0:zone><s0:aqi>85</s0:aqi><s0:category>Moderate</s0:category>"
+    "<s0:timestamp>2026-01-01T08:00:00</s0:timestamp><s0:description>Qualité acceptable</s0:description>"
+    "</tns:GetAQIResult></tns:GetAQIResponse></soap11env:Body></soap11env:Envelope>"
+)
+
+POLLUTANTS_RESPONSE = (
+    "<?xml version='1.0' encoding='UTF-8'?>"
+    '<soap11env:Envelope xmlns:soap11env="http://schemas.xmlsoap.org/soap/envelope/" '
+    'xmlns:tns="http://smartcity.air-quality.soap" xmlns:s0="http://smartcity.air-quality.soap/models">'
+    "<soap11env:Body><tns:GetPollutantsResponse><tns:GetPollutantsResult>"
+    "<s0:zone>park</s0:zone><s0:pollutants>"
+    "<s0:Pollutant><s0:name>PM10</s0:name><s0:value>15.3</s0:value></s0:Pollutant>"
+    "<s0:Pollutant><s0:name>NO2</s0:name><s0:value>12.4</s0:value></s0:Pollutant>"
+    "</s0:pollutants></tns:GetPollutantsResult></tns:GetPollutantsResponse></soap11env:Body></soap11env:Envelope>"
+)
+
+FAULT_RESPONSE = (
+    "<?xml version='1.0' encoding='UTF-8'?>"
+    '<soap11env:Envelope xmlns:soap11env="http://schemas.xmlsoap.org/soap/envelope/">'
+    "<soap11env:Body><soap11env:Fault><faultcode>soap11env:Server</faultcode>"
+    "<faultstring>Zone 'nowhere' introuvable</faultstring></soap11env:Fault></soap11env:Body></soap11env:Envelope>"
+)
+
+
+def make_http(handler) -> httpx.AsyncClient:
+    """Client httpx branché sur un transport simulé"""
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+@pytest.mark.asyncio
+async def test_soap_get_aqi():
+    """Test parsing d'une réponse GetAQI"""
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, text=AQI_RESPONSE)
+
+    client = SoapClient(make_http(handler), "http://soap/")
+    result = await client.get_aqi("downtown")
+
+    assert result["zone"] == "downtown"
+    assert result["aqi"] == "85"
+    assert b"<tns:zone>downtown</tns:zone>" in requests[0].content
+
+
+@pytest.mark.asyncio
+async def test_soap_array_parsing():
+    """Test conversion des tableaux Spyne en listes"""
+    client = SoapClient(make_http(lambda r: httpx.Response(200, text=POLLUTANTS_RESPONSE)), "http://soap/")
+    result = await client.get_pollutants("park")
+
+    assert [p["name"] for p in result["pollutants"]] == ["PM10", "NO2"]
+
+
+@pytest.mark.asyncio
+async def test_soap_fault_unknown_zone():
+    """Test traduction d'un Fault SOAP en BackendError 404"""
+    client = SoapClient(make_http(lambda r: httpx.Response(500, text=FAULT_RESPONSE)), "http://soap/")
+
+    with pytest.raises(BackendError) as exc:
+        await client.get_aqi("nowhere")
+    assert exc.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_mobility_error_status():
+    """Test propagation du statut d'erreur du service Mobilité"""
+    handler = lambda r: httpx.Response(404, json={"detail": "Aucun horaire trouvé pour la ligne X"})
+    client = MobilityClient(make_http(handler), "http://mobility")
+
+    with pytest.raises(BackendError) as exc:
+        await client.get_horaires("X")
+    assert exc.value.status_code == 404
+    assert "Aucun horaire" in exc.value.message
+
+
+@pytest.mark.asyncio
+async def test_mobility_unreachable():
+    """Test service injoignable"""
+    def handler(request):
+        raise httpx.ConnectError("connexion refusée", request=request)
+
+    client = MobilityClient(make_http(handler), "http://mobility")
+
+    with pytest.raises(BackendUnavailableError):
+        await client.get_trafic()
+
+
+@pytest.mark.asyncio
+async def test_graphql_events():
+    """Test exécution de la query events"""
+    handler = lambda r: httpx.Response(200, json={"data": {"events": [{"id": "event-1"}]}})
+    client = GraphQLClient(make_http(handler), "http://graphql/graphql")
+
+    events = await client.get_events(zone_id="zone-1")
+    assert events == [{"id": "event-1"}]
+
+
+@pytest.mark.asyncio
+async def test_graphql_errors():
+    """Test erreurs GraphQL"""
+    handler = lambda r: httpx.Response(200, json={"data": None, "errors": [{"message": "boom"}]})
+    client = GraphQLClient(make_http(handler), "http://graphql/graphql")
+
+    with pytest.raises(BackendError) as exc:
+        await client.get_zones()
+    assert "boom" in exc.value.message
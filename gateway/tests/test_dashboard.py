@@ -0,0 +1,95 @@
+"""
+Tests du tableau de bord agrégé
+"""
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from clients.base import BackendError
+from clients.manager import get_clients
+from config.settings import settings
+from main import app
+from utils.fanout import fan_out
+
+
+class FakeMobility:
+    async def get_trafic(self):
+        await asyncio.sleep(0.05)
+        return {"trafic": [{"ligne_id": "1", "statut": "normal"}]}
+
+    async def get_disponibilite(self):
+        await asyncio.sleep(0.05)
+        return {"disponibilites": [{"ligne_id": "1", "taux_disponibilite": 90.0}]}
+
+
+class FakeAirQuality:
+    async def get_aqi(self, zone):
+        await asyncio.sleep(0.05)
+        if zone == "industrial":
+            raise BackendError("air_quality", "Zone 'industrial' introuvable", 404)
+        return {"zone": zone, "aqi": "42"}
+
+
+class SlowEmergency:
+    async def get_active_alerts(self, zone):
+        await asyncio.sleep(10)
+
+
+class FakeUrbanEvents:
+    async def get_events(self):
+        await asyncio.sleep(0.05)
+        return [{"id": "event-1"}]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(settings, "dashboard_emergency_timeout", 0.2)
+    fake = SimpleNamespace(
+        mobility=FakeMobility(),
+        air_quality=FakeAirQuality(),
+        emergency=SlowEmergency(),
+        urban_events=FakeUrbanEvents(),
+    )
+    app.dependency_overrides[get_clients] = lambda: fake
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_dashboard_partial_results(client):
+    """Test résultats partiels : backend lent coupé, zone en erreur signalée"""
+    start = time.perf_counter()
+    response = client.get("/dashboard")
+    elapsed = time.perf_counter() - start
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["degraded"] is True
+    assert body["trafic"] == [{"ligne_id": "1", "statut": "normal"}]
+    assert body["events"] == [{"id": "event-1"}]
+    assert {z["zone"] for z in body["air_quality"]} == set(settings.air_quality_zones) - {"industrial"}
+    assert body["alerts"] == []
+
+    statuses = {b["name"]: b["status"] for b in body["backends"]}
+    assert statuses["air_quality:industrial"] == "error"
+    assert all(statuses[f"emergency:{zone}"] == "timeout" for zone in settings.emergency_zones)
+    # Borné par le délai gRPC, pas par la somme des appels
+    assert elapsed < 2
+
+
+@pytest.mark.asyncio
+async def test_fan_out_runs_concurrently():
+    """Test parallélisme : durée ≈ appel le plus lent"""
+    async def slow(value):
+        await asyncio.sleep(0.1)
+        return value
+
+    start = time.perf_counter()
+    results = await fan_out([(f"call{i}", slow(i), 1.0) for i in range(10)])
+    elapsed = time.perf_counter() - start
+
+    assert all(r.ok for r in results.values())
+    assert results["call3"].value == 3
+    assert elapsed < 0.5
@@ -0,0 +1,78 @@
+"""
+Tests de l'encodage des réponses (format négocié, compression)
+"""
+import gzip
+import json
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from clients.manager import get_clients
+from config.settings import settings
+from main import app
+from models.dashboard import BackendStatus
+from utils import encoding
+
+
+def test_json_fallback_when_msgpack_not_requested():
+    """Test JSON par défaut, y compris pour un modèle Pydantic"""
+    assert encoding.negotiate("application/json") == encoding.JSON_MEDIA_TYPE
+    assert encoding.negotiate(None) == encoding.JSON_MEDIA_TYPE
+
+    status = BackendStatus(name="air_quality:downtown", status="ok", duration_ms=1.5)
+    assert json.loads(encoding.encode(status)) == status.model_dump()
+    assert json.loads(encoding.encode({"at": datetime(2024, 1, 1), "items": [status]})) == {
+        "at": "2024-01-01T00:00:00",
+        "items": [status.model_dump()],
+    }
+
+
+def test_msgpack_negotiation():
+    """Test Accept: application/msgpack -> MessagePack"""
+    msgpack = pytest.importorskip("msgpack")
+    assert encoding.negotiate("application/msgpack, application/json;q=0.5") == "application/msgpack"
+    assert msgpack.unpackb(encoding.encode({"aqi": 42}, "application/msgpack")) == {"aqi": 42}
+
+    # Valeurs q : q=0 exclut MessagePack, JSON mieux pondéré l'emporte
+    assert encoding.negotiate("application/msgpack;q=0") == encoding.JSON_MEDIA_TYPE
+    assert encoding.negotiate("application/msgpack;q=0.5, application/json") == encoding.JSON_MEDIA_TYPE
+    assert encoding.negotiate("application/json;q=0.8, application/x-msgpack") == "application/x-msgpack"
+    assert encoding.negotiate("*/*") == encoding.JSON_MEDIA_TYPE
+
+    status = BackendStatus(name="air_quality:downtown", status="ok", duration_ms=1.5)
+    packed = encoding.encode({"at": datetime(2024, 1, 1), "items": [status]}, "application/msgpack")
+    assert msgpack.unpackb(packed) == {"at": "2024-01-01T00:00:00", "items": [status.model_dump(mode="json")]}
+
+
+def test_compression_threshold():
+    """Test seuls les corps volumineux sont compressés"""
+    small, small_encoding = encoding.compress(b"{}", "gzip, br")
+    assert small == b"{}" and small_encoding is None
+
+    body = b"x" * (settings.compression_min_size + 1)
+    compressed, content_encoding = encoding.compress(body, "gzip")
+    assert content_encoding == "gzip"
+    assert gzip.decompress(compressed) == body
+    assert encoding.compress(body, "identity") == (body, None)
+    assert encoding.compress(body, "gzip;q=0, identity") == (body, None)
+
+
+def test_route_response_is_compressed():
+    """Test une liste d'horaires volumineuse est servie compressée"""
+    class FakeMobility:
+        async def get_horaires(self, ligne):
+            horaires = [{"id": f"h{i}", "heure_depart": "08:00", "station": "Gare Centrale"} for i in range(200)]
+            return {"ligne": ligne, "nombre_horaires": len(horaires), "horaires": horaires}
+
+    app.dependency_overrides[get_clients] = lambda: SimpleNamespace(mobility=FakeMobility())
+    try:
+        response = TestClient(app).get("/mobility/horaires/L1", headers={"Accept-Encoding": "gzip"})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert int(response.headers["content-length"]) < 2000
+    assert response.json()["nombre_horaires"] == 200
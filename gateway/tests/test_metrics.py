@@ -0,0 +1,84 @@
+"""
+Tests des histogrammes de latence et du middleware de mesure
+"""
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from clients.manager import get_clients
+from main import app
+from middleware.logging_middleware import TimingMiddleware
+from utils.metrics import LatencyHistogram, MetricsRegistry
+
+
+def test_histogram_quantiles():
+    """Test les quantiles sont estimés dans le bon bucket"""
+    histogram = LatencyHistogram()
+    for _ in range(90):
+        histogram.observe(0.004)  # bucket ]0.0025, 0.005]
+    for _ in range(10):
+        histogram.observe(0.2)    # bucket ]0.1, 0.25]
+
+    assert 0.0025 < histogram.quantile(0.5) <= 0.005
+    assert 0.1 < histogram.quantile(0.95) <= 0.25
+    assert histogram.count == 100
+    assert LatencyHistogram().quantile(0.5) is None
+
+
+def test_prometheus_format():
+    """Test l'export texte contient buckets cumulés, somme, compte et quantiles"""
+    registry = MetricsRegistry()
+    registry.observe_backend("air_quality", "GetAQI", "ok", 0.02)
+    registry.observe_backend("air_quality", "GetAQI", "ok", 0.3)
+    text = registry.render_prometheus()
+
+    labels = 'backend="air_quality",operation="GetAQI",outcome="ok"'
+    assert "# TYPE gateway_backend_call_duration_seconds histogram" in text
+    assert f'gateway_backend_call_duration_seconds_bucket{{{labels},le="0.025"}} 1' in text
+    assert f'gateway_backend_call_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f"gateway_backend_call_duration_seconds_count{{{labels}}} 2" in text
+    assert f'gateway_backend_call_duration_seconds_quantile{{{labels},quantile="0.99"}}' in text
+
+
+def test_middleware_records_route_template_and_keeps_streaming():
+    """Test la route est enregistrée par template et le streaming n'est pas bufferisé"""
+    registry = MetricsRegistry()
+    demo = FastAPI()
+    demo.add_middleware(TimingMiddleware, registry=registry)
+
+    @demo.get("/items/{item_id}")
+    async def item(item_id: str):
+        return {"id": item_id}
+
+    @demo.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield f"chunk-{i}\n"
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    client = TestClient(demo)
+    assert client.get("/items/1").status_code == 200
+    response = client.get("/items/2")
+    assert "x-process-time" in response.headers
+    assert client.get("/stream").text == "chunk-0\nchunk-1\nchunk-2\n"
+    assert client.get("/inconnue").status_code == 404
+
+    routes = {(s["route"], s["status"]): s["count"] for s in registry.snapshot()["routes"]}
+    assert routes == {("/items/{item_id}", "200"): 2, ("/stream", "200"): 1, ("unmatched", "404"): 1}
+
+
+def test_metrics_endpoint():
+    """Test /metrics répond au format Prometheus avec l'état des disjoncteurs"""
+    fake = SimpleNamespace(backend_states=lambda: {"mobility": {"circuit": {"state": "open"}}})
+    app.dependency_overrides[get_clients] = lambda: fake
+    try:
+        response = TestClient(app).get("/metrics")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'gateway_backend_circuit_open{backend="mobility"} 1' in response.text
@@ -0,0 +1,194 @@
+"""
+Tests du disjoncteur et de la cloison par backend
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from clients.base import BackendError, BackendTimeoutError
+from clients.manager import BackendClients, get_clients
+from clients.resilience import BackendGuard, Bulkhead, BulkheadFullError, CircuitBreaker, CircuitOpenError
+from config.settings import Settings
+from main import app
+
+
+async def failing():
+    raise BackendTimeoutError("air_quality", "Délai dépassé", 504)
+
+
+async def succeeding():
+    return "ok"
+
+
+def make_guard(threshold=2, recovery=60.0, max_concurrent=10, max_wait=0.05):
+    return BackendGuard(
+        CircuitBreaker("air_quality", threshold, recovery),
+        Bulkhead("air_quality", max_concurrent, max_wait),
+    )
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_after_threshold():
+    """Test le circuit s'ouvre après N échecs et refuse sans appeler le backend"""
+    guard = make_guard(threshold=2)
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        return await failing()
+
+    for _ in range(2):
+        with pytest.raises(BackendTimeoutError):
+            await guard.call(loader)
+    assert guard.breaker.state == CircuitBreaker.OPEN
+
+    with pytest.raises(CircuitOpenError) as exc_info:
+        await guard.call(loader)
+    assert exc_info.value.status_code == 503
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_client_errors_do_not_trip_breaker():
+    """Test les erreurs 4xx ne comptent pas comme des pannes"""
+    guard = make_guard(threshold=1)
+
+    async def not_found():
+        raise BackendError("air_quality", "Zone introuvable", 404)
+
+    for _ in range(3):
+        with pytest.raises(BackendError):
+            await guard.call(not_found)
+    assert guard.breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_half_open_probe_closes_or_reopens():
+    """Test après le délai, une sonde unique referme ou rouvre le circuit"""
+    guard = make_guard(threshold=1, recovery=0.05)
+    with pytest.raises(BackendTimeoutError):
+        await guard.call(failing)
+    await asyncio.sleep(0.06)
+
+    # Sonde en échec : le circuit se rouvre
+    with pytest.raises(BackendTimeoutError):
+        await guard.call(failing)
+    assert guard.breaker.state == CircuitBreaker.OPEN
+    await asyncio.sleep(0.06)
+
+    # Une seule sonde à la fois
+    async def slow_success():
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    probe = asyncio.create_task(guard.call(slow_success))
+    await asyncio.sleep(0.01)
+    assert guard.breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        await guard.call(succeeding)
+
+    assert await probe == "ok"
+    assert guard.breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_bulkhead_rejects_beyond_capacity():
+    """Test la cloison refuse les appels au-delà de la limite de concurrence"""
+    guard = make_guard(max_concurrent=2, max_wait=0.02)
+    release = asyncio.Event()
+
+    async def stalled():
+        await release.wait()
+        return "ok"
+
+    running = [asyncio.create_task(guard.call(stalled)) for _ in range(2)]
+    await asyncio.sleep(0.01)
+    assert guard.bulkhead.active == 2
+
+    with pytest.raises(BulkheadFullError):
+        await guard.call(succeeding)
+
+    release.set()
+    assert await asyncio.gather(*running) == ["ok", "ok"]
+    assert guard.bulkhead.active == 0
+    # Un refus de la cloison n'ouvre pas le circuit
+    assert guard.breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_bulkhead_timeouts_do_not_leak_permits():
+    """Test des attentes expirées en rafale ne font perdre aucune place de la cloison"""
+    bulkhead = Bulkhead("air_quality", 1, 0.005)
+    await bulkhead.acquire()
+
+    async def contender():
+        try:
+            await bulkhead.acquire()
+        except BulkheadFullError:
+            return False
+        await asyncio.sleep(0)
+        bulkhead.release()
+        return True
+
+    waiting = [asyncio.create_task(contender()) for _ in range(20)]
+    await asyncio.sleep(0.005)
+    bulkhead.release()
+    await asyncio.gather(*waiting)
+
+    # Exactement une place libre : ni perdue, ni dupliquée
+    assert bulkhead.active == 0
+    await bulkhead.acquire()
+    assert bulkhead._semaphore.locked()
+    bulkhead.release()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_wait_releases_half_open_probe():
+    """Test une sonde annulée pendant l'attente d'une place ne bloque pas le circuit"""
+    guard = make_guard(threshold=1, recovery=0.01, max_concurrent=1, max_wait=1.0)
+    with pytest.raises(BackendTimeoutError):
+        await guard.call(failing)
+    await asyncio.sleep(0.02)
+
+    await guard.bulkhead.acquire()
+    probe = asyncio.create_task(guard.call(succeeding))
+    await asyncio.sleep(0.01)
+    assert guard.breaker.state == CircuitBreaker.HALF_OPEN
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+    guard.bulkhead.release()
+
+    # Une nouvelle sonde est admise et referme le circuit
+    assert await guard.call(succeeding) == "ok"
+    assert guard.breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_air_quality_bulkhead_fits_soap_pool():
+    """Test la cloison SOAP n'admet pas plus d'appels que la session n'a de connexions"""
+    clients = BackendClients(Settings(soap_max_connections=4, bulkhead_air_quality_max_concurrent=16))
+    try:
+        assert clients.guards["air_quality"].bulkhead.max_concurrent == 4
+    finally:
+        await clients.aclose()
+
+
+def test_health_reports_breaker_state():
+    """Test /health expose l'état des disjoncteurs"""
+    guard = make_guard(threshold=1)
+    guard.breaker.record_failure()
+    fake = SimpleNamespace(backend_states=lambda: {"air_quality": guard.snapshot()})
+    app.dependency_overrides[get_clients] = lambda: fake
+    try:
+        response = TestClient(app).get("/health")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "degraded"
+    assert data["backends"]["air_quality"]["circuit"]["state"] == "open"
@@ -0,0 +1,108 @@
+"""
+Tests unitaires pour la coalescence des appels (single-flight)
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from clients.mobility_client import MobilityClient
+from utils.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    """Test une rafale d'appels identiques -> un seul appel backend"""
+    flight = SingleFlight()
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"etat": "fluide"}
+
+    results = await asyncio.gather(*(flight.do(("mobility", "trafic"), loader) for _ in range(20)))
+
+    assert calls == 1
+    assert all(result == {"etat": "fluide"} for result in results)
+    assert flight.stats == {"calls": 20, "shared": 19}
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_different_keys_are_not_coalesced():
+    """Test des arguments différents -> des appels distincts"""
+    flight = SingleFlight()
+    calls = []
+
+    async def loader(zone):
+        calls.append(zone)
+        await asyncio.sleep(0.01)
+        return zone
+
+    results = await asyncio.gather(
+        flight.do(("air_quality", "GetPollutants", "downtown"), lambda: loader("downtown")),
+        flight.do(("air_quality", "GetPollutants", "park"), lambda: loader("park")),
+    )
+
+    assert results == ["downtown", "park"]
+    assert sorted(calls) == ["downtown", "park"]
+
+
+@pytest.mark.asyncio
+async def test_error_is_shared_and_not_retained():
+    """Test l'erreur est propagée à tous les appelants, puis oubliée"""
+    flight = SingleFlight()
+    calls = 0
+
+    async def failing():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise RuntimeError("backend indisponible")
+
+    results = await asyncio.gather(*(flight.do("k", failing) for _ in range(5)), return_exceptions=True)
+    assert calls == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+    # Le prochain appel relance le backend
+    with pytest.raises(RuntimeError):
+        await flight.do("k", failing)
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_others():
+    """Test l'annulation d'un appelant n'interrompt pas l'appel partagé"""
+    flight = SingleFlight()
+
+    async def loader():
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    first = asyncio.create_task(flight.do("k", loader))
+    second = asyncio.create_task(flight.do("k", loader))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    assert await second == "ok"
+
+
+@pytest.mark.asyncio
+async def test_mobility_trafic_burst_hits_backend_once():
+    """Test une rafale /trafic sur le client Mobilité -> une seule requête HTTP"""
+    requests = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal requests
+        requests += 1
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"lignes": []})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+        client = MobilityClient(http, "http://mobility", singleflight=SingleFlight())
+        results = await asyncio.gather(*(client.get_trafic() for _ in range(10)))
+
+    assert requests == 1
+    assert all(result == {"lignes": []} for result in results)
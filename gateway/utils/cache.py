@@ -0,0 +1,119 @@
+"""
+Cache de réponses en mémoire : TTL, éviction LRU et stale-while-revalidate
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+logger = logging.getLogger("api-gateway")
+
+
+@dataclass
+class _Entry:
+    value: Any
+    fresh_until: float
+    stale_until: float
+
+
+class SWRCache:
+    """
+    Cache TTL/LRU d'un backend.
+
+    - Entrée fraîche : servie directement (hit).
+    - Entrée périmée mais dans la fenêtre `stale_ttl` : servie immédiatement (stale hit)
+      pendant qu'une unique tâche de fond la rafraîchit.
+    - Entrée absente ou expirée : chargée (miss). Les miss concurrents sur une même clé
+      partagent le même appel backend.
+    """
+
+    def __init__(self, name: str, max_entries: int = 1024, stale_ttl: float = 300.0):
+        self.name = name
+        self.max_entries = max_entries
+        self.stale_ttl = stale_ttl
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.stats = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "refreshes": 0,
+            "refresh_errors": 0,
+            "evictions": 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]], ttl: float) -> Any:
+        """Retourne la valeur en cache ou la charge via `loader` (TTL en secondes, 0 = pas de cache)"""
+        if ttl <= 0:
+            return await loader()
+
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None:
+            if now < entry.fresh_until:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry.value
+            if now < entry.stale_until:
+                self._entries.move_to_end(key)
+                self.stats["stale_hits"] += 1
+                self._schedule_refresh(key, loader, ttl)
+                return entry.value
+            del self._entries[key]
+
+        self.stats["misses"] += 1
+        task = self._inflight.get(key) or self._start_load(key, loader, ttl)
+        # shield : l'annulation d'un appelant n'interrompt pas le chargement partagé
+        return await asyncio.shield(task)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Compteurs du cache pour le monitoring"""
+        return {"entries": len(self._entries), "max_entries": self.max_entries, **self.stats}
+
+    def clear(self):
+        """Vide le cache et annule les rafraîchissements en cours"""
+        for task in self._inflight.values():
+            task.cancel()
+        self._inflight.clear()
+        self._entries.clear()
+
+    # ========================================================================
+    # MÉTHODES INTERNES
+    # ========================================================================
+
+    def _start_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]], ttl: float) -> asyncio.Task:
+        task = asyncio.ensure_future(self._load(key, loader, ttl))
+        self._inflight[key] = task
+        task.add_done_callback(lambda t: self._inflight.pop(key, None) if self._inflight.get(key) is t else None)
+        return task
+
+    def _schedule_refresh(self, key: Hashable, loader: Callable[[], Awaitable[Any]], ttl: float):
+        if key in self._inflight:
+            return
+        self.stats["refreshes"] += 1
+        task = self._start_load(key, loader, ttl)
+        task.add_done_callback(lambda t: self._on_refresh_done(key, t))
+
+    def _on_refresh_done(self, key: Hashable, task: asyncio.Task):
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            # La valeur périmée reste servie jusqu'à la fin de la fenêtre stale
+            self.stats["refresh_errors"] += 1
+            logger.warning(f"Cache {self.name}: échec du rafraîchissement de {key!r}: {error}")
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]], ttl: float) -> Any:
+        value = await loader()
+        now = time.monotonic()
+        self._entries[key] = _Entry(value, now + ttl, now + ttl + self.stale_ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+        return value
@@ -0,0 +1,126 @@
+"""
+Encodage des réponses de la gateway : négociation du format et compression
+- `Accept: application/msgpack` -> MessagePack (si le module msgpack est installé)
+- sinon JSON via orjson (repli sur json de la bibliothèque standard)
+- compression brotli ou gzip selon `Accept-Encoding`, au-delà d'une taille minimale
+Les modèles Pydantic sont sérialisés directement en JSON par pydantic-core,
+sans passer par jsonable_encoder ni par un dictionnaire intermédiaire.
+"""
+import gzip
+import json
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+from pydantic import BaseModel
+from pydantic_core import to_jsonable_python
+
+from config.settings import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+
+
+def _default(value: Any) -> Any:
+    """Types non natifs des encodeurs (modèles Pydantic imbriqués, dates...)"""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    raise TypeError(f"Type non sérialisable: {type(value).__name__}")
+
+
+def parse_q_values(header: Optional[str]) -> Dict[str, float]:
+    """Valeurs q d'un en-tête Accept / Accept-Encoding (1.0 par défaut, q invalide -> 0)"""
+    weights: Dict[str, float] = {}
+    for item in (header or "").split(","):
+        value, *params = (part.strip() for part in item.split(";"))
+        if not value:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, raw = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(raw)
+                except ValueError:
+                    q = 0.0
+        weights[value.lower()] = max(q, weights.get(value.lower(), 0.0))
+    return weights
+
+
+def _weight(weights: Dict[str, float], media_type: str) -> float:
+    """q applicable à un type : exact, sinon type/*, sinon */* (0 si absent)"""
+    for candidate in (media_type, media_type.split("/")[0] + "/*", "*/*"):
+        if candidate in weights:
+            return weights[candidate]
+    return 0.0
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """
+    Format de réponse selon l'en-tête Accept (JSON par défaut).
+    MessagePack seulement s'il est demandé explicitement avec q > 0 et au
+    moins aussi bien pondéré que JSON ; `q=0` l'exclut.
+    """
+    if msgpack is None or not accept:
+        return JSON_MEDIA_TYPE
+    weights = parse_q_values(accept)
+    best, best_q = None, 0.0
+    for media_type in MSGPACK_MEDIA_TYPES:
+        q = weights.get(media_type, 0.0)
+        if q > best_q:
+            best, best_q = media_type, q
+    if best is not None and best_q >= _weight(weights, JSON_MEDIA_TYPE):
+        return best
+    return JSON_MEDIA_TYPE
+
+
+def encode(content: Any, media_type: str = JSON_MEDIA_TYPE) -> bytes:
+    """Sérialise `content` dans le format demandé"""
+    if media_type in MSGPACK_MEDIA_TYPES:
+        # Une seule conversion de tout le contenu (modèles imbriqués compris)
+        # par pydantic-core, puis empaquetage sans rappel par valeur
+        return msgpack.packb(to_jsonable_python(content), use_bin_type=True)
+    if isinstance(content, BaseModel):
+        return content.__pydantic_serializer__.to_json(content)
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+def compress(body: bytes, accept_encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+    """Compresse les corps volumineux selon Accept-Encoding (brotli prioritaire)"""
+    if len(body) < settings.compression_min_size or not accept_encoding:
+        return body, None
+    weights = parse_q_values(accept_encoding)
+    if brotli is not None and weights.get("br", weights.get("*", 0.0)) > 0:
+        return brotli.compress(body, quality=settings.brotli_quality), "br"
+    if weights.get("gzip", weights.get("*", 0.0)) > 0:
+        return gzip.compress(body, compresslevel=settings.gzip_level), "gzip"
+    return body, None
+
+
+def respond(request: Request, content: Any, status_code: int = 200) -> Response:
+    """Réponse encodée (format négocié) et compressée si utile"""
+    media_type = negotiate(request.headers.get("accept"))
+    body, content_encoding = compress(encode(content, media_type), request.headers.get("accept-encoding"))
+    headers = {"Vary": "Accept, Accept-Encoding"}
+    if content_encoding:
+        headers["Content-Encoding"] = content_encoding
+    return Response(content=body, status_code=status_code, media_type=media_type, headers=headers)
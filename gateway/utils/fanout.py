@@ -0,0 +1,58 @@
+"""
+Appels concurrents vers les backends avec délai maximal par appel
+Un appel lent ou en erreur ne bloque pas les autres : il est signalé dans son résultat.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Dict, Iterable, Optional, Tuple
+
+from clients.base import BackendError, BackendTimeoutError
+
+logger = logging.getLogger("api-gateway")
+
+
+@dataclass
+class CallResult:
+    """Résultat d'un appel backend (valeur ou erreur)"""
+    name: str
+    status: str  # ok, timeout, error
+    duration_ms: float
+    value: Any = None
+    error: Optional[str] = None
+    status_code: int = 200
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+
+async def call_with_deadline(name: str, awaitable: Awaitable, timeout: float) -> CallResult:
+    """Exécute un appel backend en le coupant au-delà de `timeout` secondes"""
+    start = time.perf_counter()
+
+    def elapsed() -> float:
+        return round((time.perf_counter() - start) * 1000, 2)
+
+    try:
+        value = await asyncio.wait_for(awaitable, timeout)
+    except (asyncio.TimeoutError, BackendTimeoutError):
+        return CallResult(name, "timeout", elapsed(), error=f"Délai de {timeout}s dépassé", status_code=504)
+    except BackendError as e:
+        return CallResult(name, "error", elapsed(), error=e.message, status_code=e.status_code or 502)
+    except Exception as e:
+        logger.error(f"Erreur inattendue sur l'appel {name}: {e}", exc_info=True)
+        return CallResult(name, "error", elapsed(), error=str(e), status_code=500)
+    return CallResult(name, "ok", elapsed(), value=value)
+
+
+async def fan_out(calls: Iterable[Tuple[str, Awaitable, float]]) -> Dict[str, CallResult]:
+    """
+    Lance tous les appels en parallèle.
+    La durée totale est bornée par l'appel le plus lent (ou son délai), pas par la somme.
+    """
+    results = await asyncio.gather(
+        *(call_with_deadline(name, awaitable, timeout) for name, awaitable, timeout in calls)
+    )
+    return {result.name: result for result in results}
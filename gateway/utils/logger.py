@@ -0,0 +1,63 @@
+"""
+Configuration du logger de la gateway
+Les logs sont émis via une file (QueueHandler) : l'écriture sur la sortie standard
+se fait dans le thread d'un QueueListener, jamais dans la boucle asyncio.
+"""
+import atexit
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+_listener: Optional[QueueListener] = None
+
+
+def setup_logger(name: str = "api-gateway", log_level: str = "INFO") -> logging.Logger:
+    """
+    Configure et retourne un logger
+
+    Args:
+        name: Nom du logger
+        log_level: Niveau de log (DEBUG, INFO, WARNING, ERROR)
+
+    Returns:
+        Logger configuré
+    """
+    global _listener
+
+    logger = logging.getLogger(name)
+    logger.setLevel(getattr(logging, log_level.upper()))
+
+    if logger.handlers:
+        return logger
+
+    # Handler console (exécuté par le thread du listener)
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setLevel(logging.DEBUG)
+
+    # Format
+    formatter = logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+    console_handler.setFormatter(formatter)
+
+    # File non bornée : l'appelant ne fait qu'un put_nowait
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(log_queue))
+    logger.propagate = False
+
+    _listener = QueueListener(log_queue, console_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logger)
+
+    return logger
+
+
+def shutdown_logger():
+    """Vide la file et arrête le thread d'écriture des logs"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
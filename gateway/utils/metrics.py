@@ -0,0 +1,163 @@
+"""
+Métriques de latence en mémoire (histogrammes) et export au format Prometheus
+Les observations se font en O(nombre de buckets), sans verrou : la gateway
+tourne dans une seule boucle asyncio par worker.
+"""
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Bornes des buckets en secondes (de 1 ms à 10 s)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class LatencyHistogram:
+    """Histogramme à buckets fixes ; les quantiles sont interpolés dans les buckets"""
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # dernier bucket = +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimation du quantile `q` (interpolation linéaire dans le bucket, comme Prometheus)"""
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            if cumulative + bucket_count >= rank and bucket_count:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+        return self.buckets[-1]
+
+    def snapshot(self) -> Dict[str, Optional[float]]:
+        """Résumé lisible : nombre, moyenne et p50/p95/p99 en millisecondes"""
+        summary = {"count": self.count, "avg_ms": round(self.sum / self.count * 1000, 2) if self.count else None}
+        for q in QUANTILES:
+            value = self.quantile(q)
+            summary[f"p{int(q * 100)}_ms"] = round(value * 1000, 2) if value is not None else None
+        return summary
+
+
+class MetricFamily:
+    """Famille d'histogrammes partageant un nom et des noms de labels"""
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.series: Dict[Tuple[str, ...], LatencyHistogram] = {}
+
+    def observe(self, label_values: Tuple[str, ...], seconds: float):
+        histogram = self.series.get(label_values)
+        if histogram is None:
+            histogram = self.series[label_values] = LatencyHistogram()
+        histogram.observe(seconds)
+
+    def render(self) -> List[str]:
+        """Lignes Prometheus : histogramme (_bucket, _sum, _count) et quantiles estimés"""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        quantile_lines = []
+        for values, histogram in sorted(self.series.items()):
+            labels = _format_labels(zip(self.label_names, values))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets_labels(histogram), histogram.counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{_merge(labels, 'le', bound)} {cumulative}")
+            lines.append(f"{self.name}_sum{labels} {histogram.sum:.6f}")
+            lines.append(f"{self.name}_count{labels} {histogram.count}")
+            for q in QUANTILES:
+                value = histogram.quantile(q)
+                if value is not None:
+                    quantile_lines.append(f"{self.name}_quantile{_merge(labels, 'quantile', str(q))} {value:.6f}")
+        if quantile_lines:
+            lines.append(f"# HELP {self.name}_quantile Quantiles estimés à partir de l'histogramme")
+            lines.append(f"# TYPE {self.name}_quantile gauge")
+            lines.extend(quantile_lines)
+        return lines
+
+    def snapshot(self) -> List[Dict]:
+        return [
+            {**dict(zip(self.label_names, values)), **histogram.snapshot()}
+            for values, histogram in sorted(self.series.items())
+        ]
+
+    @staticmethod
+    def buckets_labels(histogram: LatencyHistogram) -> List[str]:
+        return [repr(bound) for bound in histogram.buckets] + ["+Inf"]
+
+
+class MetricsRegistry:
+    """Registre des latences par route HTTP et par appel backend"""
+
+    def __init__(self):
+        self.requests = MetricFamily(
+            "gateway_http_request_duration_seconds",
+            "Durée des requêtes HTTP traitées par la gateway",
+            ("method", "route", "status"),
+        )
+        self.backends = MetricFamily(
+            "gateway_backend_call_duration_seconds",
+            "Durée des appels vers les services backend",
+            ("backend", "operation", "outcome"),
+        )
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float):
+        self.requests.observe((method, route, str(status)), seconds)
+
+    def observe_backend(self, backend: str, operation: str, outcome: str, seconds: float):
+        self.backends.observe((backend, operation, outcome), seconds)
+
+    def render_prometheus(self, extra: Iterable[str] = ()) -> str:
+        """Export texte Prometheus (format 0.0.4)"""
+        lines = self.requests.render() + self.backends.render()
+        lines.extend(extra)
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict[str, List[Dict]]:
+        return {"routes": self.requests.snapshot(), "backends": self.backends.snapshot()}
+
+    def reset(self):
+        self.requests.series.clear()
+        self.backends.series.clear()
+
+
+def render_gauge(name: str, help_text: str, samples: Iterable[Tuple[Dict[str, str], float]]) -> List[str]:
+    """Lignes Prometheus d'une jauge simple"""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+    lines.extend(f"{name}{_format_labels(labels.items())} {value}" for labels, value in samples)
+    return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(pairs: Iterable[Tuple[str, str]]) -> str:
+    body = ",".join(f'{name}="{_escape(str(value))}"' for name, value in pairs)
+    return f"{{{body}}}" if body else ""
+
+
+def _merge(labels: str, name: str, value: str) -> str:
+    extra = f'{name}="{value}"'
+    return f"{labels[:-1]},{extra}}}" if labels else f"{{{extra}}}"
+
+
+# Registre unique de la gateway
+metrics = MetricsRegistry()
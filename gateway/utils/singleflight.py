@@ -0,0 +1,45 @@
+"""
+Coalescence des appels identiques en cours (single-flight)
+Indépendant du cache : fonctionne même sans TTL, pour les données temps réel.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    Partage un appel backend entre tous les appelants concurrents d'une même clé.
+    Le premier appelant lance l'appel, les suivants attendent le même futur et
+    reçoivent le même résultat (ou la même exception). Rien n'est conservé après.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.stats = {"calls": 0, "shared": 0}
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Exécute `fn` ou rejoint l'appel déjà en cours pour `key`"""
+        self.stats["calls"] += 1
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fn())
+            self._inflight[key] = future
+            future.add_done_callback(lambda f: self._forget(key, f))
+        else:
+            self.stats["shared"] += 1
+        # shield : un appelant annulé n'annule pas l'appel des autres
+        return await asyncio.shield(future)
+
+    def snapshot(self) -> Dict[str, int]:
+        """Compteurs pour le monitoring"""
+        return {"inflight": len(self._inflight), **self.stats}
+
+    def _forget(self, key: Hashable, future: asyncio.Future):
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        if not future.cancelled():
+            # Marque l'exception comme récupérée si tous les appelants sont partis
+            future.exception()
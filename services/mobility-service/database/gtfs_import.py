@@ -0,0 +1,282 @@
+"""
+Import en masse d'un flux GTFS (routes.txt, trips.txt, stop_times.txt) dans
+les tables lignes et horaires
+
+Pipeline de générateurs : stop_times.txt est lu ligne à ligne, regroupé par
+course, transformé en horaires puis inséré par lots (COPY sur PostgreSQL,
+INSERT multi-lignes ailleurs). La mémoire reste constante quelle que soit la
+taille du flux ; seuls les référentiels (lignes, courses, arrêts) sont chargés.
+
+Usage :
+    python -m database.gtfs_import chemin/vers/gtfs [--batch-size 10000]
+"""
+from functools import lru_cache
+from itertools import count, groupby, islice
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from pathlib import Path
+from datetime import datetime
+import csv
+import logging
+import time
+import uuid
+
+from sqlalchemy import insert, select
+
+from database.connection import get_session_factory
+from database.models import HoraireModel, LigneModel
+from models.entities import Horaire, Ligne, TypeTransport
+
+logger = logging.getLogger("mobility-service")
+
+# route_type GTFS -> type_transport
+ROUTE_TYPES = {
+    "0": "tramway",
+    "1": "metro",
+    "2": "train",
+    "3": "bus",
+}
+
+HORAIRE_COLUMNS = ("id", "ligne_id", "destination", "heure_depart", "heure_arrivee", "station", "quai", "created_at")
+
+# ============================================================================
+# LECTURE
+# ============================================================================
+
+def read_rows(path: Path) -> Iterator[Dict[str, str]]:
+    """Lit un fichier GTFS ligne à ligne (BOM UTF-8 toléré)"""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        yield from csv.DictReader(f)
+
+def read_columns(path: Path, *columns: str) -> Iterator[tuple]:
+    """Lit seulement les colonnes demandées, en tuples (chemin rapide pour stop_times.txt)"""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        yield from map(itemgetter(*(header.index(column) for column in columns)), reader)
+
+@lru_cache(maxsize=None)
+def gtfs_time(value: str) -> str:
+    """
+    Heure GTFS (H:MM:SS) -> HH:MM. Les heures de 24:00 et plus (courses de nuit
+    du jour de service) sont conservées telles quelles : ramenées modulo 24,
+    une course de nuit arriverait avant son départ et serait triée avant les
+    premières courses de la journée.
+    """
+    heures, minutes = value.strip().split(":")[:2]
+    return f"{int(heures):02d}:{int(minutes):02d}"
+
+def batched(rows: Iterable, size: int) -> Iterator[List]:
+    """Découpe un flux en lots de `size` éléments"""
+    iterator = iter(rows)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+# ============================================================================
+# TRANSFORMATION
+# ============================================================================
+
+def load_stops(feed: Path) -> Dict[str, Tuple[str, str]]:
+    """stop_id -> (nom, quai) ; stops.txt est facultatif (l'identifiant sert alors de nom)"""
+    path = feed / "stops.txt"
+    if not path.exists():
+        return {}
+    return {
+        row["stop_id"]: (row.get("stop_name") or row["stop_id"], row.get("platform_code") or "")
+        for row in read_rows(path)
+    }
+
+def ligne_from_route(route: Dict[str, str]) -> Dict[str, object]:
+    """Ligne (colonnes de la table lignes) à partir d'une entrée de routes.txt"""
+    numero = route.get("route_short_name") or route["route_id"]
+    nom = route.get("route_long_name") or numero
+    debut, _, fin = nom.partition(" - ")
+    return {
+        "numero": numero[:10],
+        "nom": nom[:255],
+        "type_transport": ROUTE_TYPES.get(route.get("route_type", "3"), "bus"),
+        "terminus_debut": debut[:255],
+        "terminus_fin": (fin or debut)[:255],
+        "actif": True,
+    }
+
+def load_trips(feed: Path, route_lignes: Dict[str, str]) -> Dict[str, Tuple[str, str]]:
+    """Courses : trip_id -> (ligne, destination affichée), pour les routes retenues"""
+    return {
+        row["trip_id"]: (route_lignes[row["route_id"]], row.get("trip_headsign") or "")
+        for row in read_rows(feed / "trips.txt")
+        if row["route_id"] in route_lignes
+    }
+
+def read_stop_times(feed: Path) -> Iterator[tuple]:
+    """stop_times.txt en flux, colonnes utiles seulement"""
+    return read_columns(
+        feed / "stop_times.txt", "trip_id", "arrival_time", "departure_time", "stop_id", "stop_sequence"
+    )
+
+def horaire_ids() -> Iterator[str]:
+    """
+    Identifiants des horaires importés : préfixe aléatoire de l'import + compteur
+    (36 caractères comme un UUID, sans tirage aléatoire par ligne)
+    """
+    prefix = uuid.uuid4().hex[:23]
+    return (f"{prefix}-{n:012x}" for n in count())
+
+def horaires_from_stop_times(
+    stop_times: Iterable[tuple],
+    trips: Dict[str, Tuple[str, str]],
+    stops: Dict[str, Tuple[str, str]],
+    now: datetime
+) -> Iterator[tuple]:
+    """
+    Transforme stop_times.txt (tuples trip_id, arrival_time, departure_time,
+    stop_id, stop_sequence ; trié par course comme le produisent les exports
+    GTFS) en horaires : un départ par arrêt, vers le terminus de la course.
+    Seule la course en cours est en mémoire.
+    """
+    ids = horaire_ids()
+    for trip_id, rows in groupby(stop_times, key=itemgetter(0)):
+        trip = trips.get(trip_id)
+        if trip is None:
+            continue
+        ligne_id, headsign = trip
+        arrets = sorted(rows, key=lambda row: int(row[4]))
+        _, arrivee, depart, stop_id, _ = arrets[-1]
+        heure_arrivee = gtfs_time(arrivee or depart)
+        destination = (headsign or stops.get(stop_id, (stop_id, ""))[0])[:255]
+        for _, _, depart, stop_id, _ in arrets[:-1]:
+            if not depart:
+                continue
+            station, quai = stops.get(stop_id, (stop_id, ""))
+            yield (
+                next(ids),
+                ligne_id,
+                destination,
+                gtfs_time(depart),
+                heure_arrivee,
+                station[:255],
+                quai[:10],
+                now,
+            )
+
+# ============================================================================
+# CHARGEMENT
+# ============================================================================
+
+async def _copy_batch(session, batch: List[tuple]):
+    """Insère un lot : COPY binaire (asyncpg) sur PostgreSQL, INSERT multi-lignes sinon"""
+    connection = await session.connection()
+    if connection.dialect.name == "postgresql":
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            HoraireModel.__tablename__, records=batch, columns=HORAIRE_COLUMNS
+        )
+    else:
+        await session.execute(insert(HoraireModel.__table__), [dict(zip(HORAIRE_COLUMNS, row)) for row in batch])
+
+async def import_gtfs(feed_dir: str, batch_size: int = 10000) -> Dict[str, float]:
+    """
+    Importe un flux GTFS décompressé. Les lignes déjà présentes (même numéro)
+    sont réutilisées ; tout l'import est une seule transaction.
+    Retourne les compteurs et le débit (horaires/s).
+    """
+    feed = Path(feed_dir)
+    started = time.perf_counter()
+    now = datetime.now()
+
+    async with get_session_factory()() as session:
+        # Lignes : une requête pour les numéros existants, un INSERT multi-lignes pour les nouvelles
+        existing = dict((await session.execute(select(LigneModel.numero, LigneModel.id))).all())
+        route_lignes: Dict[str, str] = {}
+        nouvelles = []
+        for route in read_rows(feed / "routes.txt"):
+            ligne = ligne_from_route(route)
+            ligne_id = existing.get(ligne["numero"])
+            if ligne_id is None:
+                ligne_id = existing[ligne["numero"]] = str(uuid.uuid4())
+                nouvelles.append({"id": ligne_id, "created_at": now, "updated_at": now, **ligne})
+            route_lignes[route["route_id"]] = ligne_id
+        if nouvelles:
+            await session.execute(insert(LigneModel), nouvelles)
+
+        trips = load_trips(feed, route_lignes)
+        stops = load_stops(feed)
+
+        # Horaires : flux -> lots -> COPY
+        horaires = 0
+        rows = horaires_from_stop_times(read_stop_times(feed), trips, stops, now)
+        for batch in batched(rows, batch_size):
+            await _copy_batch(session, batch)
+            horaires += len(batch)
+            logger.info(f"📥 {horaires} horaires importés...")
+        await session.commit()
+
+    elapsed = time.perf_counter() - started
+    stats = {
+        "lignes": len(nouvelles),
+        "courses": len(trips),
+        "horaires": horaires,
+        "secondes": round(elapsed, 3),
+        "horaires_par_seconde": round(horaires / elapsed) if elapsed > 0 else 0,
+    }
+    logger.info(
+        f"✅ Import GTFS : {stats['lignes']} lignes, {horaires} horaires en {stats['secondes']}s "
+        f"({stats['horaires_par_seconde']} horaires/s)"
+    )
+    return stats
+
+def gtfs_lignes(feed_dir: str) -> List[Ligne]:
+    """Référentiel des lignes d'un flux GTFS sans passer par la base (identifiant = route_id)"""
+    lignes = []
+    for route in read_rows(Path(feed_dir) / "routes.txt"):
+        champs = ligne_from_route(route)
+        champs["type_transport"] = TypeTransport(champs["type_transport"])
+        lignes.append(Ligne(route["route_id"], **champs))
+    return lignes
+
+def gtfs_horaires(feed_dir: str) -> Iterator[Tuple[str, Horaire]]:
+    """
+    Horaires d'un flux GTFS sans passer par la base : couples (numéro de
+    ligne, horaire) pour TimetableStore.build, avec la même transformation
+    que l'import. Sans base, l'identifiant de ligne est le route_id GTFS.
+    """
+    feed = Path(feed_dir)
+    numeros: Dict[str, str] = {}
+    for route in read_rows(feed / "routes.txt"):
+        numeros[route["route_id"]] = ligne_from_route(route)["numero"]
+    trips = load_trips(feed, {route_id: route_id for route_id in numeros})
+    rows = horaires_from_stop_times(read_stop_times(feed), trips, load_stops(feed), datetime.now())
+    for ordinal, (_, ligne_id, destination, depart, arrivee, station, quai, _) in enumerate(rows, start=1):
+        yield numeros[ligne_id], Horaire(f"h{ordinal}", ligne_id, destination, depart, arrivee, station, quai)
+
+# ============================================================================
+# POINT D'ENTRÉE
+# ============================================================================
+
+def main(argv: Optional[List[str]] = None):
+    """Ligne de commande : crée les tables si besoin puis importe le flux"""
+    import argparse
+    import asyncio
+    from database.connection import close_db, init_db
+
+    parser = argparse.ArgumentParser(description="Import d'un flux GTFS dans la base Mobilité")
+    parser.add_argument("feed", help="Répertoire contenant routes.txt, trips.txt, stop_times.txt")
+    parser.add_argument("--batch-size", type=int, default=10000, help="Horaires par lot COPY")
+    args = parser.parse_args(argv)
+
+    async def run():
+        try:
+            await init_db()
+            stats = await import_gtfs(args.feed, args.batch_size)
+        finally:
+            await close_db()
+        print(
+            f"{stats['horaires']} horaires en {stats['secondes']}s "
+            f"-> {stats['horaires_par_seconde']} horaires/s"
+        )
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    asyncio.run(run())
+
+if __name__ == "__main__":
+    main()
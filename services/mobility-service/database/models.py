@@ -2,7 +2,7 @@
 """
 Modèles SQLAlchemy (ORM) - Représentation des tables PostgreSQL
 """
-from sqlalchemy import Column, String, Integer, Float, Boolean, DateTime, ForeignKey, Text
+from sqlalchemy import Column, String, Integer, Float, Boolean, DateTime, ForeignKey, Index, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -17,7 +17,7 @@ class LigneModel(Base):
     id = Column(String(36), primary_key=True)
     numero = Column(String(10), unique=True, nullable=False, index=True)
     nom = Column(String(255), nullable=False)
-    type_transport = Column(String(20), nullable=False)
+    type_transport = Column(String(20), nullable=False, index=True)
     terminus_debut = Column(String(255), nullable=False)
     terminus_fin = Column(String(255), nullable=False)
     actif = Column(Boolean, default=True, nullable=False)
@@ -48,6 +48,11 @@ class HoraireModel(Base):
     
     # Relation
     ligne = relationship("LigneModel", back_populates="horaires")
+    
+    # Prochains départs : station d'une ligne parcourue dans l'ordre des heures
+    __table_args__ = (
+        Index("ix_horaires_ligne_station_depart", "ligne_id", "station", "heure_depart"),
+    )
 
 # ============================================================================
 # Table: etats_trafic
@@ -6,17 +6,19 @@ from fastapi import FastAPI, Request, status
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 import logging
-import yaml
 
 # Import des routes
-from routes import horaires, trafic, disponibilite, lignes
+from routes import horaires, itineraires, trafic, disponibilite, lignes
 
 # Import du middleware
 from middleware.logging_middleware import LoggingMiddleware
 
 # Import de la configuration
 from config.settings import settings
+from repositories.factory import use_sql
+from services.container import ServiceContainer
 
 # Configuration du logging
 logger = logging.getLogger("mobility-service")
@@ -28,16 +30,34 @@ async def lifespan(app: FastAPI):
     logger.info(f"📍 Version: {settings.app_version}")
     logger.info(f"🌐 Mode debug: {settings.debug}")
     
-    # Export de la documentation OpenAPI au démarrage
-    try:
-        with open("openapi.yaml", "w") as f:
-            yaml.dump(app.openapi(), f, allow_unicode=True, default_flow_style=False)
-        logger.info("✅ Documentation OpenAPI générée: openapi.yaml")
-    except Exception as e:
-        logger.error(f"❌ Erreur lors de la génération OpenAPI: {e}")
+    # Stockage PostgreSQL : un pool asynchrone par worker
+    # (SQLAlchemy n'est importé que dans ce mode)
+    if use_sql():
+        from database.connection import init_db, pool_size_per_worker, seed_data
+        logger.info(
+            f"🗄️  Stockage SQL ({settings.workers} worker(s), pool de {pool_size_per_worker()} connexion(s) par worker)"
+        )
+        if settings.database_create_tables:
+            await init_db()
+            await seed_data()
+    
+    # Repositories et services partagés par toutes les routes du worker,
+    # construits à leur premier usage
+    app.state.container = ServiceContainer()
+    
+    # Graphe des itinéraires précalculé en tâche de fond : le worker accepte
+    # des requêtes sans attendre la fin de la construction
+    warmup = None
+    if settings.itineraire_warmup:
+        warmup = asyncio.create_task(app.state.container.itineraire_service.refresh())
+    
+    # openapi.yaml est généré au build (python -m utils.openapi_export), pas à chaque démarrage
     
     yield
     
+    if warmup is not None and not warmup.done():
+        warmup.cancel()
+    await app.state.container.aclose()
     logger.info("🛑 Arrêt du Service de Mobilité Intelligente")
 
 # Création de l'application FastAPI
@@ -69,6 +89,7 @@ app = FastAPI(
     - `POST /lignes` - Créer une ligne
     - `PUT /lignes/{id}` - Modifier une ligne
     - `DELETE /lignes/{id}` - Supprimer une ligne
+    - `GET /itineraires` - Itinéraire arrivant au plus tôt
     """,
     version=settings.app_version,
     lifespan=lifespan,
@@ -94,6 +115,7 @@ app.include_router(horaires.router)
 app.include_router(trafic.router)
 app.include_router(disponibilite.router)
 app.include_router(lignes.router)
+app.include_router(itineraires.router)
 
 # ============================================================================
 # ROUTES SYSTÈME
@@ -114,7 +136,8 @@ async def root():
             "horaires": "/horaires/{ligne}",
             "trafic": "/trafic",
             "disponibilite": "/disponibilite",
-            "lignes": "/lignes"
+            "lignes": "/lignes",
+            "itineraires": "/itineraires"
         }
     }
 
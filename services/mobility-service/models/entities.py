@@ -1,10 +1,25 @@
 """
 Entités du domaine métier (modèles internes)
+
+Dataclasses à slots : pas de __dict__ par instance (empreinte mémoire réduite
+sur les gros catalogues d'horaires) et accès aux attributs plus rapide dans les
+boucles de sérialisation. L'égalité reste l'identité (eq=False) : les entités
+sont des objets mutables du repository, pas des valeurs.
 """
+from dataclasses import dataclass, field
 from typing import List, Optional
 from datetime import datetime
 from enum import Enum
 
+def heure_to_minutes(heure: str) -> int:
+    """Convertit une heure HH:MM en minutes depuis minuit"""
+    heures, minutes = heure.split(":")
+    return int(heures) * 60 + int(minutes)
+
+def minutes_to_heure(minutes: int) -> str:
+    """Convertit des minutes depuis minuit en heure HH:MM"""
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
 class StatutTrafic(str, Enum):
     NORMAL = "normal"
     RETARD = "retard"
@@ -17,78 +32,61 @@ class TypeTransport(str, Enum):
     TRAIN = "train"
     TRAMWAY = "tramway"
 
+@dataclass(slots=True, eq=False)
 class Ligne:
     """Entité représentant une ligne de transport"""
-    def __init__(
-        self,
-        id: str,
-        numero: str,
-        nom: str,
-        type_transport: TypeTransport,
-        terminus_debut: str,
-        terminus_fin: str,
-        actif: bool = True,
-        created_at: Optional[datetime] = None,
-        updated_at: Optional[datetime] = None
-    ):
-        self.id = id
-        self.numero = numero
-        self.nom = nom
-        self.type_transport = type_transport
-        self.terminus_debut = terminus_debut
-        self.terminus_fin = terminus_fin
-        self.actif = actif
-        self.created_at = created_at or datetime.now()
-        self.updated_at = updated_at or datetime.now()
+    id: str
+    numero: str
+    nom: str
+    type_transport: TypeTransport
+    terminus_debut: str
+    terminus_fin: str
+    actif: bool = True
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    def __post_init__(self):
+        self.created_at = self.created_at or datetime.now()
+        self.updated_at = self.updated_at or datetime.now()
 
+@dataclass(slots=True, eq=False)
 class Horaire:
     """Entité représentant un horaire de passage"""
-    def __init__(
-        self,
-        id: str,
-        ligne_id: str,
-        destination: str,
-        heure_depart: str,
-        heure_arrivee: str,
-        station: str,
-        quai: str
-    ):
-        self.id = id
-        self.ligne_id = ligne_id
-        self.destination = destination
-        self.heure_depart = heure_depart
-        self.heure_arrivee = heure_arrivee
-        self.station = station
-        self.quai = quai
+    id: str
+    ligne_id: str
+    destination: str
+    heure_depart: str
+    heure_arrivee: str
+    station: str
+    quai: str
+    # Heures pré-calculées en minutes (comparaisons entières, pas de chaînes)
+    depart_minutes: int = field(init=False, repr=False)
+    arrivee_minutes: int = field(init=False, repr=False)
 
+    def __post_init__(self):
+        self.depart_minutes = heure_to_minutes(self.heure_depart)
+        self.arrivee_minutes = heure_to_minutes(self.heure_arrivee)
+
+@dataclass(slots=True, eq=False)
 class EtatTrafic:
     """Entité représentant l'état du trafic"""
-    def __init__(
-        self,
-        ligne_id: str,
-        statut: StatutTrafic,
-        retard_minutes: int = 0,
-        message: str = "",
-        timestamp: Optional[datetime] = None
-    ):
-        self.ligne_id = ligne_id
-        self.statut = statut
-        self.retard_minutes = retard_minutes
-        self.message = message
-        self.timestamp = timestamp or datetime.now()
+    ligne_id: str
+    statut: StatutTrafic
+    retard_minutes: int = 0
+    message: str = ""
+    timestamp: Optional[datetime] = None
+
+    def __post_init__(self):
+        self.timestamp = self.timestamp or datetime.now()
 
+@dataclass(slots=True, eq=False)
 class Disponibilite:
     """Entité représentant la disponibilité des véhicules"""
-    def __init__(
-        self,
-        ligne_id: str,
-        vehicules_total: int,
-        vehicules_en_service: int,
-        taux_disponibilite: float,
-        derniere_maj: Optional[datetime] = None
-    ):
-        self.ligne_id = ligne_id
-        self.vehicules_total = vehicules_total
-        self.vehicules_en_service = vehicules_en_service
-        self.taux_disponibilite = taux_disponibilite
-        self.derniere_maj = derniere_maj or datetime.now()
\ No newline at end of file
+    ligne_id: str
+    vehicules_total: int
+    vehicules_en_service: int
+    taux_disponibilite: float
+    derniere_maj: Optional[datetime] = None
+
+    def __post_init__(self):
+        self.derniere_maj = self.derniere_maj or datetime.now()
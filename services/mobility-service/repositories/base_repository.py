@@ -1,36 +1,75 @@
 """
 Repository de base avec pattern Repository abstrait
-Facilite l'intégration future d'une vraie base de données
+Interface asynchrone : implémentée en mémoire (mock) et en SQL (asyncpg)
 """
 from abc import ABC, abstractmethod
-from typing import List, Optional, TypeVar, Generic
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple, TypeVar, Generic
+import uuid
 
 T = TypeVar('T')
 
+class DuplicateKeyError(ValueError):
+    """Violation d'une contrainte d'unicité (ex: numéro de ligne déjà utilisé)"""
+    
+    def __init__(self, field: str, value: str):
+        super().__init__(f"{field} '{value}' déjà utilisé")
+        self.field = field
+        self.value = value
+
+class BatchOperationError(Exception):
+    """Échec d'une opération d'un lot : aucune opération du lot n'est appliquée"""
+    
+    def __init__(self, index: int, error: Exception):
+        super().__init__(f"opération {index}: {error}")
+        self.index = index
+        self.error = error
+
+class VersionedRepository:
+    """
+    Version des données d'un repository en mémoire, pour les requêtes
+    conditionnelles (ETag / Last-Modified) : incrémentée à chaque écriture.
+    Le préfixe d'instance distingue les données propres à chaque worker.
+    """
+    
+    def __init__(self):
+        self._instance = uuid.uuid4().hex[:8]
+        self._version = 0
+        self._last_modified = datetime.now(timezone.utc).replace(microsecond=0)
+    
+    def _touch(self):
+        """Signale une modification des données"""
+        self._version += 1
+        self._last_modified = datetime.now(timezone.utc).replace(microsecond=0)
+    
+    async def get_version(self) -> Tuple[str, datetime]:
+        """Jeton de version et date de dernière modification (sans lire les données)"""
+        return f"{self._instance}-{self._version}", self._last_modified
+
 class BaseRepository(ABC, Generic[T]):
     """Interface de base pour tous les repositories"""
     
     @abstractmethod
-    def find_all(self) -> List[T]:
+    async def find_all(self) -> List[T]:
         """Récupère tous les éléments"""
         pass
     
     @abstractmethod
-    def find_by_id(self, id: str) -> Optional[T]:
+    async def find_by_id(self, id: str) -> Optional[T]:
         """Récupère un élément par son ID"""
         pass
     
     @abstractmethod
-    def create(self, entity: T) -> T:
+    async def create(self, entity: T) -> T:
         """Crée un nouvel élément"""
         pass
     
     @abstractmethod
-    def update(self, id: str, entity: T) -> Optional[T]:
+    async def update(self, id: str, entity: T) -> Optional[T]:
         """Met à jour un élément existant"""
         pass
     
     @abstractmethod
-    def delete(self, id: str) -> bool:
+    async def delete(self, id: str) -> bool:
         """Supprime un élément"""
         pass
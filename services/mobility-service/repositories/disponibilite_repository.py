@@ -1,14 +1,16 @@
 """
 Repository pour la disponibilité des véhicules
 """
-from typing import List, Dict
+from typing import Iterable, List, Dict
 from models.entities import Disponibilite
+from repositories.base_repository import VersionedRepository
 from datetime import datetime
 
-class DisponibiliteRepository:
+class DisponibiliteRepository(VersionedRepository):
     """Repository en mémoire pour la disponibilité"""
     
     def __init__(self):
+        super().__init__()
         self._storage: Dict[str, Disponibilite] = {}
         self._initialize_mock_data()
     
@@ -21,10 +23,16 @@ class DisponibiliteRepository:
             "4": Disponibilite("4", 8, 7, 87.5, datetime.now()),
         }
     
-    def find_all(self) -> List[Disponibilite]:
+    async def find_all(self) -> List[Disponibilite]:
         """Récupère la disponibilité de toutes les lignes"""
         return list(self._storage.values())
     
-    def find_by_ligne(self, ligne_id: str) -> Disponibilite:
+    async def find_by_ligne(self, ligne_id: str) -> Disponibilite:
         """Récupère la disponibilité d'une ligne spécifique"""
-        return self._storage.get(ligne_id, Disponibilite(ligne_id, 0, 0, 0.0))
\ No newline at end of file
+        return self._storage.get(ligne_id, Disponibilite(ligne_id, 0, 0, 0.0))
+    
+    async def save_many(self, disponibilites: Iterable[Disponibilite]):
+        """Enregistre un lot de disponibilités (une entrée par ligne)"""
+        for disponibilite in disponibilites:
+            self._storage[disponibilite.ligne_id] = disponibilite
+        self._touch()
@@ -0,0 +1,60 @@
+"""
+Sélection de l'implémentation des repositories (mémoire ou SQL)
+selon settings.repository_backend
+Les horaires précompilés (TIMETABLE_PATH) remplacent le repository des
+horaires quel que soit le stockage ; sans base, le référentiel des lignes est
+celui embarqué dans le fichier.
+"""
+from config.settings import settings
+
+def use_sql() -> bool:
+    """Vrai si le service est adossé à PostgreSQL"""
+    return settings.repository_backend == "sql"
+
+def open_timetable():
+    """Horaires précompilés mappés en mémoire (None sans TIMETABLE_PATH)"""
+    if not settings.timetable_path:
+        return None
+    from repositories.timetable_store import TimetableStore
+    return TimetableStore.open(settings.timetable_path)
+
+def create_ligne_repository(timetable=None):
+    """Repository des lignes"""
+    if use_sql():
+        from database.connection import get_session_factory
+        from repositories.sql import SqlLigneRepository
+        return SqlLigneRepository(get_session_factory())
+    from repositories.ligne_repository import LigneRepository
+    if timetable is not None:
+        return LigneRepository(timetable.lignes_referentiel())
+    return LigneRepository()
+
+def create_horaire_repository(timetable=None):
+    """Repository des horaires"""
+    if timetable is not None:
+        from repositories.horaire_repository import HoraireRepository
+        return HoraireRepository(timetable)
+    if use_sql():
+        from database.connection import get_session_factory
+        from repositories.sql import SqlHoraireRepository
+        return SqlHoraireRepository(get_session_factory())
+    from repositories.horaire_repository import HoraireRepository
+    return HoraireRepository()
+
+def create_trafic_repository():
+    """Repository de l'état du trafic"""
+    if use_sql():
+        from database.connection import get_session_factory
+        from repositories.sql import SqlTraficRepository
+        return SqlTraficRepository(get_session_factory())
+    from repositories.trafic_repository import TraficRepository
+    return TraficRepository()
+
+def create_disponibilite_repository():
+    """Repository de la disponibilité"""
+    if use_sql():
+        from database.connection import get_session_factory
+        from repositories.sql import SqlDisponibiliteRepository
+        return SqlDisponibiliteRepository(get_session_factory())
+    from repositories.disponibilite_repository import DisponibiliteRepository
+    return DisponibiliteRepository()
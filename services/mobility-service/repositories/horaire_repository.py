@@ -1,36 +1,53 @@
 """
 Repository pour la gestion des horaires
 """
-from typing import List, Dict
+from typing import List, Optional
 from models.entities import Horaire
+from repositories.base_repository import VersionedRepository
+from repositories.timetable_store import TimetableStore
 
-class HoraireRepository:
-    """Repository en mémoire pour les horaires"""
+class HoraireRepository(VersionedRepository):
+    """
+    Repository en mémoire pour les horaires
+    Adossé à un TimetableStore en colonnes : soit construit à partir des
+    données mockées, soit mappé depuis un fichier précompilé partagé par les workers.
+    """
     
-    def __init__(self):
-        self._storage: Dict[str, List[Horaire]] = {}
-        self._initialize_mock_data()
+    def __init__(self, store: Optional[TimetableStore] = None):
+        super().__init__()
+        # `is None` : un stockage vide (len 0) reste un stockage fourni
+        self._store = store if store is not None else TimetableStore.build(self.mock_data())
     
-    def _initialize_mock_data(self):
-        """Initialise des horaires mockés"""
-        self._storage = {
-            "L1": [
-                Horaire("h1", "1", "Banlieue Nord", "08:00", "08:25", "Gare Centrale", "A"),
-                Horaire("h2", "1", "Banlieue Nord", "08:15", "08:40", "Gare Centrale", "A"),
-                Horaire("h3", "1", "Gare Centrale", "08:30", "08:55", "Banlieue Nord", "B"),
-            ],
-            "L2": [
-                Horaire("h4", "2", "Gare Ouest", "07:50", "08:15", "Gare Est", "1"),
-                Horaire("h5", "2", "Gare Ouest", "08:20", "08:45", "Gare Est", "1"),
-            ],
-            "B15": [
-                Horaire("h6", "3", "Campus Universitaire", "08:05", "08:30", "Centre-Ville", "C"),
-                Horaire("h7", "3", "Centre-Ville", "08:35", "09:00", "Campus Universitaire", "D"),
-            ],
-        }
+    @staticmethod
+    def mock_data():
+        """Horaires mockés : couples (numéro de ligne, horaire)"""
+        return [
+            ("L1", Horaire("h1", "1", "Banlieue Nord", "08:00", "08:25", "Gare Centrale", "A")),
+            ("L1", Horaire("h2", "1", "Banlieue Nord", "08:15", "08:40", "Gare Centrale", "A")),
+            ("L1", Horaire("h3", "1", "Gare Centrale", "08:30", "08:55", "Banlieue Nord", "B")),
+            ("L2", Horaire("h4", "2", "Gare Ouest", "07:50", "08:15", "Gare Est", "1")),
+            ("L2", Horaire("h5", "2", "Gare Ouest", "08:20", "08:45", "Gare Est", "1")),
+            ("B15", Horaire("h6", "3", "Campus Universitaire", "08:05", "08:30", "Centre-Ville", "C")),
+            ("B15", Horaire("h7", "3", "Centre-Ville", "08:35", "09:00", "Campus Universitaire", "D")),
+        ]
     
-    def find_by_ligne(self, ligne: str) -> List[Horaire]:
+    @property
+    def store(self) -> TimetableStore:
+        """Stockage en colonnes sous-jacent"""
+        return self._store
+    
+    async def find_all(self) -> List[Horaire]:
+        """Récupère tous les horaires du réseau (graphe des itinéraires)"""
+        return [horaire for ligne in self._store.lignes for horaire in self._store.horaires(ligne)]
+    
+    async def find_by_ligne(self, ligne: str) -> List[Horaire]:
         """Récupère tous les horaires d'une ligne"""
-        return self._storage.get(ligne, [])
-  
-  
\ No newline at end of file
+        return self._store.horaires(ligne)
+    
+    async def find_prochains(self, ligne: str, station: str, apres: int, limite: int) -> List[Horaire]:
+        """Prochains départs d'une station à partir de `apres` (minutes depuis minuit), en O(log n)"""
+        return self._store.prochains(ligne, station, apres, limite)
+    
+    def close(self):
+        """Libère le fichier mappé éventuel"""
+        self._store.close()
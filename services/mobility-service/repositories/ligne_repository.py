@@ -1,19 +1,39 @@
 """
 Repository pour la gestion des lignes de transport
 """
-from typing import List, Optional, Dict
-from repositories.base_repository import BaseRepository
+from bisect import bisect_left, bisect_right, insort
+from typing import Hashable, Iterable, List, Optional, Dict, Set, Tuple
+from repositories.base_repository import BaseRepository, BatchOperationError, DuplicateKeyError, VersionedRepository
 from models.entities import Ligne, TypeTransport
 from datetime import datetime
 import uuid
 
-class LigneRepository(BaseRepository[Ligne]):
-    """Repository en mémoire pour les lignes (mock data)"""
+class LigneRepository(BaseRepository[Ligne], VersionedRepository):
+    """
+    Repository en mémoire pour les lignes (mock data)
+    Index secondaires : numéro (unique) et type de transport, maintenus à
+    chaque écriture pour des recherches en O(1) sans parcours du stockage,
+    et clés triées (numéro, id) pour la pagination par curseur.
+    """
     
-    def __init__(self):
+    def __init__(self, lignes: Optional[Iterable[Ligne]] = None):
+        super().__init__()
         # Base de données mockée en mémoire
         self._storage: Dict[str, Ligne] = {}
-        self._initialize_mock_data()
+        # numero -> id (unique)
+        self._by_numero: Dict[str, str] = {}
+        # type -> ids (dict ordonné utilisé comme ensemble : ordre d'insertion conservé)
+        self._by_type: Dict[TypeTransport, Dict[str, None]] = {}
+        # id -> clés indexées, l'entité stockée pouvant être modifiée hors du repository
+        self._index_keys: Dict[str, Tuple[str, TypeTransport]] = {}
+        # Clés triées pour la pagination (keyset) : numéro -> id via _by_numero
+        self._sorted_keys: Dict[str, List[str]] = {"numero": [], "id": []}
+        if lignes is None:
+            self._initialize_mock_data()
+        else:
+            # Référentiel fourni (horaires précompilés) à la place des données de test
+            for ligne in lignes:
+                self._store(ligne)
     
     def _initialize_mock_data(self):
         """Initialise des données de test"""
@@ -24,43 +44,189 @@ class LigneRepository(BaseRepository[Ligne]):
             Ligne("4", "T1", "Tramway 1 - Côtier", TypeTransport.TRAMWAY, "Port", "Plage Sud", True),
         ]
         for ligne in lignes_mock:
-            self._storage[ligne.id] = ligne
+            self._store(ligne)
     
-    def find_all(self) -> List[Ligne]:
+    # ========================================================================
+    # INDEX
+    # ========================================================================
+    
+    def _check_numero(self, numero: str, id: Optional[str] = None):
+        """Vérifie l'unicité du numéro (id = ligne en cours de mise à jour)"""
+        owner = self._by_numero.get(numero)
+        if owner is not None and owner != id:
+            raise DuplicateKeyError("numero", numero)
+    
+    def _store(self, ligne: Ligne):
+        """Enregistre la ligne et l'ajoute aux index"""
+        self._storage[ligne.id] = ligne
+        self._by_numero[ligne.numero] = ligne.id
+        self._by_type.setdefault(ligne.type_transport, {})[ligne.id] = None
+        self._index_keys[ligne.id] = (ligne.numero, ligne.type_transport)
+        insort(self._sorted_keys["numero"], ligne.numero)
+        insort(self._sorted_keys["id"], ligne.id)
+    
+    def _remove_sorted(self, cle: str, valeur: str):
+        """Retire une clé de la liste triée (dichotomie au lieu d'un parcours linéaire)"""
+        keys = self._sorted_keys[cle]
+        index = bisect_left(keys, valeur)
+        if index < len(keys) and keys[index] == valeur:
+            del keys[index]
+    
+    def _unindex(self, id: str):
+        """Retire la ligne des index (à partir des clés indexées, pas de l'entité)"""
+        numero, type_transport = self._index_keys.pop(id)
+        if self._by_numero.get(numero) == id:
+            del self._by_numero[numero]
+        self._remove_sorted("numero", numero)
+        self._remove_sorted("id", id)
+        ids = self._by_type.get(type_transport)
+        if ids is not None:
+            ids.pop(id, None)
+            if not ids:
+                del self._by_type[type_transport]
+    
+    # ========================================================================
+    # LECTURE
+    # ========================================================================
+    
+    async def find_all(self) -> List[Ligne]:
         """Retourne toutes les lignes"""
         return list(self._storage.values())
     
-    def find_by_id(self, id: str) -> Optional[Ligne]:
+    async def find_by_id(self, id: str) -> Optional[Ligne]:
         """Trouve une ligne par son ID"""
         return self._storage.get(id)
     
-    def find_by_numero(self, numero: str) -> Optional[Ligne]:
-        """Trouve une ligne par son numéro"""
-        for ligne in self._storage.values():
-            if ligne.numero == numero:
-                return ligne
-        return None
+    async def find_by_ids(self, ids: Iterable[str]) -> List[Ligne]:
+        """Lignes existantes parmi `ids`"""
+        return [self._storage[id] for id in set(ids) if id in self._storage]
+    
+    async def existing_ids(self, ids: Iterable[str]) -> Set[str]:
+        """Sous-ensemble des identifiants qui désignent une ligne existante"""
+        return {id for id in ids if id in self._storage}
     
-    def create(self, ligne: Ligne) -> Ligne:
+    async def find_by_numero(self, numero: str) -> Optional[Ligne]:
+        """Trouve une ligne par son numéro (index unique)"""
+        id = self._by_numero.get(numero)
+        return self._storage[id] if id is not None else None
+    
+    async def find_by_type(self, type_transport: TypeTransport) -> List[Ligne]:
+        """Lignes d'un type de transport (index secondaire)"""
+        return [self._storage[id] for id in self._by_type.get(type_transport, ())]
+    
+    async def find_page(
+        self,
+        type_transport: Optional[TypeTransport] = None,
+        actif: Optional[bool] = None,
+        tri: str = "numero",
+        apres: Optional[str] = None,
+        limite: Optional[int] = None
+    ) -> List[Ligne]:
+        """
+        Page de lignes filtrées, triées sur `tri` (numero ou id), strictement
+        après la clé `apres` (pagination par curseur, sans décalage)
+        """
+        keys = self._sorted_keys[tri]
+        debut = bisect_right(keys, apres) if apres is not None else 0
+        page = []
+        for key in keys[debut:]:
+            ligne = self._storage[self._by_numero[key] if tri == "numero" else key]
+            if type_transport is not None and ligne.type_transport != type_transport:
+                continue
+            if actif is not None and ligne.actif != actif:
+                continue
+            page.append(ligne)
+            if limite is not None and len(page) >= limite:
+                break
+        return page
+    
+    # ========================================================================
+    # ÉCRITURE
+    # ========================================================================
+    
+    async def create(self, ligne: Ligne) -> Ligne:
         """Crée une nouvelle ligne"""
+        self._check_numero(ligne.numero)
         ligne.id = str(uuid.uuid4())
         ligne.created_at = datetime.now()
         ligne.updated_at = datetime.now()
-        self._storage[ligne.id] = ligne
+        self._store(ligne)
+        self._touch()
         return ligne
     
-    def update(self, id: str, ligne: Ligne) -> Optional[Ligne]:
+    async def update(self, id: str, ligne: Ligne) -> Optional[Ligne]:
         """Met à jour une ligne existante"""
         if id not in self._storage:
             return None
+        self._check_numero(ligne.numero, id)
         ligne.id = id
         ligne.updated_at = datetime.now()
-        self._storage[id] = ligne
+        self._unindex(id)
+        self._store(ligne)
+        self._touch()
         return ligne
     
-    def delete(self, id: str) -> bool:
+    async def delete(self, id: str) -> bool:
         """Supprime une ligne"""
         if id in self._storage:
+            self._unindex(id)
             del self._storage[id]
+            self._touch()
             return True
         return False
+    
+    def _check_batch(self, operations: List[Tuple[str, Ligne]]):
+        """
+        Rejoue le lot sur les seuls index numéro/id (sans toucher au stockage) :
+        existence des lignes visées et unicité des numéros, opérations
+        précédentes du lot comprises
+        """
+        numeros: Dict[str, Optional[Hashable]] = {}  # numéro -> id, None si libéré par le lot
+        lignes: Dict[Hashable, Optional[str]] = {}   # id -> numéro, None si supprimée par le lot
+        
+        def numero_de(id: Hashable) -> Optional[str]:
+            if id in lignes:
+                return lignes[id]
+            keys = self._index_keys.get(id)
+            return keys[0] if keys else None
+        
+        for index, (op, ligne) in enumerate(operations):
+            # Création : clé provisoire (distincte de tout identifiant), les
+            # entités du lot ne sont pas modifiées tant qu'il n'est pas validé
+            id = ("create", index) if op == "create" else ligne.id
+            if op != "create" and numero_de(id) is None:
+                raise BatchOperationError(index, LookupError(f"Ligne avec l'ID {ligne.id} introuvable"))
+            if op == "delete":
+                numeros[numero_de(id)] = None
+                lignes[id] = None
+                continue
+            owner = numeros[ligne.numero] if ligne.numero in numeros else self._by_numero.get(ligne.numero)
+            if owner is not None and owner != id:
+                raise BatchOperationError(index, DuplicateKeyError("numero", ligne.numero))
+            if op == "update":
+                numeros[numero_de(id)] = None
+            numeros[ligne.numero] = id
+            lignes[id] = ligne.numero
+    
+    async def apply_batch(self, operations: List[Tuple[str, Ligne]]) -> List[Ligne]:
+        """
+        Applique un lot d'opérations ("create", "update", "delete") en tout ou
+        rien : le lot est d'abord vérifié en entier (BatchOperationError sinon),
+        puis appliqué avec une seule nouvelle version des données
+        """
+        self._check_batch(operations)
+        now = datetime.now()
+        for op, ligne in operations:
+            if op == "delete":
+                self._unindex(ligne.id)
+                del self._storage[ligne.id]
+                continue
+            if op == "create":
+                ligne.id = str(uuid.uuid4())
+                ligne.created_at = now
+            else:
+                self._unindex(ligne.id)
+            ligne.updated_at = now
+            self._store(ligne)
+        self._touch()
+        return [ligne for _, ligne in operations]
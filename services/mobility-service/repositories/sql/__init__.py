@@ -0,0 +1,14 @@
+"""
+Repositories SQL asynchrones (SQLAlchemy + asyncpg)
+"""
+from repositories.sql.ligne_repository import SqlLigneRepository
+from repositories.sql.horaire_repository import SqlHoraireRepository
+from repositories.sql.trafic_repository import SqlTraficRepository
+from repositories.sql.disponibilite_repository import SqlDisponibiliteRepository
+
+__all__ = [
+    'SqlLigneRepository',
+    'SqlHoraireRepository',
+    'SqlTraficRepository',
+    'SqlDisponibiliteRepository',
+]
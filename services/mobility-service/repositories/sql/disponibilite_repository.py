@@ -0,0 +1,73 @@
+"""
+Repository SQL asynchrone pour la disponibilité des véhicules
+"""
+from typing import Iterable, List, Tuple
+import uuid
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from datetime import datetime
+
+from database.models import DisponibiliteModel
+from repositories.sql.upsert import upsert
+from repositories.sql.version import table_version
+from models.entities import Disponibilite
+
+def to_entity(model: DisponibiliteModel) -> Disponibilite:
+    """Convertit une disponibilité ORM en entité métier"""
+    return Disponibilite(
+        ligne_id=model.ligne_id,
+        vehicules_total=model.vehicules_total,
+        vehicules_en_service=model.vehicules_en_service,
+        taux_disponibilite=model.taux_disponibilite,
+        derniere_maj=model.derniere_maj
+    )
+
+class SqlDisponibiliteRepository:
+    """Repository PostgreSQL pour la disponibilité"""
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]):
+        self._session_factory = session_factory
+
+    async def get_version(self) -> Tuple[str, datetime]:
+        """Jeton de version de la table (ETag / Last-Modified)"""
+        return await table_version(self._session_factory, DisponibiliteModel.derniere_maj)
+
+    async def find_all(self) -> List[Disponibilite]:
+        """Récupère la disponibilité de toutes les lignes"""
+        async with self._session_factory() as session:
+            result = await session.scalars(select(DisponibiliteModel))
+            return [to_entity(model) for model in result]
+
+    async def find_by_ligne(self, ligne_id: str) -> Disponibilite:
+        """Récupère la disponibilité d'une ligne spécifique"""
+        async with self._session_factory() as session:
+            model = await session.scalar(
+                select(DisponibiliteModel).where(DisponibiliteModel.ligne_id == ligne_id)
+            )
+            return to_entity(model) if model else Disponibilite(ligne_id, 0, 0, 0.0)
+
+    async def save_many(self, disponibilites: Iterable[Disponibilite]):
+        """Upsert d'un lot de disponibilités (INSERT ... ON CONFLICT sur ligne_id)"""
+        # Une entrée par ligne : ON CONFLICT ne peut pas toucher deux fois la même ligne
+        rows = list({
+            d.ligne_id: {
+                "id": str(uuid.uuid4()),
+                "ligne_id": d.ligne_id,
+                "vehicules_total": d.vehicules_total,
+                "vehicules_en_service": d.vehicules_en_service,
+                "taux_disponibilite": d.taux_disponibilite,
+                "derniere_maj": d.derniere_maj,
+            }
+            for d in disponibilites
+        }.values())
+        if not rows:
+            return
+        async with self._session_factory() as session:
+            await upsert(
+                session,
+                DisponibiliteModel,
+                rows,
+                conflict=("ligne_id",),
+                update=("vehicules_total", "vehicules_en_service", "taux_disponibilite", "derniere_maj"),
+            )
+            await session.commit()
@@ -0,0 +1,86 @@
+"""
+Repository SQL asynchrone pour les horaires
+"""
+from typing import AsyncIterator, List, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from datetime import datetime
+
+from database.models import HoraireModel, LigneModel
+from repositories.sql.version import table_version
+from models.entities import Horaire, minutes_to_heure
+
+def to_entity(model: HoraireModel) -> Horaire:
+    """Convertit un horaire ORM en entité métier"""
+    return Horaire(
+        id=model.id,
+        ligne_id=model.ligne_id,
+        destination=model.destination,
+        heure_depart=model.heure_depart,
+        heure_arrivee=model.heure_arrivee,
+        station=model.station,
+        quai=model.quai
+    )
+
+class SqlHoraireRepository:
+    """Repository PostgreSQL pour les horaires"""
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]):
+        self._session_factory = session_factory
+
+    async def get_version(self) -> Tuple[str, datetime]:
+        """Jeton de version de la table (ETag / Last-Modified)"""
+        return await table_version(self._session_factory, HoraireModel.created_at)
+
+    async def find_all(self) -> List[Horaire]:
+        """Récupère tous les horaires du réseau (graphe des itinéraires)"""
+        async with self._session_factory() as session:
+            result = await session.scalars(select(HoraireModel))
+            return [to_entity(model) for model in result]
+
+    async def stream_by_numero(self, batch_size: int = 10000) -> AsyncIterator[Tuple[str, Horaire]]:
+        """
+        Tous les horaires avec le numéro de leur ligne, lus par lots sur un
+        curseur serveur (précompilation du TimetableStore, mémoire bornée)
+        """
+        query = (
+            select(LigneModel.numero, HoraireModel)
+            .join(LigneModel, HoraireModel.ligne_id == LigneModel.id)
+            .execution_options(yield_per=batch_size)
+        )
+        async with self._session_factory() as session:
+            result = await session.stream(query)
+            async for numero, model in result:
+                yield numero, to_entity(model)
+
+    async def find_by_ligne(self, ligne: str) -> List[Horaire]:
+        """Récupère tous les horaires d'une ligne (par numéro, en une seule requête)"""
+        query = (
+            select(HoraireModel)
+            .join(LigneModel, HoraireModel.ligne_id == LigneModel.id)
+            .where(LigneModel.numero == ligne)
+            .order_by(HoraireModel.heure_depart)
+        )
+        async with self._session_factory() as session:
+            result = await session.scalars(query)
+            return [to_entity(model) for model in result]
+
+    async def find_prochains(self, ligne: str, station: str, apres: int, limite: int) -> List[Horaire]:
+        """
+        Prochains départs d'une station (index ligne_id, station, heure_depart).
+        Les heures "HH:MM" à zéros non significatifs se comparent dans l'ordre chronologique.
+        """
+        query = (
+            select(HoraireModel)
+            .join(LigneModel, HoraireModel.ligne_id == LigneModel.id)
+            .where(
+                LigneModel.numero == ligne,
+                HoraireModel.station == station,
+                HoraireModel.heure_depart >= minutes_to_heure(apres),
+            )
+            .order_by(HoraireModel.heure_depart)
+            .limit(limite)
+        )
+        async with self._session_factory() as session:
+            result = await session.scalars(query)
+            return [to_entity(model) for model in result]
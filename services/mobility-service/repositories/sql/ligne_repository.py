@@ -0,0 +1,206 @@
+"""
+Repository SQL asynchrone pour les lignes de transport
+"""
+from typing import Iterable, List, Optional, Set, Tuple
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from datetime import datetime
+import uuid
+
+from database.models import LigneModel
+from repositories.sql.version import table_version
+from models.entities import Ligne, TypeTransport
+from repositories.base_repository import BaseRepository, BatchOperationError, DuplicateKeyError
+
+def to_entity(model: LigneModel) -> Ligne:
+    """Convertit une ligne ORM en entité métier"""
+    return Ligne(
+        id=model.id,
+        numero=model.numero,
+        nom=model.nom,
+        type_transport=TypeTransport(model.type_transport),
+        terminus_debut=model.terminus_debut,
+        terminus_fin=model.terminus_fin,
+        actif=model.actif,
+        created_at=model.created_at,
+        updated_at=model.updated_at
+    )
+
+class SqlLigneRepository(BaseRepository[Ligne]):
+    """Repository PostgreSQL pour les lignes (une session courte par opération)"""
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]):
+        self._session_factory = session_factory
+
+    async def get_version(self) -> Tuple[str, datetime]:
+        """Jeton de version de la table (ETag / Last-Modified)"""
+        return await table_version(self._session_factory, LigneModel.updated_at)
+
+    async def find_all(self) -> List[Ligne]:
+        """Retourne toutes les lignes"""
+        async with self._session_factory() as session:
+            result = await session.scalars(select(LigneModel).order_by(LigneModel.numero))
+            return [to_entity(model) for model in result]
+
+    async def find_by_id(self, id: str) -> Optional[Ligne]:
+        """Trouve une ligne par son ID"""
+        async with self._session_factory() as session:
+            model = await session.get(LigneModel, id)
+            return to_entity(model) if model else None
+
+    async def find_by_ids(self, ids: Iterable[str]) -> List[Ligne]:
+        """Lignes existantes parmi `ids` (une requête)"""
+        ids = list(set(ids))
+        if not ids:
+            return []
+        async with self._session_factory() as session:
+            result = await session.scalars(select(LigneModel).where(LigneModel.id.in_(ids)))
+            return [to_entity(model) for model in result]
+
+    async def existing_ids(self, ids: Iterable[str]) -> Set[str]:
+        """Sous-ensemble des identifiants qui désignent une ligne existante (une requête)"""
+        ids = list(set(ids))
+        if not ids:
+            return set()
+        async with self._session_factory() as session:
+            return set(await session.scalars(select(LigneModel.id).where(LigneModel.id.in_(ids))))
+
+    async def find_by_numero(self, numero: str) -> Optional[Ligne]:
+        """Trouve une ligne par son numéro (index unique)"""
+        async with self._session_factory() as session:
+            model = await session.scalar(select(LigneModel).where(LigneModel.numero == numero))
+            return to_entity(model) if model else None
+
+    async def find_by_type(self, type_transport: TypeTransport) -> List[Ligne]:
+        """Lignes d'un type de transport (index sur type_transport)"""
+        query = (
+            select(LigneModel)
+            .where(LigneModel.type_transport == type_transport.value)
+            .order_by(LigneModel.numero)
+        )
+        async with self._session_factory() as session:
+            result = await session.scalars(query)
+            return [to_entity(model) for model in result]
+
+    async def find_page(
+        self,
+        type_transport: Optional[TypeTransport] = None,
+        actif: Optional[bool] = None,
+        tri: str = "numero",
+        apres: Optional[str] = None,
+        limite: Optional[int] = None
+    ) -> List[Ligne]:
+        """Page de lignes : filtres et curseur en WHERE, ORDER BY sur une colonne indexée, LIMIT"""
+        key = LigneModel.numero if tri == "numero" else LigneModel.id
+        query = select(LigneModel).order_by(key)
+        if type_transport is not None:
+            query = query.where(LigneModel.type_transport == type_transport.value)
+        if actif is not None:
+            query = query.where(LigneModel.actif == actif)
+        if apres is not None:
+            query = query.where(key > apres)
+        if limite is not None:
+            query = query.limit(limite)
+        async with self._session_factory() as session:
+            result = await session.scalars(query)
+            return [to_entity(model) for model in result]
+
+    async def _commit(self, session: AsyncSession, numero: str):
+        """Valide la transaction (violation de l'index unique -> DuplicateKeyError)"""
+        try:
+            await session.commit()
+        except IntegrityError as e:
+            await session.rollback()
+            raise DuplicateKeyError("numero", numero) from e
+
+    async def create(self, ligne: Ligne) -> Ligne:
+        """Crée une nouvelle ligne"""
+        ligne.id = str(uuid.uuid4())
+        ligne.created_at = datetime.now()
+        ligne.updated_at = datetime.now()
+        async with self._session_factory() as session:
+            session.add(LigneModel(
+                id=ligne.id,
+                numero=ligne.numero,
+                nom=ligne.nom,
+                type_transport=ligne.type_transport.value,
+                terminus_debut=ligne.terminus_debut,
+                terminus_fin=ligne.terminus_fin,
+                actif=ligne.actif,
+                created_at=ligne.created_at,
+                updated_at=ligne.updated_at
+            ))
+            await self._commit(session, ligne.numero)
+        return ligne
+
+    async def update(self, id: str, ligne: Ligne) -> Optional[Ligne]:
+        """Met à jour une ligne existante"""
+        async with self._session_factory() as session:
+            model = await session.get(LigneModel, id)
+            if model is None:
+                return None
+            ligne.id = id
+            ligne.updated_at = datetime.now()
+            model.numero = ligne.numero
+            model.nom = ligne.nom
+            model.type_transport = ligne.type_transport.value
+            model.terminus_debut = ligne.terminus_debut
+            model.terminus_fin = ligne.terminus_fin
+            model.actif = ligne.actif
+            model.updated_at = ligne.updated_at
+            await self._commit(session, ligne.numero)
+        return ligne
+
+    async def delete(self, id: str) -> bool:
+        """Supprime une ligne (horaires, trafic et disponibilité en cascade)"""
+        async with self._session_factory() as session:
+            result = await session.execute(delete(LigneModel).where(LigneModel.id == id))
+            await session.commit()
+            return result.rowcount > 0
+
+    async def apply_batch(self, operations: List[Tuple[str, Ligne]]) -> List[Ligne]:
+        """
+        Applique un lot d'opérations ("create", "update", "delete") dans une
+        seule transaction. Chaque opération est envoyée (flush) pour situer une
+        éventuelle erreur ; une seule validation (commit) en fin de lot.
+        BatchOperationError en cas d'échec : rien n'est appliqué.
+        """
+        now = datetime.now()
+        # Identifiants des créations, reportés sur les entités après validation
+        created = []
+        async with self._session_factory() as session:
+            for index, (op, ligne) in enumerate(operations):
+                if op == "delete":
+                    result = await session.execute(delete(LigneModel).where(LigneModel.id == ligne.id))
+                    if result.rowcount == 0:
+                        raise BatchOperationError(index, LookupError(f"Ligne avec l'ID {ligne.id} introuvable"))
+                    continue
+                if op == "create":
+                    model = LigneModel(id=str(uuid.uuid4()), created_at=now)
+                    session.add(model)
+                    created.append((ligne, model.id))
+                else:
+                    model = await session.get(LigneModel, ligne.id)
+                    if model is None:
+                        raise BatchOperationError(index, LookupError(f"Ligne avec l'ID {ligne.id} introuvable"))
+                model.numero = ligne.numero
+                model.nom = ligne.nom
+                model.type_transport = ligne.type_transport.value
+                model.terminus_debut = ligne.terminus_debut
+                model.terminus_fin = ligne.terminus_fin
+                model.actif = ligne.actif
+                model.updated_at = now
+                try:
+                    await session.flush()
+                except IntegrityError as e:
+                    await session.rollback()
+                    raise BatchOperationError(index, DuplicateKeyError("numero", ligne.numero)) from e
+            await session.commit()
+        for ligne, id in created:
+            ligne.id = id
+            ligne.created_at = now
+        for op, ligne in operations:
+            if op != "delete":
+                ligne.updated_at = now
+        return [ligne for _, ligne in operations]
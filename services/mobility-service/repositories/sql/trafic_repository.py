@@ -0,0 +1,83 @@
+"""
+Repository SQL asynchrone pour l'état du trafic
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+import uuid
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from datetime import datetime
+
+from database.models import EtatTraficModel
+from repositories.sql.upsert import upsert
+from repositories.sql.version import table_version
+from models.entities import EtatTrafic, StatutTrafic
+
+def to_entity(model: EtatTraficModel) -> EtatTrafic:
+    """Convertit un état de trafic ORM en entité métier"""
+    return EtatTrafic(
+        ligne_id=model.ligne_id,
+        statut=StatutTrafic(model.statut),
+        retard_minutes=model.retard_minutes,
+        message=model.message or "",
+        timestamp=model.timestamp
+    )
+
+class SqlTraficRepository:
+    """Repository PostgreSQL pour l'état du trafic"""
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]):
+        self._session_factory = session_factory
+
+    async def get_version(self) -> Tuple[str, datetime]:
+        """Jeton de version de la table (ETag / Last-Modified)"""
+        return await table_version(self._session_factory, EtatTraficModel.timestamp)
+
+    async def find_all(self) -> List[EtatTrafic]:
+        """Récupère l'état du trafic de toutes les lignes"""
+        async with self._session_factory() as session:
+            result = await session.scalars(select(EtatTraficModel))
+            return [to_entity(model) for model in result]
+
+    async def find_by_ligne(self, ligne_id: str) -> EtatTrafic:
+        """Récupère l'état du trafic d'une ligne spécifique"""
+        async with self._session_factory() as session:
+            model = await session.scalar(select(EtatTraficModel).where(EtatTraficModel.ligne_id == ligne_id))
+            return to_entity(model) if model else EtatTrafic(ligne_id, StatutTrafic.NORMAL, 0, "")
+
+    async def save(self, etat: EtatTrafic) -> Optional[EtatTrafic]:
+        """Upsert de l'état d'une ligne ; retourne l'état précédent"""
+        return (await self.save_many([etat])).get(etat.ligne_id)
+
+    async def save_many(self, etats: Iterable[EtatTrafic]) -> Dict[str, EtatTrafic]:
+        """
+        Upsert d'un lot d'états (INSERT ... ON CONFLICT sur la contrainte unique
+        ligne_id) ; retourne les états précédents par ligne
+        """
+        # Une entrée par ligne : ON CONFLICT ne peut pas toucher deux fois la même ligne
+        rows = list({
+            etat.ligne_id: {
+                "id": str(uuid.uuid4()),
+                "ligne_id": etat.ligne_id,
+                "statut": etat.statut.value,
+                "retard_minutes": etat.retard_minutes,
+                "message": etat.message,
+                "timestamp": etat.timestamp,
+            }
+            for etat in etats
+        }.values())
+        if not rows:
+            return {}
+        async with self._session_factory() as session:
+            result = await session.scalars(
+                select(EtatTraficModel).where(EtatTraficModel.ligne_id.in_({row["ligne_id"] for row in rows}))
+            )
+            previous = {model.ligne_id: to_entity(model) for model in result}
+            await upsert(
+                session,
+                EtatTraficModel,
+                rows,
+                conflict=("ligne_id",),
+                update=("statut", "retard_minutes", "message", "timestamp"),
+            )
+            await session.commit()
+        return previous
@@ -0,0 +1,24 @@
+"""
+INSERT ... ON CONFLICT DO UPDATE portable (PostgreSQL et SQLite)
+"""
+from typing import Iterable, List
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Lignes par requête : reste sous la limite de paramètres liés (32767)
+UPSERT_CHUNK = 1000
+
+async def upsert(session: AsyncSession, model, rows: List[dict], conflict: Iterable[str], update: Iterable[str]):
+    """Insère ou met à jour `rows` sur la contrainte unique `conflict` (une requête par lot)"""
+    if not rows:
+        return
+    dialect = session.get_bind().dialect.name
+    insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    conflict, update = list(conflict), list(update)
+    for start in range(0, len(rows), UPSERT_CHUNK):
+        statement = insert(model).values(rows[start:start + UPSERT_CHUNK])
+        statement = statement.on_conflict_do_update(
+            index_elements=conflict,
+            set_={column: statement.excluded[column] for column in update},
+        )
+        await session.execute(statement)
@@ -0,0 +1,23 @@
+"""
+Version des tables pour les requêtes conditionnelles (ETag / Last-Modified)
+Calculée par un agrégat indexé (COUNT, MAX de l'horodatage) : partagée par
+tous les workers, sans lire ni sérialiser les lignes.
+"""
+from datetime import datetime, timezone
+from typing import Tuple
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+async def table_version(
+    session_factory: async_sessionmaker[AsyncSession],
+    column
+) -> Tuple[str, datetime]:
+    """Jeton (nombre de lignes, horodatage max) et date de dernière modification de la table"""
+    async with session_factory() as session:
+        count, last = (await session.execute(select(func.count(), func.max(column)))).one()
+    if last is None:
+        last = datetime(1970, 1, 1, tzinfo=timezone.utc)
+    elif last.tzinfo is None:
+        last = last.astimezone()
+    last = last.astimezone(timezone.utc)
+    return f"{count}-{last.timestamp()}", last.replace(microsecond=0)
@@ -0,0 +1,330 @@
+"""
+Stockage compact en colonnes des horaires (grands réseaux type GTFS)
+
+Chaque départ occupe une ligne de colonnes typées au lieu d'un objet Python :
+- heures de départ/arrivée en minutes (uint16)
+- station, destination et quai en indices (uint32) vers une table de chaînes internées
+- ordinal d'origine (uint32), qui donne l'identifiant "h<ordinal>"
+
+Les départs sont triés par (ligne, station, départ) : une ligne est une tranche
+contiguë des colonnes et chaque station de la ligne une sous-tranche triée,
+interrogeable par dichotomie sans copie.
+
+Le fichier précompilé est mappé en mémoire (mmap) : les workers uvicorn
+partagent les mêmes pages au lieu de dupliquer les horaires. Il embarque aussi
+le référentiel des lignes de sa source, pour que les lignes servies
+correspondent aux horaires du fichier.
+"""
+from array import array
+from bisect import bisect_left
+from typing import AsyncIterable, Dict, Iterable, List, Optional, Tuple
+import json
+import mmap
+import struct
+import sys
+
+from models.entities import Horaire, Ligne, TypeTransport, minutes_to_heure
+
+MAGIC = b"MTT2"
+# magic, ordre des octets (1 = little endian), nombre de départs, taille des métadonnées
+HEADER = struct.Struct("<4sBxxxQQ")
+ALIGNMENT = 8
+
+# Colonnes dans l'ordre du fichier : (nom, typecode array)
+COLUMNS = (
+    ("depart", "H"),
+    ("arrivee", "H"),
+    ("station", "I"),
+    ("destination", "I"),
+    ("quai", "I"),
+    ("ordinal", "I"),
+)
+
+def _padding(size: int) -> int:
+    """Octets de bourrage pour aligner la colonne suivante"""
+    return -size % ALIGNMENT
+
+class TimetableStore:
+    """Horaires en colonnes, tranchés par ligne et par station"""
+
+    def __init__(
+        self,
+        strings: List[str],
+        lignes: Dict[str, dict],
+        columns: Dict[str, object],
+        referentiel: Optional[Dict[str, dict]] = None,
+        buffer: Optional[mmap.mmap] = None
+    ):
+        # Table des chaînes internées (stations, destinations, quais)
+        self.strings = [sys.intern(s) for s in strings]
+        # numero -> {"ligne_id", "debut", "fin", "stations": {station: [debut, fin]}}
+        self.lignes = lignes
+        # numero -> champs de la ligne (référentiel de la source du fichier)
+        self.referentiel = referentiel or {}
+        # Colonnes : array (construction) ou memoryview sur le fichier mappé
+        self.depart = columns["depart"]
+        self.arrivee = columns["arrivee"]
+        self.station = columns["station"]
+        self.destination = columns["destination"]
+        self.quai = columns["quai"]
+        self.ordinal = columns["ordinal"]
+        self._buffer = buffer
+
+    def __len__(self) -> int:
+        return len(self.depart)
+
+    # ========================================================================
+    # CONSTRUCTION
+    # ========================================================================
+
+    @classmethod
+    def build(cls, rows: Iterable[Tuple[str, Horaire]], lignes: Iterable[Ligne] = ()) -> "TimetableStore":
+        """
+        Construit le stockage à partir de couples (numéro de ligne, horaire)
+        et du référentiel des lignes de la même source. L'ordinal de chaque
+        départ est extrait de son identifiant "h<n>" s'il en a un, sinon c'est
+        sa position dans l'itérable.
+        """
+        builder = _Builder(lignes)
+        for ligne, horaire in rows:
+            builder.add(ligne, horaire)
+        return cls._from_records(builder)
+
+    @classmethod
+    async def build_async(
+        cls,
+        rows: AsyncIterable[Tuple[str, Horaire]],
+        lignes: Iterable[Ligne] = ()
+    ) -> "TimetableStore":
+        """Comme build, à partir d'un flux asynchrone (curseur de base de données)"""
+        builder = _Builder(lignes)
+        async for ligne, horaire in rows:
+            builder.add(ligne, horaire)
+        return cls._from_records(builder)
+
+    @classmethod
+    def _from_records(cls, builder: "_Builder") -> "TimetableStore":
+        """Trie les départs accumulés et les range en colonnes"""
+        strings, records, ligne_ids = builder.strings, builder.records, builder.ligne_ids
+        # Tri (ligne, station, départ) : tranches contiguës par ligne puis par station
+        records.sort(key=lambda r: (r[0], strings[r[1]], r[2]))
+
+        columns = {name: array(typecode) for name, typecode in COLUMNS}
+        lignes: Dict[str, dict] = {}
+        for row, (ligne, station, depart, arrivee, destination, quai, ordinal) in enumerate(records):
+            meta = lignes.get(ligne)
+            if meta is None:
+                meta = lignes[ligne] = {"ligne_id": ligne_ids[ligne], "debut": row, "fin": row, "stations": {}}
+            meta["fin"] = row + 1
+            bounds = meta["stations"].setdefault(strings[station], [row, row])
+            bounds[1] = row + 1
+            columns["depart"].append(depart)
+            columns["arrivee"].append(arrivee)
+            columns["station"].append(station)
+            columns["destination"].append(destination)
+            columns["quai"].append(quai)
+            columns["ordinal"].append(ordinal)
+        # Lignes du référentiel sans départ : connues, mais sans horaires
+        for numero, ligne in builder.referentiel.items():
+            if numero not in lignes:
+                lignes[numero] = {"ligne_id": ligne["id"], "debut": 0, "fin": 0, "stations": {}}
+        return cls(strings, lignes, columns, builder.referentiel)
+
+    # ========================================================================
+    # FICHIER PRÉCOMPILÉ (mmap)
+    # ========================================================================
+
+    def save(self, path: str):
+        """Écrit le fichier précompilé : en-tête, métadonnées JSON, colonnes alignées"""
+        metadata = json.dumps(
+            {"strings": self.strings, "lignes": self.lignes, "referentiel": self.referentiel},
+            ensure_ascii=False
+        ).encode("utf-8")
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, 1 if sys.byteorder == "little" else 0, len(self), len(metadata)))
+            f.write(metadata)
+            f.write(b"\0" * _padding(HEADER.size + len(metadata)))
+            for name, typecode in COLUMNS:
+                data = array(typecode, getattr(self, name)).tobytes()
+                f.write(data)
+                f.write(b"\0" * _padding(len(data)))
+
+    @classmethod
+    def open(cls, path: str) -> "TimetableStore":
+        """Mappe le fichier précompilé en lecture seule (pages partagées entre workers)"""
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, little_endian, count, metadata_size = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            buffer.close()
+            raise ValueError(f"{path}: fichier d'horaires invalide")
+        if little_endian != (sys.byteorder == "little"):
+            buffer.close()
+            raise ValueError(f"{path}: ordre des octets incompatible")
+
+        offset = HEADER.size
+        metadata = json.loads(bytes(buffer[offset:offset + metadata_size]).decode("utf-8"))
+        offset += metadata_size
+        offset += _padding(offset)
+
+        view = memoryview(buffer)
+        columns = {}
+        for name, typecode in COLUMNS:
+            size = count * array(typecode).itemsize
+            columns[name] = view[offset:offset + size].cast(typecode)
+            offset += size + _padding(size)
+        return cls(metadata["strings"], metadata["lignes"], columns, metadata["referentiel"], buffer)
+
+    def close(self):
+        """Libère le mapping mémoire"""
+        if self._buffer is not None:
+            for name, _ in COLUMNS:
+                getattr(self, name).release()
+            self._buffer.close()
+            self._buffer = None
+
+    # ========================================================================
+    # LECTURE
+    # ========================================================================
+
+    def _horaire(self, row: int, ligne_id: str) -> Horaire:
+        """Matérialise un départ en entité Horaire"""
+        strings = self.strings
+        return Horaire(
+            f"h{self.ordinal[row]}",
+            ligne_id,
+            strings[self.destination[row]],
+            minutes_to_heure(self.depart[row]),
+            minutes_to_heure(self.arrivee[row]),
+            strings[self.station[row]],
+            strings[self.quai[row]],
+        )
+
+    def lignes_referentiel(self) -> List[Ligne]:
+        """Lignes du référentiel embarqué, en entités"""
+        return [
+            Ligne(
+                ligne["id"],
+                numero,
+                ligne["nom"],
+                TypeTransport(ligne["type_transport"]),
+                ligne["terminus_debut"],
+                ligne["terminus_fin"],
+                ligne["actif"],
+            )
+            for numero, ligne in self.referentiel.items()
+        ]
+
+    def ligne_slice(self, ligne: str) -> Tuple[int, int]:
+        """Tranche [début, fin) des départs d'une ligne"""
+        meta = self.lignes.get(ligne)
+        return (meta["debut"], meta["fin"]) if meta else (0, 0)
+
+    def horaires(self, ligne: str) -> List[Horaire]:
+        """Horaires d'une ligne dans l'ordre d'origine"""
+        meta = self.lignes.get(ligne)
+        if meta is None:
+            return []
+        rows = sorted(range(meta["debut"], meta["fin"]), key=self.ordinal.__getitem__)
+        return [self._horaire(row, meta["ligne_id"]) for row in rows]
+
+    def prochains(self, ligne: str, station: str, apres: int, limite: int) -> List[Horaire]:
+        """Prochains départs d'une station, par dichotomie sur la sous-tranche triée"""
+        meta = self.lignes.get(ligne)
+        bounds = meta["stations"].get(station) if meta else None
+        if bounds is None:
+            return []
+        debut, fin = bounds
+        row = bisect_left(self.depart, apres, debut, fin)
+        return [self._horaire(r, meta["ligne_id"]) for r in range(row, min(row + limite, fin))]
+
+class _Builder:
+    """Accumule les départs (une ligne de colonnes par horaire, chaînes internées)"""
+
+    def __init__(self, lignes: Iterable[Ligne] = ()):
+        self.strings: List[str] = []
+        self._string_ids: Dict[str, int] = {}
+        self.records: List[tuple] = []
+        self.ligne_ids: Dict[str, str] = {}
+        self.referentiel: Dict[str, dict] = {
+            ligne.numero: {
+                "id": ligne.id,
+                "nom": ligne.nom,
+                "type_transport": ligne.type_transport.value,
+                "terminus_debut": ligne.terminus_debut,
+                "terminus_fin": ligne.terminus_fin,
+                "actif": ligne.actif,
+            }
+            for ligne in lignes
+        }
+
+    def _intern(self, value: str) -> int:
+        index = self._string_ids.get(value)
+        if index is None:
+            index = self._string_ids[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+    def add(self, ligne: str, horaire: Horaire):
+        self.ligne_ids.setdefault(ligne, horaire.ligne_id)
+        suffix = horaire.id[1:] if horaire.id.startswith("h") else ""
+        ordinal = int(suffix) if suffix.isdigit() else len(self.records) + 1
+        self.records.append((
+            ligne,
+            self._intern(horaire.station),
+            horaire.depart_minutes,
+            horaire.arrivee_minutes,
+            self._intern(horaire.destination),
+            self._intern(horaire.quai),
+            ordinal,
+        ))
+
+# ============================================================================
+# PRÉCOMPILATION
+# ============================================================================
+
+def main(argv: Optional[List[str]] = None):
+    """
+    Ligne de commande : précompile les horaires d'un flux GTFS (--from-gtfs),
+    de la table horaires (--from-db, DATABASE_URL) ou, par défaut, les
+    horaires de démonstration
+    """
+    import argparse
+    import asyncio
+
+    parser = argparse.ArgumentParser(description="Précompile les horaires en fichier mappable")
+    parser.add_argument("output", help="Fichier de sortie (ex: horaires.mtt)")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--from-gtfs", metavar="FEED", help="Répertoire GTFS (routes.txt, trips.txt, stop_times.txt)")
+    source.add_argument("--from-db", action="store_true", help="Table horaires de la base (DATABASE_URL)")
+    args = parser.parse_args(argv)
+
+    if args.from_gtfs:
+        from database.gtfs_import import gtfs_horaires, gtfs_lignes
+        store = TimetableStore.build(gtfs_horaires(args.from_gtfs), gtfs_lignes(args.from_gtfs))
+    elif args.from_db:
+        from database.connection import close_db, get_session_factory
+        from repositories.sql import SqlHoraireRepository, SqlLigneRepository
+
+        async def load() -> TimetableStore:
+            try:
+                factory = get_session_factory()
+                return await TimetableStore.build_async(
+                    SqlHoraireRepository(factory).stream_by_numero(),
+                    await SqlLigneRepository(factory).find_all()
+                )
+            finally:
+                await close_db()
+
+        store = asyncio.run(load())
+    else:
+        from repositories.horaire_repository import HoraireRepository
+        from repositories.ligne_repository import LigneRepository
+        lignes = asyncio.run(LigneRepository().find_all())
+        store = TimetableStore.build(HoraireRepository.mock_data(), lignes)
+
+    store.save(args.output)
+    print(f"✅ {len(store)} départs, {len(store.lignes)} lignes -> {args.output}")
+
+if __name__ == "__main__":
+    main()
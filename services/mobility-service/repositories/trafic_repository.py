@@ -1,14 +1,16 @@
 """
 Repository pour l'état du trafic
 """
-from typing import List, Dict
+from typing import Iterable, List, Dict, Optional
 from models.entities import EtatTrafic, StatutTrafic
+from repositories.base_repository import VersionedRepository
 from datetime import datetime
 
-class TraficRepository:
+class TraficRepository(VersionedRepository):
     """Repository en mémoire pour l'état du trafic"""
     
     def __init__(self):
+        super().__init__()
         self._storage: Dict[str, EtatTrafic] = {}
         self._initialize_mock_data()
     
@@ -21,10 +23,24 @@ class TraficRepository:
             "4": EtatTrafic("4", StatutTrafic.PERTURBE, 10, "Travaux sur la voie", datetime.now()),
         }
     
-    def find_all(self) -> List[EtatTrafic]:
+    async def find_all(self) -> List[EtatTrafic]:
         """Récupère l'état du trafic de toutes les lignes"""
         return list(self._storage.values())
     
-    def find_by_ligne(self, ligne_id: str) -> EtatTrafic:
+    async def find_by_ligne(self, ligne_id: str) -> EtatTrafic:
         """Récupère l'état du trafic d'une ligne spécifique"""
         return self._storage.get(ligne_id, EtatTrafic(ligne_id, StatutTrafic.NORMAL, 0, ""))
+    
+    async def save(self, etat: EtatTrafic) -> Optional[EtatTrafic]:
+        """Enregistre l'état d'une ligne et retourne l'état précédent (None si nouveau)"""
+        return (await self.save_many([etat])).get(etat.ligne_id)
+    
+    async def save_many(self, etats: Iterable[EtatTrafic]) -> Dict[str, EtatTrafic]:
+        """Enregistre un lot d'états ; retourne les états précédents par ligne"""
+        previous = {}
+        for etat in etats:
+            if etat.ligne_id in self._storage:
+                previous.setdefault(etat.ligne_id, self._storage[etat.ligne_id])
+            self._storage[etat.ligne_id] = etat
+        self._touch()
+        return previous
@@ -1,16 +1,32 @@
 """
 Routes pour la disponibilité des véhicules
 """
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, Query, Request, status
+from typing import Optional
+from config.settings import settings
+from models.entities import Disponibilite
 from services.disponibilite_service import DisponibiliteService
-from schemas.disponibilite import DisponibiliteResponse, DisponibiliteItem
+from services.container import get_disponibilite_service
+from utils.conditional import cache_headers, make_etag, not_modified
+from utils.serialization import EntityEncoder, json_response
+from schemas.disponibilite import (
+    DisponibiliteBatch,
+    DisponibiliteItem,
+    DisponibiliteResponse,
+    DisponibiliteStatsResponse,
+)
+from schemas.ingestion import IngestionResponse
 from datetime import datetime
 
 router = APIRouter(prefix="/disponibilite", tags=["Disponibilité"])
-service = DisponibiliteService()
+
+DISPONIBILITE_ENCODER = EntityEncoder(DisponibiliteItem)
 
 @router.get("", response_model=DisponibiliteResponse, summary="Obtenir la disponibilité des véhicules")
-async def get_disponibilite():
+async def get_disponibilite(
+    request: Request,
+    service: DisponibiliteService = Depends(get_disponibilite_service)
+):
     """
     Récupère la disponibilité des véhicules pour toutes les lignes.
     
@@ -19,18 +35,91 @@ async def get_disponibilite():
     - Le nombre de véhicules actuellement en service
     - Le taux de disponibilité en pourcentage
     """
-    disponibilites = service.get_all_disponibilites()
+    version, last_modified = await service.get_version()
+    etag = make_etag(version)
+    cached = not_modified(request, etag, last_modified)
+    if cached is not None:
+        return cached
+    
+    disponibilites = await service.get_all_disponibilites()
     
-    return DisponibiliteResponse(
-        timestamp=datetime.now(),
-        nombre_lignes=len(disponibilites),
-        disponibilites=[
-            DisponibiliteItem(
-                ligne_id=d.ligne_id,
-                vehicules_total=d.vehicules_total,
-                vehicules_en_service=d.vehicules_en_service,
-                taux_disponibilite=d.taux_disponibilite,
-                derniere_maj=d.derniere_maj
-            ) for d in disponibilites
-        ]
+    return json_response(
+        {
+            "timestamp": datetime.now(),
+            "nombre_lignes": len(disponibilites),
+            "disponibilites": DISPONIBILITE_ENCODER.many(disponibilites),
+        },
+        DisponibiliteResponse,
+        headers=cache_headers(etag, last_modified)
     )
+
+@router.get("/stats", response_model=DisponibiliteStatsResponse, summary="Statistiques de disponibilité de la flotte")
+async def get_disponibilite_stats(
+    request: Request,
+    sla: Optional[float] = Query(None, ge=0, le=100, description="Seuil SLA en % (défaut: DISPONIBILITE_SLA)"),
+    fenetre: Optional[int] = Query(None, ge=1, description="Historique des N dernières minutes (défaut: tout)"),
+    service: DisponibiliteService = Depends(get_disponibilite_service)
+):
+    """
+    Agrégats de disponibilité calculés côté serveur :
+    
+    - taux pondéré par la taille de flotte, moyenne et percentiles (p10, p50, p90),
+      pour toute la flotte et par type de transport
+    - lignes sous le seuil SLA, de la plus basse à la plus haute
+    - historique glissant en mémoire du worker (un point par intervalle, même
+      sans nouvelle donnée) et tendance sur la fenêtre
+    """
+    seuil = settings.disponibilite_sla if sla is None else sla
+    # Instantané en cache tant que la version ne change pas ; la fenêtre glisse avec le temps
+    snapshot = await service.get_snapshot()
+    historique = service.historique.depuis(fenetre)
+    version, last_modified = await service.get_stats_version()
+    # Bornes de la fenêtre : un point ajouté ou remplacé par l'échantillonnage change l'ETag
+    bornes = f"{historique[0]['timestamp'].isoformat()}:{historique[-1]['timestamp'].isoformat()}" if historique else ""
+    etag = make_etag(f"{version}:{seuil}:{fenetre}:{len(historique)}:{bornes}")
+    cached = not_modified(request, etag, last_modified)
+    if cached is not None:
+        return cached
+    
+    return json_response(
+        {
+            "timestamp": snapshot.timestamp,
+            "sla": seuil,
+            "flotte": snapshot.stats(),
+            "par_type": snapshot.par_type(),
+            "sous_sla": [
+                {
+                    "ligne_id": snapshot.ligne_ids[i],
+                    "type_transport": snapshot.types[i],
+                    "taux_disponibilite": float(snapshot.taux[i]),
+                } for i in snapshot.sous_sla(seuil)
+            ],
+            "tendance": round(historique[-1]["taux_pondere"] - historique[0]["taux_pondere"], 2) if len(historique) > 1 else None,
+            "historique": historique,
+        },
+        DisponibiliteStatsResponse,
+        headers=cache_headers(etag, last_modified)
+    )
+
+@router.post(
+    "/batch",
+    response_model=IngestionResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Ingestion par lots de la disponibilité (flux AVL)"
+)
+async def ingest_disponibilite(
+    data: DisponibiliteBatch,
+    service: DisponibiliteService = Depends(get_disponibilite_service)
+):
+    """
+    Accepte jusqu'à 5000 mises à jour par appel. Elles sont fusionnées par
+    ligne (la dernière l'emporte) et écrites en un upsert à intervalle court
+    (`INGEST_FLUSH_INTERVAL`) ; le taux de disponibilité est recalculé pour
+    tout le lot au moment de l'écriture.
+    Les lignes inconnues sont ignorées et listées dans `rejetees`.
+    """
+    accepted, rejected = await service.ingest([
+        Disponibilite(u.ligne_id, u.vehicules_total, u.vehicules_en_service, 0.0, u.derniere_maj)
+        for u in data.updates
+    ])
+    return IngestionResponse(acceptees=accepted, rejetees=rejected, en_attente=len(service.buffer))
@@ -1,16 +1,25 @@
 """
 Routes pour la consultation des horaires
 """
-from fastapi import APIRouter, HTTPException, Path
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request
+from typing import Optional
+from datetime import datetime
+from models.entities import heure_to_minutes, minutes_to_heure
 from services.horaire_service import HoraireService
-from schemas.horaire import HorairesResponse, HoraireItem
+from services.container import get_horaire_service
+from utils.conditional import cache_headers, make_etag, not_modified
+from utils.serialization import EntityEncoder, json_response
+from schemas.horaire import HorairesResponse, HoraireItem, ProchainsDepartsResponse
 
 router = APIRouter(prefix="/horaires", tags=["Horaires"])
-service = HoraireService()
+
+HORAIRE_ENCODER = EntityEncoder(HoraireItem)
 
 @router.get("/{ligne}", response_model=HorairesResponse, summary="Consulter les horaires d'une ligne")
 async def get_horaires(
-    ligne: str = Path(..., description="Numéro de la ligne (ex: L1, B15)", example="L1")
+    request: Request,
+    ligne: str = Path(..., description="Numéro de la ligne (ex: L1, B15)", example="L1"),
+    service: HoraireService = Depends(get_horaire_service)
 ):
     """
     Récupère tous les horaires de passage pour une ligne donnée.
@@ -19,7 +28,13 @@ async def get_horaires(
     
     Retourne la liste complète des horaires avec les informations de départ, arrivée et quai.
     """
-    horaires = service.get_horaires_by_ligne(ligne)
+    version, last_modified = await service.get_version()
+    etag = make_etag(version)
+    cached = not_modified(request, etag, last_modified)
+    if cached is not None:
+        return cached
+    
+    horaires = await service.get_horaires_by_ligne(ligne)
     
     if not horaires:
         raise HTTPException(
@@ -27,18 +42,59 @@ async def get_horaires(
             detail=f"Aucun horaire trouvé pour la ligne {ligne}"
         )
     
-    return HorairesResponse(
-        ligne=ligne,
-        nombre_horaires=len(horaires),
-        horaires=[
-            HoraireItem(
-                id=h.id,
-                ligne_id=h.ligne_id,
-                destination=h.destination,
-                heure_depart=h.heure_depart,
-                heure_arrivee=h.heure_arrivee,
-                station=h.station,
-                quai=h.quai
-            ) for h in horaires
-        ]
+    return json_response(
+        {"ligne": ligne, "nombre_horaires": len(horaires), "horaires": HORAIRE_ENCODER.many(horaires)},
+        HorairesResponse,
+        headers=cache_headers(etag, last_modified)
+    )
+
+@router.get(
+    "/{ligne}/prochains",
+    response_model=ProchainsDepartsResponse,
+    summary="Prochains départs d'une station"
+)
+async def get_prochains_departs(
+    ligne: str = Path(..., description="Numéro de la ligne (ex: L1, B15)", example="L1"),
+    station: str = Query(..., description="Station de départ", example="Gare Centrale"),
+    apres: Optional[str] = Query(
+        None,
+        description="Heure de référence HH:MM (défaut: maintenant) ; jusqu'à 47:59 pour les départs après minuit du jour de service",
+        pattern=r"^([0-3][0-9]|4[0-7]):[0-5][0-9]$",
+        example="08:10"
+    ),
+    limite: int = Query(5, ge=1, le=50, description="Nombre maximum de départs"),
+    service: HoraireService = Depends(get_horaire_service)
+):
+    """
+    Récupère les prochains départs d'une station pour une ligne donnée.
+    
+    - **station**: Station de départ
+    - **apres**: Heure à partir de laquelle chercher (HH:MM, heure courante par défaut).
+      Les horaires GTFS comptent en heures du jour de service : un départ à
+      00:40 d'une course de la veille est noté 24:40, et se cherche avec `apres=24:30`
+    - **limite**: Nombre maximum de départs retournés
+    
+    La recherche se fait côté serveur par dichotomie sur les départs triés de la station.
+    """
+    reference = heure_to_minutes(apres) if apres else heure_to_minutes(datetime.now().strftime("%H:%M"))
+    departs = await service.get_prochains_departs(ligne, station, reference, limite)
+    
+    if departs is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Ligne {ligne} introuvable"
+        )
+    
+    return json_response(
+        {
+            "ligne": ligne,
+            "station": station,
+            "apres": minutes_to_heure(reference),
+            "nombre_departs": len(departs),
+            "departs": [
+                {**HORAIRE_ENCODER(h), "attente_minutes": h.depart_minutes - reference}
+                for h in departs
+            ],
+        },
+        ProchainsDepartsResponse
     )
@@ -0,0 +1,78 @@
+"""
+Routes pour la recherche d'itinéraires
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from typing import Optional
+from datetime import datetime
+from models.entities import heure_to_minutes, minutes_to_heure
+from services.itineraire_service import ItineraireService
+from services.container import get_itineraire_service
+from utils.conditional import cache_headers, make_etag, not_modified
+from schemas.itineraire import EtapeItem, ItineraireResponse
+
+router = APIRouter(prefix="/itineraires", tags=["Itinéraires"])
+
+@router.get("", response_model=ItineraireResponse, summary="Rechercher un itinéraire")
+async def get_itineraire(
+    request: Request,
+    response: Response,
+    depart: str = Query(..., description="Station de départ", example="Gare Centrale"),
+    arrivee: str = Query(..., description="Station d'arrivée", example="Banlieue Nord"),
+    heure: Optional[str] = Query(
+        None,
+        description="Heure de départ au plus tôt HH:MM (défaut: maintenant)",
+        pattern=r"^([01][0-9]|2[0-3]):[0-5][0-9]$",
+        example="08:05"
+    ),
+    service: ItineraireService = Depends(get_itineraire_service)
+):
+    """
+    Recherche l'itinéraire qui arrive au plus tôt à `arrivee` en partant de
+    `depart` à `heure` ou après, correspondances comprises.
+    
+    Les retards du trafic sont appliqués aux horaires ; les lignes annulées
+    ou inactives sont exclues. Recherche par Connection Scan sur le graphe
+    horaire précalculé (journée de service unique, sans passage de minuit).
+    """
+    inconnues = await service.stations_inconnues(depart, arrivee)
+    if inconnues:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Station(s) inconnue(s): {', '.join(inconnues)}"
+        )
+    
+    reference = heure_to_minutes(heure) if heure else heure_to_minutes(datetime.now().strftime("%H:%M"))
+    version, last_modified = await service.get_version()
+    etag = make_etag(f"{version}:{depart}:{arrivee}:{reference}")
+    cached = not_modified(request, etag, last_modified)
+    if cached is not None:
+        return cached
+    response.headers.update(cache_headers(etag, last_modified))
+    
+    etapes = await service.rechercher(depart, arrivee, reference)
+    if etapes is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Aucun itinéraire de {depart} à {arrivee} après {minutes_to_heure(reference)}"
+        )
+    
+    return ItineraireResponse(
+        depart=depart,
+        arrivee=arrivee,
+        heure=minutes_to_heure(reference),
+        heure_arrivee=minutes_to_heure(etapes[-1].arrivee),
+        duree_minutes=etapes[-1].arrivee - reference,
+        correspondances=sum(1 for a, b in zip(etapes, etapes[1:]) if a.horaire.ligne_id != b.horaire.ligne_id),
+        etapes=[
+            EtapeItem(
+                horaire_id=e.horaire.id,
+                ligne_id=e.horaire.ligne_id,
+                station_depart=e.horaire.station,
+                station_arrivee=e.horaire.destination,
+                quai=e.horaire.quai,
+                heure_depart=minutes_to_heure(e.depart),
+                heure_arrivee=minutes_to_heure(e.arrivee),
+                retard_minutes=e.retard_minutes
+            ) for e in etapes
+        ]
+    )
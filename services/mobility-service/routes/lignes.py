@@ -1,36 +1,113 @@
 """
 Routes CRUD pour la gestion des lignes de transport
 """
-from fastapi import APIRouter, HTTPException, Path, status
-from typing import List
+from fastapi import APIRouter, Depends, Header, HTTPException, Path, Query, Request, status
+from typing import List, Optional, Set
+import base64
+import binascii
+from models.entities import TypeTransport
+from repositories.base_repository import DuplicateKeyError
 from services.ligne_service import LigneService
-from schemas.ligne import LigneCreate, LigneUpdate, LigneResponse
+from services.container import get_idempotency_cache, get_ligne_service
+from utils.conditional import cache_headers, make_etag, not_modified
+from utils.idempotency import IdempotencyCache, IdempotencyKeyReused
+from utils.serialization import EntityEncoder, json_response
+from schemas.ligne import LigneBulkRequest, LigneBulkResponse, LigneCreate, LigneUpdate, LigneResponse
 
 router = APIRouter(prefix="/lignes", tags=["Lignes"])
-service = LigneService()
+
+MAX_LIMITE = 500
+LIGNE_ENCODER = EntityEncoder(LigneResponse)
+LIGNE_FIELDS = LIGNE_ENCODER.fields
+
+# ============================================================================
+# PAGINATION ET SÉLECTION DE CHAMPS
+# ============================================================================
+
+def _encode_cursor(tri: str, valeur: str) -> str:
+    """Curseur opaque : clé de tri et dernière valeur retournée"""
+    return base64.urlsafe_b64encode(f"{tri}:{valeur}".encode("utf-8")).decode("ascii")
+
+def _decode_cursor(curseur: str, tri: str) -> str:
+    """Dernière valeur de la page précédente (le curseur doit correspondre au tri)"""
+    try:
+        cle, _, valeur = base64.urlsafe_b64decode(curseur.encode("ascii")).decode("utf-8").partition(":")
+    except (binascii.Error, UnicodeError, ValueError):
+        cle, valeur = "", ""
+    if cle != tri or not valeur:
+        raise HTTPException(status_code=400, detail="Curseur invalide pour ce tri")
+    return valeur
+
+def _parse_fields(fields: Optional[str]) -> Optional[Set[str]]:
+    """Champs demandés via ?fields= (None = tous)"""
+    if not fields:
+        return None
+    selected = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = selected - set(LIGNE_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Champs inconnus: {', '.join(sorted(unknown))} (disponibles: {', '.join(LIGNE_FIELDS)})"
+        )
+    return selected
+
+# ============================================================================
+# ROUTES
+# ============================================================================
 
 @router.get("", response_model=List[LigneResponse], summary="Lister toutes les lignes")
-async def get_lignes():
+async def get_lignes(
+    request: Request,
+    type_transport: Optional[TypeTransport] = Query(None, description="Filtrer par type de transport"),
+    actif: Optional[bool] = Query(None, description="Filtrer les lignes actives / inactives"),
+    tri: str = Query("numero", pattern="^(numero|id)$", description="Clé de tri et de pagination"),
+    limite: Optional[int] = Query(None, ge=1, le=MAX_LIMITE, description="Taille de page (toutes les lignes si absent)"),
+    curseur: Optional[str] = Query(None, description="Curseur X-Next-Cursor de la page précédente"),
+    fields: Optional[str] = Query(None, description="Champs à retourner, séparés par des virgules (ex: id,numero,nom)"),
+    service: LigneService = Depends(get_ligne_service)
+):
     """
-    Récupère la liste complète de toutes les lignes de transport disponibles.
+    Récupère la liste des lignes de transport, filtrée et paginée.
+    
+    - **type_transport** / **actif**: Filtres appliqués par le repository (WHERE en SQL)
+    - **tri**: Clé de tri (numero ou id), sur laquelle porte la pagination
+    - **limite**: Taille de page ; l'en-tête `X-Next-Cursor` (et `Link: rel="next"`) donne la page suivante
+    - **curseur**: Reprend la liste juste après la dernière ligne de la page précédente (pagination par clé, sans décalage)
+    - **fields**: Sélection de champs, pour alléger les catalogues volumineux
     """
-    lignes = service.get_all_lignes()
-    return [
-        LigneResponse(
-            id=l.id,
-            numero=l.numero,
-            nom=l.nom,
-            type_transport=l.type_transport.value,
-            terminus_debut=l.terminus_debut,
-            terminus_fin=l.terminus_fin,
-            actif=l.actif,
-            created_at=l.created_at,
-            updated_at=l.updated_at
-        ) for l in lignes
-    ]
+    selected = _parse_fields(fields)
+    apres = _decode_cursor(curseur, tri) if curseur else None
+    
+    version, last_modified = await service.get_version()
+    # Une ETag par représentation : filtres, page et sélection de champs compris
+    etag = make_etag(
+        version,
+        type_transport.value if type_transport else "",
+        "" if actif is None else str(actif),
+        tri,
+        curseur or "",
+        str(limite or ""),
+        ",".join(sorted(selected)) if selected is not None else "",
+    )
+    cached = not_modified(request, etag, last_modified)
+    if cached is not None:
+        return cached
+    
+    lignes = await service.get_lignes_page(type_transport, actif, tri, apres, limite)
+    # Sélection de champs : représentation partielle, non validée contre LigneResponse
+    response = json_response(
+        LIGNE_ENCODER.select(selected).many(lignes),
+        List[LigneResponse] if selected is None else None,
+        headers=cache_headers(etag, last_modified)
+    )
+    if limite is not None and len(lignes) == limite:
+        next_cursor = _encode_cursor(tri, getattr(lignes[-1], tri))
+        response.headers["X-Next-Cursor"] = next_cursor
+        response.headers["Link"] = f'<{request.url.include_query_params(curseur=next_cursor)}>; rel="next"'
+    return response
 
 @router.post("", response_model=LigneResponse, status_code=status.HTTP_201_CREATED, summary="Créer une nouvelle ligne")
-async def create_ligne(ligne_data: LigneCreate):
+async def create_ligne(ligne_data: LigneCreate, service: LigneService = Depends(get_ligne_service)):
     """
     Crée une nouvelle ligne de transport dans le système.
     
@@ -40,58 +117,101 @@ async def create_ligne(ligne_data: LigneCreate):
     - **terminus_debut**: Station de départ
     - **terminus_fin**: Station d'arrivée
     """
-    ligne = service.create_ligne(ligne_data)
-    return LigneResponse(
-        id=ligne.id,
-        numero=ligne.numero,
-        nom=ligne.nom,
-        type_transport=ligne.type_transport.value,
-        terminus_debut=ligne.terminus_debut,
-        terminus_fin=ligne.terminus_fin,
-        actif=ligne.actif,
-        created_at=ligne.created_at,
-        updated_at=ligne.updated_at
-    )
+    try:
+        ligne = await service.create_ligne(ligne_data)
+    except DuplicateKeyError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    return json_response(LIGNE_ENCODER(ligne), LigneResponse, status_code=status.HTTP_201_CREATED)
+
+@router.post(
+    "/bulk",
+    response_model=LigneBulkResponse,
+    summary="Créer, modifier et supprimer des lignes en un lot",
+    responses={409: {"model": LigneBulkResponse}, 404: {"model": LigneBulkResponse}, 422: {"model": LigneBulkResponse}}
+)
+async def bulk_lignes(
+    data: LigneBulkRequest,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
+    service: LigneService = Depends(get_ligne_service),
+    cache: IdempotencyCache = Depends(get_idempotency_cache)
+):
+    """
+    Applique jusqu'à 1000 opérations `create` / `update` / `delete` en un seul
+    aller-retour et une seule transaction : tout le lot est appliqué, ou rien.
+    
+    - **200** : lot appliqué, un résultat par opération (201, 200 ou 204)
+    - **404 / 409 / 422** : lot refusé ; l'opération fautive porte son code et
+      son erreur, les autres sont marquées 424 (annulées)
+    
+    Avec un en-tête `Idempotency-Key`, un nouvel essai du même lot rejoue la
+    réponse enregistrée (en-tête `Idempotent-Replayed: true`) sans rien réappliquer.
+    """
+    async def apply():
+        applique, resultats = await service.bulk_lignes(data.operations)
+        statuts = {r.statut for r in resultats}
+        status_code = 200 if applique else next(code for code in (409, 404, 422) if code in statuts)
+        body = {
+            "applique": applique,
+            "resultats": [
+                {
+                    "index": r.index,
+                    "op": r.op,
+                    "statut": r.statut,
+                    "id": r.id,
+                    "ligne": LIGNE_ENCODER(r.ligne) if r.ligne else None,
+                    "erreur": r.erreur,
+                } for r in resultats
+            ],
+        }
+        return status_code, body
+    
+    if idempotency_key is None:
+        status_code, body = await apply()
+        return json_response(body, LigneBulkResponse, status_code=status_code)
+    
+    try:
+        (status_code, body), replayed = await cache.run(
+            idempotency_key, make_etag(data.model_dump_json()), apply
+        )
+    except IdempotencyKeyReused as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    headers = {"Idempotent-Replayed": "true"} if replayed else None
+    return json_response(body, LigneBulkResponse, status_code=status_code, headers=headers)
 
 @router.put("/{id}", response_model=LigneResponse, summary="Mettre à jour une ligne")
 async def update_ligne(
     id: str = Path(..., description="Identifiant de la ligne"),
-    ligne_data: LigneUpdate = ...
+    ligne_data: LigneUpdate = ...,
+    service: LigneService = Depends(get_ligne_service)
 ):
     """
     Met à jour les informations d'une ligne existante.
     
     Seuls les champs fournis seront mis à jour, les autres resteront inchangés.
     """
-    ligne = service.update_ligne(id, ligne_data)
+    try:
+        ligne = await service.update_ligne(id, ligne_data)
+    except DuplicateKeyError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     if not ligne:
         raise HTTPException(
             status_code=404,
             detail=f"Ligne avec l'ID {id} introuvable"
         )
     
-    return LigneResponse(
-        id=ligne.id,
-        numero=ligne.numero,
-        nom=ligne.nom,
-        type_transport=ligne.type_transport.value,
-        terminus_debut=ligne.terminus_debut,
-        terminus_fin=ligne.terminus_fin,
-        actif=ligne.actif,
-        created_at=ligne.created_at,
-        updated_at=ligne.updated_at
-    )
+    return json_response(LIGNE_ENCODER(ligne), LigneResponse)
 
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT, summary="Supprimer une ligne")
 async def delete_ligne(
-    id: str = Path(..., description="Identifiant de la ligne à supprimer")
+    id: str = Path(..., description="Identifiant de la ligne à supprimer"),
+    service: LigneService = Depends(get_ligne_service)
 ):
     """
     Supprime définitivement une ligne du système.
     
     **Attention**: Cette action est irréversible.
     """
-    success = service.delete_ligne(id)
+    success = await service.delete_ligne(id)
     if not success:
         raise HTTPException(
             status_code=404,
@@ -1,16 +1,26 @@
 """
 Routes pour l'état du trafic
 """
-from fastapi import APIRouter
-from services.trafic_service import TraficService
-from schemas.trafic import TraficResponse, TraficItem
+import json
+from fastapi import APIRouter, Depends, HTTPException, Path, Request, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from config.settings import settings
+from models.entities import EtatTrafic
+from services.trafic_hub import EVICTED, TraficHub
+from services.trafic_service import TraficService, etat_to_dict
+from services.container import get_trafic_hub, get_trafic_service
+from utils.conditional import cache_headers, make_etag, not_modified
+from utils.serialization import EntityEncoder, json_response
+from schemas.ingestion import IngestionResponse
+from schemas.trafic import TraficBatch, TraficResponse, TraficItem, TraficUpdate
 from datetime import datetime
 
 router = APIRouter(prefix="/trafic", tags=["Trafic"])
-service = TraficService()
+
+TRAFIC_ENCODER = EntityEncoder(TraficItem)
 
 @router.get("", response_model=TraficResponse, summary="Obtenir l'état du trafic")
-async def get_trafic():
+async def get_trafic(request: Request, service: TraficService = Depends(get_trafic_service)):
     """
     Récupère l'état du trafic en temps réel pour toutes les lignes.
     
@@ -19,18 +29,135 @@ async def get_trafic():
     - Le retard estimé en minutes
     - Un message d'information si nécessaire
     """
-    etats_trafic = service.get_all_trafic()
+    version, last_modified = await service.get_version()
+    etag = make_etag(version)
+    cached = not_modified(request, etag, last_modified)
+    if cached is not None:
+        return cached
+    
+    etats_trafic = await service.get_all_trafic()
     
-    return TraficResponse(
-        derniere_maj=datetime.now(),
-        nombre_lignes=len(etats_trafic),
-        trafic=[
-            TraficItem(
-                ligne_id=e.ligne_id,
-                statut=e.statut.value,
-                retard_minutes=e.retard_minutes,
-                message=e.message,
-                timestamp=e.timestamp
-            ) for e in etats_trafic
-        ]
-    )
\ No newline at end of file
+    return json_response(
+        {
+            "derniere_maj": datetime.now(),
+            "nombre_lignes": len(etats_trafic),
+            "trafic": TRAFIC_ENCODER.many(etats_trafic),
+        },
+        TraficResponse,
+        headers=cache_headers(etag, last_modified)
+    )
+
+@router.post(
+    "/batch",
+    response_model=IngestionResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Ingestion par lots du trafic (flux AVL)"
+)
+async def ingest_trafic(data: TraficBatch, service: TraficService = Depends(get_trafic_service)):
+    """
+    Accepte jusqu'à 5000 mises à jour par appel. Elles sont fusionnées par
+    ligne (la dernière l'emporte) et écrites en un upsert à intervalle court
+    (`INGEST_FLUSH_INTERVAL`) ; les deltas sont publiés au moment de l'écriture.
+    Les lignes inconnues sont ignorées et listées dans `rejetees`.
+    """
+    accepted, rejected = await service.ingest([
+        EtatTrafic(u.ligne_id, u.statut, u.retard_minutes, u.message, u.timestamp)
+        for u in data.updates
+    ])
+    return IngestionResponse(acceptees=accepted, rejetees=rejected, en_attente=len(service.buffer))
+
+@router.put("/{ligne_id}", response_model=TraficItem, summary="Mettre à jour le trafic d'une ligne")
+async def update_trafic(
+    data: TraficUpdate,
+    ligne_id: str = Path(..., description="ID de la ligne"),
+    service: TraficService = Depends(get_trafic_service)
+):
+    """
+    Met à jour l'état du trafic d'une ligne (flux AVL, régulation).
+    Les abonnés de /trafic/stream et /trafic/ws reçoivent le delta si le
+    statut ou le retard change.
+    """
+    etat = await service.update_etat(ligne_id, data.statut, data.retard_minutes, data.message)
+    if not etat:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Ligne {ligne_id} non trouvée"
+        )
+    return TraficItem(**etat_to_dict(etat))
+
+# ============================================================================
+# TRAFIC TEMPS RÉEL (SSE / WebSocket)
+# ============================================================================
+
+async def _snapshot(service: TraficService) -> str:
+    """État courant de toutes les lignes, sérialisé (premier événement du flux)"""
+    return json.dumps([etat_to_dict(e) for e in await service.get_all_trafic()], ensure_ascii=False)
+
+@router.get("/stream", summary="Trafic temps réel (Server-Sent Events)")
+async def stream_trafic(
+    service: TraficService = Depends(get_trafic_service),
+    hub: TraficHub = Depends(get_trafic_hub)
+):
+    """
+    Flux SSE du trafic : un événement `snapshot` avec l'état de toutes les
+    lignes, puis un événement `trafic` par changement de statut ou de retard.
+    Un commentaire `: heartbeat` est émis périodiquement pendant les périodes calmes.
+    """
+    # Abonnement avant l'instantané : aucun changement ne peut être perdu entre les deux
+    subscriber = hub.subscribe()
+    snapshot = await _snapshot(service)
+
+    async def events():
+        try:
+            yield f"event: snapshot\ndata: {snapshot}\n\n"
+            while True:
+                payload = await subscriber.next(settings.trafic_stream_heartbeat)
+                if payload is None:
+                    yield ": heartbeat\n\n"
+                elif payload == EVICTED:
+                    yield f"event: {EVICTED}\ndata: {{}}\n\n"
+                    return
+                else:
+                    yield f"event: trafic\ndata: {payload}\n\n"
+        finally:
+            hub.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.websocket("/ws")
+async def trafic_websocket(websocket: WebSocket):
+    """Trafic temps réel via WebSocket (messages JSON {event, data})"""
+    container = websocket.app.state.container
+    hub = container.trafic_hub
+    await websocket.accept()
+    subscriber = hub.subscribe()
+    try:
+        snapshot = await _snapshot(container.trafic_service)
+        await websocket.send_text(f'{{"event": "snapshot", "data": {snapshot}}}')
+        while True:
+            payload = await subscriber.next(settings.trafic_stream_heartbeat)
+            if payload is None:
+                await websocket.send_text('{"event": "heartbeat", "data": {}}')
+            elif payload == EVICTED:
+                await websocket.send_text(f'{{"event": "{EVICTED}", "data": {{}}}}')
+                await websocket.close(code=1013)
+                return
+            else:
+                # Delta déjà sérialisé par le hub : pas de nouvel encodage par client
+                await websocket.send_text(f'{{"event": "trafic", "data": {payload}}}')
+    except WebSocketDisconnect:
+        pass
+    finally:
+        hub.unsubscribe(subscriber)
+
+@router.get("/streams", summary="Flux trafic ouverts")
+async def stream_stats(
+    hub: TraficHub = Depends(get_trafic_hub),
+    service: TraficService = Depends(get_trafic_service)
+):
+    """Abonnés du worker, deltas publiés, livrés et clients évincés ; tampon d'ingestion"""
+    return {**hub.snapshot(), "ingestion": service.buffer.snapshot()}
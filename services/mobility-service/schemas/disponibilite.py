@@ -1,8 +1,8 @@
 """
 Schémas Pydantic pour la disponibilité des véhicules
 """
-from pydantic import BaseModel, Field
-from typing import List
+from pydantic import BaseModel, Field, model_validator
+from typing import Dict, List, Optional
 from datetime import datetime
 
 class DisponibiliteItem(BaseModel):
@@ -18,3 +18,56 @@ class DisponibiliteResponse(BaseModel):
     timestamp: datetime
     nombre_lignes: int
     disponibilites: List[DisponibiliteItem]
+
+
+class DisponibiliteBatchItem(BaseModel):
+    """Disponibilité d'une ligne dans un lot (flux AVL) ; le taux est calculé par le service"""
+    ligne_id: str = Field(..., description="ID de la ligne")
+    vehicules_total: int = Field(..., ge=0, description="Nombre total de véhicules")
+    vehicules_en_service: int = Field(..., ge=0, description="Véhicules actuellement en service")
+    derniere_maj: Optional[datetime] = Field(None, description="Horodatage de la mesure (réception par défaut)")
+
+    @model_validator(mode="after")
+    def check_en_service(self):
+        if self.vehicules_en_service > self.vehicules_total:
+            raise ValueError("vehicules_en_service ne peut pas dépasser vehicules_total")
+        return self
+
+class DisponibiliteBatch(BaseModel):
+    """Lot de mises à jour de disponibilité"""
+    updates: List[DisponibiliteBatchItem] = Field(..., min_length=1, max_length=5000)
+
+
+class StatsGroupe(BaseModel):
+    """Agrégats de disponibilité d'un ensemble de lignes"""
+    nombre_lignes: int
+    vehicules_total: int
+    vehicules_en_service: int
+    taux_pondere: float = Field(..., description="Véhicules en service / véhicules total (%)")
+    taux_moyen: float = Field(..., description="Moyenne des taux par ligne (%)")
+    taux_min: float
+    p10: float
+    p50: float
+    p90: float
+
+class LigneSousSla(BaseModel):
+    """Ligne dont le taux de disponibilité est sous le seuil SLA"""
+    ligne_id: str
+    type_transport: str
+    taux_disponibilite: float
+
+class PointHistorique(BaseModel):
+    """Point de l'historique glissant"""
+    timestamp: datetime
+    taux_pondere: float
+    par_type: Dict[str, float]
+
+class DisponibiliteStatsResponse(BaseModel):
+    """Statistiques de disponibilité de la flotte"""
+    timestamp: datetime = Field(..., description="Date de l'instantané")
+    sla: float = Field(..., description="Seuil SLA appliqué (%)")
+    flotte: StatsGroupe
+    par_type: Dict[str, StatsGroupe]
+    sous_sla: List[LigneSousSla]
+    tendance: Optional[float] = Field(None, description="Évolution du taux pondéré sur la fenêtre (points de %)")
+    historique: List[PointHistorique]
@@ -19,3 +19,16 @@ class HorairesResponse(BaseModel):
     ligne: str = Field(..., description="Numéro de la ligne")
     nombre_horaires: int
     horaires: List[HoraireItem]
+
+
+class ProchainDepartItem(HoraireItem):
+    """Horaire de passage avec le temps d'attente"""
+    attente_minutes: int = Field(..., description="Minutes avant le départ", example=7)
+
+class ProchainsDepartsResponse(BaseModel):
+    """Réponse contenant les prochains départs d'une station"""
+    ligne: str = Field(..., description="Numéro de la ligne")
+    station: str = Field(..., description="Station de départ")
+    apres: str = Field(..., description="Heure de référence (HH:MM)", example="08:10")
+    nombre_departs: int
+    departs: List[ProchainDepartItem]
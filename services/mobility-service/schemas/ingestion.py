@@ -0,0 +1,11 @@
+"""
+Schémas Pydantic communs à l'ingestion par lots (flux AVL)
+"""
+from pydantic import BaseModel, Field
+from typing import List
+
+class IngestionResponse(BaseModel):
+    """Accusé de réception d'un lot (écriture différée)"""
+    acceptees: int = Field(..., description="Mises à jour mises en tampon")
+    rejetees: List[str] = Field(default_factory=list, description="Lignes inconnues, ignorées")
+    en_attente: int = Field(..., description="Lignes en attente d'écriture après ce lot")
@@ -0,0 +1,26 @@
+"""
+Schémas Pydantic pour la recherche d'itinéraires
+"""
+from pydantic import BaseModel, Field
+from typing import List
+
+class EtapeItem(BaseModel):
+    """Trajet sur une ligne (heures effectives, retard inclus)"""
+    horaire_id: str
+    ligne_id: str
+    station_depart: str = Field(..., example="Gare Centrale")
+    station_arrivee: str = Field(..., example="Banlieue Nord")
+    quai: str = Field(..., example="A")
+    heure_depart: str = Field(..., description="Départ effectif (HH:MM)", example="08:15")
+    heure_arrivee: str = Field(..., description="Arrivée effective (HH:MM)", example="08:40")
+    retard_minutes: int = Field(0, description="Retard de la ligne pris en compte")
+
+class ItineraireResponse(BaseModel):
+    """Itinéraire arrivant au plus tôt"""
+    depart: str = Field(..., description="Station de départ")
+    arrivee: str = Field(..., description="Station d'arrivée")
+    heure: str = Field(..., description="Heure de départ au plus tôt (HH:MM)", example="08:00")
+    heure_arrivee: str = Field(..., description="Heure d'arrivée (HH:MM)", example="08:40")
+    duree_minutes: int = Field(..., description="Durée depuis l'heure demandée")
+    correspondances: int = Field(..., description="Nombre de changements de ligne")
+    etapes: List[EtapeItem]
@@ -2,7 +2,7 @@
 Schémas Pydantic pour les lignes de transport
 """
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Annotated, List, Literal, Optional, Union
 from datetime import datetime
 
 class LigneBase(BaseModel):
@@ -33,4 +33,44 @@ class LigneResponse(LigneBase):
     updated_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# ============================================================================
+# OPÉRATIONS PAR LOTS
+# ============================================================================
+
+class LigneBulkCreate(BaseModel):
+    """Création d'une ligne dans un lot"""
+    op: Literal["create"]
+    ligne: LigneCreate
+
+class LigneBulkUpdate(BaseModel):
+    """Mise à jour d'une ligne dans un lot"""
+    op: Literal["update"]
+    id: str = Field(..., description="Identifiant de la ligne")
+    ligne: LigneUpdate
+
+class LigneBulkDelete(BaseModel):
+    """Suppression d'une ligne dans un lot"""
+    op: Literal["delete"]
+    id: str = Field(..., description="Identifiant de la ligne")
+
+LigneBulkOperation = Annotated[Union[LigneBulkCreate, LigneBulkUpdate, LigneBulkDelete], Field(discriminator="op")]
+
+class LigneBulkRequest(BaseModel):
+    """Lot d'opérations appliquées dans une seule transaction"""
+    operations: List[LigneBulkOperation] = Field(..., min_length=1, max_length=1000)
+
+class LigneBulkResult(BaseModel):
+    """Résultat d'une opération du lot"""
+    index: int
+    op: str
+    statut: int = Field(..., description="201, 200, 204 ; 404, 409, 422 en erreur ; 424 si annulée par une autre")
+    id: Optional[str] = None
+    ligne: Optional[LigneResponse] = None
+    erreur: Optional[str] = None
+
+class LigneBulkResponse(BaseModel):
+    """Résultat d'un lot : appliqué en entier ou pas du tout"""
+    applique: bool
+    resultats: List[LigneBulkResult]
@@ -2,8 +2,9 @@
 Schémas Pydantic pour l'état du trafic
 """
 from pydantic import BaseModel, Field
-from typing import List
+from typing import List, Optional
 from datetime import datetime
+from models.entities import StatutTrafic
 
 class TraficItem(BaseModel):
     """État du trafic pour une ligne"""
@@ -18,3 +19,20 @@ class TraficResponse(BaseModel):
     derniere_maj: datetime
     nombre_lignes: int
     trafic: List[TraficItem]
+
+
+class TraficUpdate(BaseModel):
+    """Schéma pour la mise à jour de l'état du trafic d'une ligne"""
+    statut: StatutTrafic = Field(..., description="État du trafic", example="retard")
+    retard_minutes: int = Field(0, ge=0, description="Retard en minutes", example=5)
+    message: str = Field("", description="Message d'information", example="Incident technique")
+
+
+class TraficBatchItem(TraficUpdate):
+    """Mise à jour du trafic d'une ligne dans un lot (flux AVL)"""
+    ligne_id: str = Field(..., description="ID de la ligne")
+    timestamp: Optional[datetime] = Field(None, description="Horodatage de la mesure (réception par défaut)")
+
+class TraficBatch(BaseModel):
+    """Lot de mises à jour du trafic"""
+    updates: List[TraficBatchItem] = Field(..., min_length=1, max_length=5000)
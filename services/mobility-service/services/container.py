@@ -0,0 +1,167 @@
+"""
+Conteneur d'injection de dépendances du service
+Les repositories et services sont construits une seule fois par worker, à
+leur premier usage (et non au démarrage), puis partagés par toutes les routes.
+Un worker qui démarre ne paie que ce que ses premières requêtes utilisent.
+"""
+from functools import cached_property
+from fastapi import Request
+import logging
+
+from config.settings import settings
+from repositories.factory import (
+    create_disponibilite_repository,
+    create_horaire_repository,
+    create_ligne_repository,
+    create_trafic_repository,
+    open_timetable,
+    use_sql,
+)
+from services.disponibilite_service import DisponibiliteService
+from services.disponibilite_stats import HistoriqueDisponibilite
+from services.horaire_service import HoraireService
+from services.itineraire_service import ItineraireService
+from services.ligne_service import LigneService
+from services.trafic_hub import TraficHub
+from services.trafic_service import TraficService
+from utils.idempotency import IdempotencyCache
+
+logger = logging.getLogger("mobility-service")
+
+class ServiceContainer:
+    """Repositories et services partagés du worker (construits à la demande)"""
+    
+    def __init__(self):
+        logger.info(f"🧩 Conteneur de services prêt (stockage: {settings.repository_backend})")
+    
+    def _built(self, name: str) -> bool:
+        """Vrai si l'attribut paresseux `name` a déjà été construit"""
+        return name in self.__dict__
+    
+    # ========================================================================
+    # REPOSITORIES
+    # ========================================================================
+    
+    @cached_property
+    def timetable(self):
+        """Horaires précompilés (TIMETABLE_PATH), partagés par les horaires et le référentiel des lignes"""
+        return open_timetable()
+    
+    # Un seul exemplaire de chaque repository : une ligne créée via
+    # POST /lignes est immédiatement visible de GET /horaires/{ligne}
+    @cached_property
+    def ligne_repository(self):
+        return create_ligne_repository(self.timetable)
+    
+    @cached_property
+    def horaire_repository(self):
+        return create_horaire_repository(self.timetable)
+    
+    @cached_property
+    def trafic_repository(self):
+        return create_trafic_repository()
+    
+    @cached_property
+    def disponibilite_repository(self):
+        return create_disponibilite_repository()
+    
+    # ========================================================================
+    # SERVICES
+    # ========================================================================
+    
+    @cached_property
+    def trafic_hub(self) -> TraficHub:
+        """Diffusion en processus des changements de trafic (SSE / WebSocket)"""
+        return TraficHub(settings.trafic_stream_queue_size)
+    
+    @cached_property
+    def ligne_service(self) -> LigneService:
+        return LigneService(self.ligne_repository)
+    
+    @cached_property
+    def horaire_service(self) -> HoraireService:
+        return HoraireService(self.horaire_repository, self.ligne_repository)
+    
+    @cached_property
+    def trafic_service(self) -> TraficService:
+        return TraficService(
+            self.trafic_repository,
+            self.ligne_repository,
+            self.trafic_hub,
+            settings.ingest_flush_interval,
+            settings.ingest_max_pending
+        )
+    
+    @cached_property
+    def disponibilite_service(self) -> DisponibiliteService:
+        return DisponibiliteService(
+            self.disponibilite_repository,
+            self.ligne_repository,
+            settings.ingest_flush_interval,
+            settings.ingest_max_pending,
+            HistoriqueDisponibilite(settings.disponibilite_history_size, settings.disponibilite_history_interval)
+        )
+    
+    @cached_property
+    def itineraire_service(self) -> ItineraireService:
+        return ItineraireService(
+            self.horaire_repository,
+            self.ligne_repository,
+            self.trafic_repository
+        )
+    
+    @cached_property
+    def idempotency_cache(self) -> IdempotencyCache:
+        """Réponses des lots déjà appliqués (en-tête Idempotency-Key)"""
+        return IdempotencyCache(settings.idempotency_max_entries, settings.idempotency_ttl)
+    
+    async def aclose(self):
+        """Libère les ressources construites (tampons d'ingestion, flux trafic, pool PostgreSQL, horaires mappés)"""
+        # Les mises à jour en attente sont écrites avant la fermeture du pool
+        if self._built("trafic_service"):
+            await self.trafic_service.aclose()
+        if self._built("disponibilite_service"):
+            await self.disponibilite_service.aclose()
+        if self._built("trafic_hub"):
+            self.trafic_hub.close()
+        if self._built("timetable") and self.timetable is not None:
+            self.timetable.close()
+        if use_sql():
+            from database.connection import close_db
+            await close_db()
+
+# ============================================================================
+# DÉPENDANCES FASTAPI
+# ============================================================================
+
+def get_container(request: Request) -> ServiceContainer:
+    """Dépendance FastAPI : conteneur créé dans le lifespan"""
+    return request.app.state.container
+
+def get_ligne_service(request: Request) -> LigneService:
+    """Service des lignes partagé"""
+    return request.app.state.container.ligne_service
+
+def get_horaire_service(request: Request) -> HoraireService:
+    """Service des horaires partagé"""
+    return request.app.state.container.horaire_service
+
+def get_trafic_service(request: Request) -> TraficService:
+    """Service du trafic partagé"""
+    return request.app.state.container.trafic_service
+
+def get_itineraire_service(request: Request) -> ItineraireService:
+    """Service de recherche d'itinéraires partagé"""
+    return request.app.state.container.itineraire_service
+
+def get_idempotency_cache(request: Request) -> IdempotencyCache:
+    """Cache des clés d'idempotence du worker"""
+    return request.app.state.container.idempotency_cache
+
+def get_trafic_hub(request: Request) -> TraficHub:
+    """Hub de diffusion du trafic"""
+    return request.app.state.container.trafic_hub
+
+def get_disponibilite_service(request: Request) -> DisponibiliteService:
+    """Service de disponibilité partagé"""
+    return request.app.state.container.disponibilite_service
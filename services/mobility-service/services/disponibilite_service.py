@@ -1,17 +1,126 @@
 """
 Service métier pour la disponibilité des véhicules
 """
-from typing import List
+from typing import List, Optional, Sequence, Tuple
+from datetime import datetime
+import asyncio
+import logging
+import numpy as np
 from repositories.disponibilite_repository import DisponibiliteRepository
+from repositories.ligne_repository import LigneRepository
+from services.disponibilite_stats import FlotteSnapshot, HistoriqueDisponibilite
+from services.ingestion import CoalescingBuffer
 from models.entities import Disponibilite
 
+logger = logging.getLogger("mobility-service")
+
+def taux_disponibilite(totaux: Sequence[int], en_service: Sequence[int]) -> np.ndarray:
+    """
+    Taux de disponibilité (%) d'un lot entier, calculé colonne contre colonne
+    en une opération vectorisée (0 pour une ligne sans véhicule)
+    """
+    totaux = np.asarray(totaux, dtype=np.float64)
+    en_service = np.asarray(en_service, dtype=np.float64)
+    taux = np.divide(en_service, totaux, out=np.zeros_like(totaux), where=totaux > 0) * 100
+    return np.round(taux, 2)
+
 class DisponibiliteService:
     """Service de gestion de la disponibilité"""
     
-    def __init__(self):
-        self.repository = DisponibiliteRepository()
+    def __init__(
+        self,
+        repository: DisponibiliteRepository,
+        ligne_repository: LigneRepository,
+        flush_interval: float = 1.0,
+        max_pending: int = 5000,
+        historique: Optional[HistoriqueDisponibilite] = None
+    ):
+        self.repository = repository
+        self.ligne_repository = ligne_repository
+        # Statistiques : instantané en colonnes mis en cache par version, historique glissant
+        self.historique = historique if historique is not None else HistoriqueDisponibilite()
+        self._snapshot: Optional[FlotteSnapshot] = None
+        self._snapshot_version: Optional[str] = None
+        self._snapshot_lock = asyncio.Lock()
+        # Échantillonnage de l'historique, démarré au premier instantané
+        self._sampler: Optional[asyncio.Task] = None
+        # Mises à jour du flux AVL, fusionnées par ligne puis écrites par lots
+        self.buffer: CoalescingBuffer[Disponibilite] = CoalescingBuffer(
+            "disponibilite", self._write, flush_interval, max_pending
+        )
     
-    def get_all_disponibilites(self) -> List[Disponibilite]:
+    async def get_all_disponibilites(self) -> List[Disponibilite]:
         """Récupère la disponibilité de toutes les lignes"""
-        return self.repository.find_all()
-    
\ No newline at end of file
+        return await self.repository.find_all()
+    
+    async def get_version(self) -> Tuple[str, datetime]:
+        """Version des données (requêtes conditionnelles)"""
+        return await self.repository.get_version()
+    
+    async def _write(self, disponibilites: List[Disponibilite]):
+        """Recalcule les taux du lot puis l'écrit en un upsert"""
+        taux = taux_disponibilite(
+            [d.vehicules_total for d in disponibilites],
+            [d.vehicules_en_service for d in disponibilites]
+        )
+        for disponibilite, valeur in zip(disponibilites, taux.tolist()):
+            disponibilite.taux_disponibilite = valeur
+        await self.repository.save_many(disponibilites)
+        # Un point d'historique par écriture, sans attendre une requête de statistiques
+        await self.get_snapshot()
+    
+    async def get_stats_version(self) -> Tuple[str, datetime]:
+        """Version des disponibilités et du référentiel des lignes (types de transport)"""
+        dispo_version, dispo_maj = await self.repository.get_version()
+        lignes_version, lignes_maj = await self.ligne_repository.get_version()
+        return f"{dispo_version}:{lignes_version}", max(dispo_maj, lignes_maj)
+    
+    async def get_snapshot(self) -> FlotteSnapshot:
+        """
+        Instantané en colonnes de la flotte, reconstruit seulement quand les
+        disponibilités ou les lignes changent ; chaque nouvel instantané
+        alimente l'historique glissant
+        """
+        async with self._snapshot_lock:
+            version, _ = await self.get_stats_version()
+            if self._snapshot is None or version != self._snapshot_version:
+                types = {ligne.id: ligne.type_transport.value for ligne in await self.ligne_repository.find_all()}
+                self._snapshot = FlotteSnapshot(await self.repository.find_all(), types)
+                self._snapshot_version = version
+                self.historique.enregistrer(self._snapshot)
+            if self._sampler is None and self.historique.intervalle > 0:
+                self._sampler = asyncio.create_task(self._echantillonner())
+            return self._snapshot
+    
+    async def _echantillonner(self):
+        """
+        Un point d'historique par intervalle, même sans nouvelle écriture :
+        une flotte stable donne une tendance plate, pas un historique vide
+        """
+        while True:
+            await asyncio.sleep(self.historique.intervalle)
+            try:
+                self.historique.enregistrer(await self.get_snapshot(), datetime.now())
+            except Exception as e:
+                logger.error(f"❌ Échec de l'échantillonnage de la disponibilité: {e}")
+    
+    async def ingest(self, disponibilites: List[Disponibilite]) -> Tuple[int, List[str]]:
+        """
+        Accepte un lot du flux AVL : les lignes connues sont mises en tampon
+        (écriture différée), les lignes inconnues sont rejetées.
+        Retourne (nombre accepté, lignes rejetées).
+        """
+        known = await self.ligne_repository.existing_ids(d.ligne_id for d in disponibilites)
+        accepted = self.buffer.submit(d for d in disponibilites if d.ligne_id in known)
+        return accepted, sorted({d.ligne_id for d in disponibilites} - known)
+    
+    async def aclose(self):
+        """Arrête l'échantillonnage et écrit les mises à jour encore en attente"""
+        if self._sampler is not None:
+            self._sampler.cancel()
+            try:
+                await self._sampler
+            except asyncio.CancelledError:
+                pass
+            self._sampler = None
+        await self.buffer.aclose()
@@ -0,0 +1,115 @@
+"""
+Statistiques de disponibilité de la flotte
+
+Un instantané range la disponibilité de toutes les lignes en colonnes NumPy
+triées par type de transport : chaque type est une tranche contiguë et chaque
+agrégat (sommes, taux pondéré, percentiles, lignes sous le seuil SLA) est une
+opération vectorisée sur une tranche de colonnes, sans boucle Python par ligne.
+
+L'historique glissant garde un point agrégé par intervalle, en mémoire du
+worker, y compris quand les données ne changent pas : les requêtes de
+tendance ne touchent pas la base.
+"""
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from models.entities import Disponibilite
+
+# Type des disponibilités dont la ligne n'est pas (ou plus) au référentiel
+TYPE_INCONNU = "inconnu"
+
+class FlotteSnapshot:
+    """Disponibilité de toutes les lignes en colonnes, tranchées par type"""
+
+    def __init__(self, disponibilites: Iterable[Disponibilite], types: Dict[str, str]):
+        rows = sorted(disponibilites, key=lambda d: (types.get(d.ligne_id, TYPE_INCONNU), d.ligne_id))
+        self.timestamp = datetime.now()
+        self.ligne_ids = [d.ligne_id for d in rows]
+        self.types = [types.get(d.ligne_id, TYPE_INCONNU) for d in rows]
+        self.total = np.fromiter((d.vehicules_total for d in rows), dtype=np.int64, count=len(rows))
+        self.en_service = np.fromiter((d.vehicules_en_service for d in rows), dtype=np.int64, count=len(rows))
+        self.taux = np.fromiter((d.taux_disponibilite for d in rows), dtype=np.float64, count=len(rows))
+        # type -> tranche [début, fin) des colonnes (types déjà triés : premier indice de chaque type)
+        noms, debuts = np.unique(np.array(self.types, dtype=str), return_index=True)
+        fins = np.append(debuts[1:], len(rows))
+        self.groupes: Dict[str, Tuple[int, int]] = {
+            str(nom): (int(debut), int(fin)) for nom, debut, fin in zip(noms, debuts, fins)
+        }
+
+    def __len__(self) -> int:
+        return len(self.ligne_ids)
+
+    def stats(self, debut: int = 0, fin: Optional[int] = None) -> dict:
+        """Agrégats d'une tranche : véhicules, taux pondéré par la flotte, moyenne et percentiles"""
+        tranche = slice(debut, len(self) if fin is None else fin)
+        total = int(self.total[tranche].sum())
+        en_service = int(self.en_service[tranche].sum())
+        taux = self.taux[tranche]
+        if len(taux) == 0:
+            p10 = p50 = p90 = 0.0
+        else:
+            p10, p50, p90 = np.percentile(taux, (10, 50, 90))
+        return {
+            "nombre_lignes": len(taux),
+            "vehicules_total": total,
+            "vehicules_en_service": en_service,
+            "taux_pondere": round(100.0 * en_service / total, 2) if total else 0.0,
+            "taux_moyen": round(float(taux.mean()), 2) if len(taux) else 0.0,
+            "taux_min": float(taux.min()) if len(taux) else 0.0,
+            "p10": round(float(p10), 2),
+            "p50": round(float(p50), 2),
+            "p90": round(float(p90), 2),
+        }
+
+    def par_type(self) -> Dict[str, dict]:
+        """Agrégats de chaque type de transport"""
+        return {type_transport: self.stats(debut, fin) for type_transport, (debut, fin) in self.groupes.items()}
+
+    def sous_sla(self, seuil: float) -> List[int]:
+        """Indices des lignes dont le taux est strictement sous le seuil, du plus bas au plus haut"""
+        indices = np.flatnonzero(self.taux < seuil)
+        return indices[np.argsort(self.taux[indices], kind="stable")].tolist()
+
+class HistoriqueDisponibilite:
+    """
+    Historique glissant des taux pondérés : un point par intervalle (le
+    dernier instantané de l'intervalle l'emporte), `taille` points au plus
+    """
+
+    def __init__(self, taille: int = 1440, intervalle: float = 60.0):
+        self._points: Deque[dict] = deque(maxlen=taille)
+        # Période d'échantillonnage (secondes), 0 : un point par instantané seulement
+        self.intervalle = intervalle
+        self._intervalle = timedelta(seconds=intervalle)
+        # Début de l'intervalle du dernier point
+        self._debut = datetime.min
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def enregistrer(self, snapshot: FlotteSnapshot, timestamp: Optional[datetime] = None):
+        """
+        Ajoute (ou remplace dans l'intervalle courant) le point de l'instantané,
+        daté de `timestamp` (par défaut, l'heure de l'instantané)
+        """
+        timestamp = timestamp or snapshot.timestamp
+        point = {
+            "timestamp": timestamp,
+            "taux_pondere": snapshot.stats()["taux_pondere"],
+            "par_type": {t: s["taux_pondere"] for t, s in snapshot.par_type().items()},
+        }
+        if self._points and timestamp - self._debut < self._intervalle:
+            self._points[-1] = point
+        else:
+            self._points.append(point)
+            self._debut = timestamp
+
+    def depuis(self, minutes: Optional[int] = None) -> List[dict]:
+        """Points des `minutes` dernières minutes (tout l'historique par défaut)"""
+        if minutes is None:
+            return list(self._points)
+        limite = datetime.now() - timedelta(minutes=minutes)
+        return [point for point in self._points if point["timestamp"] >= limite]
@@ -1,7 +1,8 @@
 """
 Service métier pour les horaires
 """
-from typing import List
+from typing import List, Optional, Tuple
+from datetime import datetime
 from repositories.horaire_repository import HoraireRepository
 from repositories.ligne_repository import LigneRepository
 from models.entities import Horaire
@@ -9,15 +10,29 @@ from models.entities import Horaire
 class HoraireService:
     """Service de gestion des horaires"""
     
-    def __init__(self):
-        self.repository = HoraireRepository()
-        self.ligne_repository = LigneRepository()
+    def __init__(self, repository: HoraireRepository, ligne_repository: LigneRepository):
+        self.repository = repository
+        # Repository des lignes partagé avec LigneService
+        self.ligne_repository = ligne_repository
     
-    def get_horaires_by_ligne(self, ligne: str) -> List[Horaire]:
+    async def get_version(self) -> Tuple[str, datetime]:
+        """Version des horaires et du référentiel des lignes (requêtes conditionnelles)"""
+        horaires_version, horaires_maj = await self.repository.get_version()
+        lignes_version, lignes_maj = await self.ligne_repository.get_version()
+        return f"{horaires_version}:{lignes_version}", max(horaires_maj, lignes_maj)
+    
+    async def get_horaires_by_ligne(self, ligne: str) -> List[Horaire]:
         """Récupère les horaires d'une ligne donnée"""
         # Vérification que la ligne existe
-        ligne_entity = self.ligne_repository.find_by_numero(ligne)
+        ligne_entity = await self.ligne_repository.find_by_numero(ligne)
         if not ligne_entity:
             return []
         
-        return self.repository.find_by_ligne(ligne)
+        return await self.repository.find_by_ligne(ligne)
+    
+    async def get_prochains_departs(self, ligne: str, station: str, apres: int, limite: int) -> Optional[List[Horaire]]:
+        """Prochains départs d'une station (None si la ligne n'existe pas)"""
+        if not await self.ligne_repository.find_by_numero(ligne):
+            return None
+        
+        return await self.repository.find_prochains(ligne, station, apres, limite)
@@ -0,0 +1,112 @@
+"""
+Tampon d'ingestion des mises à jour temps réel (flux AVL)
+
+Les mises à jour reçues par lots sont fusionnées en mémoire par ligne : seule
+la dernière valeur de chaque ligne est conservée. Le tampon est vidé en un
+seul upsert toutes les `interval` secondes, ou plus tôt dès que `max_pending`
+lignes sont en attente. Un flux qui rafraîchit chaque ligne toutes les quelques
+secondes coûte ainsi une écriture par ligne et par intervalle, pas une par message.
+"""
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Generic, Iterable, List, Optional, TypeVar
+
+logger = logging.getLogger("mobility-service")
+
+T = TypeVar("T")
+
+class CoalescingBuffer(Generic[T]):
+    """Dernière mise à jour par ligne, écrite périodiquement par `flush`"""
+
+    def __init__(
+        self,
+        name: str,
+        flush: Callable[[List[T]], Awaitable[None]],
+        interval: float = 1.0,
+        max_pending: int = 5000
+    ):
+        self.name = name
+        self._flush = flush
+        self._interval = interval
+        self._max_pending = max_pending
+        self._pending: Dict[str, T] = {}
+        self._lock = asyncio.Lock()
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"recues": 0, "ecrites": 0, "vidages": 0, "erreurs": 0}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def submit(self, updates: Iterable[T]) -> int:
+        """Ajoute des mises à jour (attribut ligne_id) ; retourne le nombre reçu"""
+        received = 0
+        for update in updates:
+            self._pending[update.ligne_id] = update
+            received += 1
+        self.stats["recues"] += received
+        if self._task is None:
+            # Démarré au premier lot : la boucle d'événements du worker existe alors
+            self._task = asyncio.create_task(self._run())
+        if len(self._pending) >= self._max_pending:
+            self._wake.set()
+        return received
+
+    async def write_now(self, updates: List[T]):
+        """
+        Écriture directe, sous le verrou des vidages : un vidage en cours (qui
+        a déjà retiré ses mises à jour du tampon) se termine avant, et les
+        mises à jour en attente des mêmes lignes, plus anciennes, sont oubliées
+        """
+        async with self._lock:
+            for update in updates:
+                self._pending.pop(update.ligne_id, None)
+            await self._flush(updates)
+
+    async def _run(self):
+        """Vide le tampon à intervalle régulier (ou dès qu'il est plein)"""
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self._interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception:
+                # Déjà journalisé ; les mises à jour restent en attente pour le prochain vidage
+                pass
+
+    async def flush(self) -> int:
+        """Écrit les mises à jour en attente ; retourne le nombre de lignes écrites"""
+        async with self._lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, {}
+            try:
+                await self._flush(list(batch.values()))
+            except Exception as e:
+                # Remise en attente, sans écraser les valeurs plus récentes reçues entre-temps
+                for ligne_id, update in batch.items():
+                    self._pending.setdefault(ligne_id, update)
+                self.stats["erreurs"] += 1
+                logger.error(f"❌ Échec de l'écriture du lot {self.name} ({len(batch)} lignes): {e}")
+                raise
+            self.stats["ecrites"] += len(batch)
+            self.stats["vidages"] += 1
+            return len(batch)
+
+    async def aclose(self):
+        """Arrête la boucle et écrit ce qui reste (arrêt du worker)"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def snapshot(self) -> dict:
+        """Lignes en attente et compteurs"""
+        return {"en_attente": len(self._pending), **self.stats}
@@ -0,0 +1,112 @@
+"""
+Service métier de recherche d'itinéraires
+"""
+from typing import List, Optional, Tuple
+from datetime import datetime
+import asyncio
+import logging
+import time
+from repositories.horaire_repository import HoraireRepository
+from repositories.ligne_repository import LigneRepository
+from repositories.trafic_repository import TraficRepository
+from services.reseau import ReseauGraph, VueReseau
+from models.entities import Horaire, StatutTrafic
+
+logger = logging.getLogger("mobility-service")
+
+class Etape:
+    """Trajet sur une ligne, retard du trafic inclus"""
+    def __init__(self, horaire: Horaire, depart: int, arrivee: int, retard_minutes: int):
+        self.horaire = horaire
+        self.depart = depart
+        self.arrivee = arrivee
+        self.retard_minutes = retard_minutes
+
+class ItineraireService:
+    """
+    Recherche d'itinéraires (arrivée au plus tôt) sur le graphe horaire.
+    Le graphe est construit au démarrage puis mis à jour ligne par ligne quand
+    la version des horaires change ; la vue retardée est recalculée seulement
+    quand le trafic ou le référentiel des lignes change.
+    """
+    
+    def __init__(
+        self,
+        horaire_repository: HoraireRepository,
+        ligne_repository: LigneRepository,
+        trafic_repository: TraficRepository
+    ):
+        self.horaire_repository = horaire_repository
+        self.ligne_repository = ligne_repository
+        self.trafic_repository = trafic_repository
+        self.graph = ReseauGraph()
+        self._horaires_version: Optional[str] = None
+        self._vue: Optional[VueReseau] = None
+        self._vue_version: Optional[Tuple[str, str]] = None
+        # Une seule reconstruction à la fois (préchauffage et premières requêtes)
+        self._lock = asyncio.Lock()
+    
+    async def refresh(self):
+        """Reconstruit les lignes du graphe dont les horaires ont changé"""
+        async with self._lock:
+            await self._refresh()
+    
+    async def _refresh(self):
+        version, _ = await self.horaire_repository.get_version()
+        if version == self._horaires_version:
+            return
+        started = time.perf_counter()
+        modifiees = self.graph.update(await self.horaire_repository.find_all())
+        self._horaires_version = version
+        if modifiees:
+            self._vue = None
+        logger.info(
+            f"🗺️  Graphe des itinéraires : {len(modifiees)} ligne(s) reconstruite(s), "
+            f"{len(self.graph)} connexions en {(time.perf_counter() - started) * 1000:.1f}ms"
+        )
+    
+    async def _vue_courante(self) -> VueReseau:
+        """Vue du réseau avec les retards actuels, sans les lignes annulées ou inactives"""
+        await self.refresh()
+        trafic_version, _ = await self.trafic_repository.get_version()
+        lignes_version, _ = await self.ligne_repository.get_version()
+        if self._vue is None or self._vue_version != (trafic_version, lignes_version):
+            actives = {ligne.id for ligne in await self.ligne_repository.find_all() if ligne.actif}
+            retards = {}
+            annulees = set()
+            for etat in await self.trafic_repository.find_all():
+                if etat.statut == StatutTrafic.ANNULE:
+                    annulees.add(etat.ligne_id)
+                else:
+                    retards[etat.ligne_id] = etat.retard_minutes
+            supprimees = {ligne_id for ligne_id in self.graph.lignes if ligne_id not in actives} | annulees
+            self._vue = self.graph.vue(retards, supprimees)
+            self._vue_version = (trafic_version, lignes_version)
+        return self._vue
+    
+    async def get_version(self) -> Tuple[str, datetime]:
+        """Version des horaires, des lignes et du trafic (requêtes conditionnelles)"""
+        versions = [
+            await self.horaire_repository.get_version(),
+            await self.ligne_repository.get_version(),
+            await self.trafic_repository.get_version(),
+        ]
+        return ":".join(v for v, _ in versions), max(m for _, m in versions)
+    
+    async def stations_inconnues(self, *stations: str) -> List[str]:
+        """Stations qu'aucun horaire ne dessert"""
+        await self.refresh()
+        return [station for station in stations if station not in self.graph.stations]
+    
+    async def rechercher(self, depart: str, arrivee: str, heure: int) -> Optional[List[Etape]]:
+        """
+        Itinéraire arrivant au plus tôt de `depart` à `arrivee` en partant
+        à `heure` (minutes depuis minuit) ou après ; None si aucun trajet
+        """
+        vue = await self._vue_courante()
+        if depart not in self.graph.stations or arrivee not in self.graph.stations:
+            return None
+        trajet = vue.arrivee_au_plus_tot(self.graph.stations[depart], self.graph.stations[arrivee], heure)
+        if trajet is None:
+            return None
+        return [Etape(vue.horaires[c], vue.depart[c], vue.arrivee[c], vue.retards[c]) for c in trajet]
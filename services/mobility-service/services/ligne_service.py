@@ -1,26 +1,63 @@
 """
 Service métier pour la gestion des lignes
 """
-from typing import List, Optional
+import copy
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+from repositories.base_repository import BatchOperationError, DuplicateKeyError
 from repositories.ligne_repository import LigneRepository
 from models.entities import Ligne, TypeTransport
-from schemas.ligne import LigneCreate, LigneUpdate
+from schemas.ligne import LigneBulkCreate, LigneBulkDelete, LigneBulkOperation, LigneCreate, LigneUpdate
+
+# Code HTTP de chaque opération réussie
+BULK_STATUTS = {"create": 201, "update": 200, "delete": 204}
+
+class ResultatOperation:
+    """Résultat d'une opération d'un lot"""
+    def __init__(
+        self,
+        index: int,
+        op: str,
+        statut: int,
+        ligne: Optional[Ligne] = None,
+        id: Optional[str] = None,
+        erreur: Optional[str] = None
+    ):
+        self.index = index
+        self.op = op
+        self.statut = statut
+        self.ligne = ligne
+        self.id = id if id is not None else (ligne.id if ligne else None)
+        self.erreur = erreur
 
 class LigneService:
     """Service de gestion des lignes de transport"""
     
-    def __init__(self):
-        self.repository = LigneRepository()
+    def __init__(self, repository: LigneRepository):
+        self.repository = repository
     
-    def get_all_lignes(self) -> List[Ligne]:
-        """Récupère toutes les lignes"""
-        return self.repository.find_all()
+    async def get_all_lignes(self, type_transport: Optional[TypeTransport] = None) -> List[Ligne]:
+        """Récupère toutes les lignes, éventuellement d'un seul type de transport"""
+        if type_transport is not None:
+            return await self.repository.find_by_type(type_transport)
+        return await self.repository.find_all()
     
-    def get_ligne_by_id(self, id: str) -> Optional[Ligne]:
+    async def get_lignes_page(
+        self,
+        type_transport: Optional[TypeTransport] = None,
+        actif: Optional[bool] = None,
+        tri: str = "numero",
+        apres: Optional[str] = None,
+        limite: Optional[int] = None
+    ) -> List[Ligne]:
+        """Page de lignes filtrée (filtres et curseur appliqués par le repository)"""
+        return await self.repository.find_page(type_transport, actif, tri, apres, limite)
+    
+    async def get_ligne_by_id(self, id: str) -> Optional[Ligne]:
         """Récupère une ligne par son ID"""
-        return self.repository.find_by_id(id)
+        return await self.repository.find_by_id(id)
     
-    def create_ligne(self, data: LigneCreate) -> Ligne:
+    async def create_ligne(self, data: LigneCreate) -> Ligne:
         """Crée une nouvelle ligne"""
         ligne = Ligne(
             id="",  # Sera généré par le repository
@@ -31,13 +68,19 @@ class LigneService:
             terminus_fin=data.terminus_fin,
             actif=data.actif
         )
-        return self.repository.create(ligne)
+        return await self.repository.create(ligne)
     
-    def update_ligne(self, id: str, data: LigneUpdate) -> Optional[Ligne]:
+    async def update_ligne(self, id: str, data: LigneUpdate) -> Optional[Ligne]:
         """Met à jour une ligne existante"""
-        existing = self.repository.find_by_id(id)
+        existing = await self.repository.find_by_id(id)
         if not existing:
             return None
+        return await self.repository.update(id, self._merge(existing, data))
+    
+    @staticmethod
+    def _merge(existing: Ligne, data: LigneUpdate) -> Ligne:
+        """Copie de la ligne avec les champs fournis (l'entité stockée reste intacte)"""
+        existing = copy.copy(existing)
         
         # Mise à jour des champs fournis
         if data.numero is not None:
@@ -52,9 +95,62 @@ class LigneService:
             existing.terminus_fin = data.terminus_fin
         if data.actif is not None:
             existing.actif = data.actif
+        return existing
+    
+    async def bulk_lignes(self, operations: List[LigneBulkOperation]) -> Tuple[bool, List[ResultatOperation]]:
+        """
+        Applique un lot de créations, mises à jour et suppressions en tout ou
+        rien, dans une seule transaction. Le lot est validé en entier avant
+        toute écriture ; les opérations d'un même lot se voient (une mise à
+        jour après une création de numéro, une suppression puis une recréation...).
+        Retourne (appliqué, résultat par opération).
+        """
+        # Lignes visées chargées en une requête
+        cibles = {op.id for op in operations if not isinstance(op, LigneBulkCreate)}
+        courant: Dict[str, Optional[Ligne]] = {l.id: l for l in await self.repository.find_by_ids(cibles)}
+        
+        entites: List[Tuple[str, Ligne]] = []
+        erreurs: Dict[int, Tuple[int, str]] = {}
+        for index, op in enumerate(operations):
+            try:
+                if isinstance(op, LigneBulkCreate):
+                    ligne = Ligne("", op.ligne.numero, op.ligne.nom, TypeTransport(op.ligne.type_transport),
+                                  op.ligne.terminus_debut, op.ligne.terminus_fin, op.ligne.actif)
+                elif courant.get(op.id) is None:
+                    erreurs[index] = (404, f"Ligne avec l'ID {op.id} introuvable")
+                    continue
+                elif isinstance(op, LigneBulkDelete):
+                    ligne = courant[op.id]
+                    courant[op.id] = None
+                else:
+                    ligne = courant[op.id] = self._merge(courant[op.id], op.ligne)
+            except ValueError:
+                erreurs[index] = (422, "type_transport invalide")
+                continue
+            entites.append((op.op, ligne))
         
-        return self.repository.update(id, existing)
+        if not erreurs:
+            try:
+                lignes = await self.repository.apply_batch(entites)
+                return True, [
+                    ResultatOperation(index, op.op, BULK_STATUTS[op.op], None if op.op == "delete" else ligne, ligne.id)
+                    for index, (op, ligne) in enumerate(zip(operations, lignes))
+                ]
+            except BatchOperationError as e:
+                statut = 409 if isinstance(e.error, DuplicateKeyError) else 404
+                erreurs[e.index] = (statut, str(e.error))
+        
+        # Lot refusé : les opérations valides sont annulées avec lui (424)
+        resultats = []
+        for index, op in enumerate(operations):
+            statut, erreur = erreurs.get(index, (424, "Lot annulé : une autre opération a échoué"))
+            resultats.append(ResultatOperation(index, op.op, statut, id=getattr(op, "id", None), erreur=erreur))
+        return False, resultats
     
-    def delete_ligne(self, id: str) -> bool:
+    async def delete_ligne(self, id: str) -> bool:
         """Supprime une ligne"""
-        return self.repository.delete(id)
+        return await self.repository.delete(id)
+    
+    async def get_version(self) -> Tuple[str, datetime]:
+        """Version des données (requêtes conditionnelles)"""
+        return await self.repository.get_version()
@@ -0,0 +1,148 @@
+"""
+Graphe horaire du réseau pour la recherche d'itinéraires (Connection Scan)
+
+Chaque horaire est une connexion élémentaire : départ d'une station, arrivée
+à sa destination. Les connexions sont rangées par ligne, triées par heure de
+départ. Un retard de ligne décale toutes ses connexions de la même valeur :
+chaque liste reste triée et la vue retardée du réseau s'obtient par fusion
+des listes (heapq.merge), sans nouveau tri.
+
+Une requête « arrivée au plus tôt » parcourt une seule fois les connexions à
+partir de l'heure demandée (dichotomie) et s'arrête dès que les départs
+dépassent la meilleure arrivée connue.
+"""
+from array import array
+from bisect import bisect_left
+from heapq import merge
+from itertools import groupby
+from operator import attrgetter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import sys
+
+from models.entities import Horaire
+
+# Une connexion : (départ, arrivée, station de départ, station d'arrivée, horaire)
+Connexion = Tuple[int, int, int, int, Horaire]
+
+INFINI = sys.maxsize
+
+class VueReseau:
+    """Connexions du réseau retardées, en colonnes triées par départ effectif"""
+
+    def __init__(self, connexions: Iterable[Tuple[int, int, int, int, Horaire, int]], nombre_stations: int):
+        self.nombre_stations = nombre_stations
+        self.depart = array("l")
+        self.arrivee = array("l")
+        self.de = array("l")
+        self.vers = array("l")
+        self.horaires: List[Horaire] = []
+        self.retards = array("l")
+        for depart, arrivee, de, vers, horaire, retard in connexions:
+            self.depart.append(depart)
+            self.arrivee.append(arrivee)
+            self.de.append(de)
+            self.vers.append(vers)
+            self.horaires.append(horaire)
+            self.retards.append(retard)
+
+    def __len__(self) -> int:
+        return len(self.depart)
+
+    def arrivee_au_plus_tot(self, origine: int, cible: int, heure: int) -> Optional[List[int]]:
+        """
+        Connection Scan : indices des connexions du meilleur trajet de `origine`
+        à `cible` en partant à `heure` ou après (None si inaccessible)
+        """
+        # Tableaux indexés par station : pas de hachage dans la boucle de parcours
+        plus_tot = [INFINI] * self.nombre_stations
+        via = [-1] * self.nombre_stations
+        plus_tot[origine] = heure
+        depart, arrivee, de, vers = self.depart, self.arrivee, self.de, self.vers
+        for c in range(bisect_left(depart, heure), len(depart)):
+            t = depart[c]
+            if t >= plus_tot[cible]:
+                break
+            if plus_tot[de[c]] <= t and arrivee[c] < plus_tot[vers[c]]:
+                plus_tot[vers[c]] = arrivee[c]
+                via[vers[c]] = c
+        if via[cible] < 0 or origine == cible:
+            return None
+
+        trajet = []
+        station = cible
+        while station != origine:
+            c = via[station]
+            trajet.append(c)
+            station = de[c]
+        trajet.reverse()
+        return trajet
+
+class ReseauGraph:
+    """Connexions par ligne, stations internées en entiers"""
+
+    def __init__(self):
+        self.stations: Dict[str, int] = {}
+        self._lignes: Dict[str, List[Connexion]] = {}
+        # Empreinte des horaires de chaque ligne : détecte les lignes à reconstruire
+        self._signatures: Dict[str, List[tuple]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(connexions) for connexions in self._lignes.values())
+
+    @property
+    def lignes(self) -> Set[str]:
+        """Identifiants des lignes présentes dans le graphe"""
+        return set(self._lignes)
+
+    def _station(self, nom: str) -> int:
+        index = self.stations.get(nom)
+        if index is None:
+            index = self.stations[nom] = len(self.stations)
+        return index
+
+    def update(self, horaires: Iterable[Horaire]) -> Set[str]:
+        """
+        Met le graphe à jour à partir de tous les horaires du réseau.
+        Seules les lignes dont les horaires ont changé sont reconstruites ;
+        retourne l'ensemble des lignes modifiées (ajoutées, changées, supprimées).
+        """
+        par_ligne = sorted(horaires, key=attrgetter("ligne_id"))
+        modifiees = set()
+        vues = set()
+        for ligne_id, groupe in groupby(par_ligne, key=attrgetter("ligne_id")):
+            vues.add(ligne_id)
+            connexions = sorted(
+                (
+                    (h.depart_minutes, h.arrivee_minutes, self._station(h.station), self._station(h.destination), h)
+                    for h in groupe
+                    # Connexions sans déplacement ou à cheval sur minuit (horaires sur 24 h) ignorées
+                    if h.station != h.destination and h.arrivee_minutes >= h.depart_minutes
+                ),
+                key=lambda c: (c[0], c[1], c[4].id)
+            )
+            signature = [(d, a, de, vers, h.id) for d, a, de, vers, h in connexions]
+            if signature != self._signatures.get(ligne_id):
+                self._lignes[ligne_id] = connexions
+                self._signatures[ligne_id] = signature
+                modifiees.add(ligne_id)
+        for ligne_id in set(self._lignes) - vues:
+            del self._lignes[ligne_id]
+            del self._signatures[ligne_id]
+            modifiees.add(ligne_id)
+        return modifiees
+
+    def vue(self, retards: Dict[str, int], supprimees: Set[str]) -> VueReseau:
+        """
+        Vue retardée : chaque ligne décalée de son retard, lignes supprimées
+        (trafic annulé) exclues, fusion des listes déjà triées
+        """
+        def decalees(ligne_id: str, connexions: List[Connexion]):
+            retard = retards.get(ligne_id, 0)
+            for depart, arrivee, de, vers, horaire in connexions:
+                yield depart + retard, arrivee + retard, de, vers, horaire, retard
+
+        return VueReseau(merge(*(
+            decalees(ligne_id, connexions)
+            for ligne_id, connexions in self._lignes.items()
+            if ligne_id not in supprimees
+        ), key=lambda c: c[0]), len(self.stations))
@@ -0,0 +1,91 @@
+"""
+Hub de diffusion en processus des changements de trafic
+Le chemin d'écriture du trafic publie un delta quand le statut ou le retard
+d'une ligne change ; chaque client SSE / WebSocket est un abonné avec sa file
+bornée. Un écran connecté ne coûte rien tant que rien ne change.
+"""
+import asyncio
+import json
+import logging
+from typing import Optional, Set
+
+logger = logging.getLogger("mobility-service")
+
+# Événement de fin envoyé à un abonné évincé (file pleine)
+EVICTED = "evicted"
+
+class TraficSubscriber:
+    """
+    Abonné : file bornée de deltas déjà sérialisés.
+    Si la file est pleine (client qui ne lit plus), l'abonné est évincé
+    plutôt que de ralentir le chemin d'écriture ou d'accumuler de la mémoire.
+    """
+
+    def __init__(self, queue_size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size)
+        self.evicted = False
+
+    async def next(self, timeout: float) -> Optional[str]:
+        """Prochain delta, EVICTED, ou None après `timeout` secondes (heartbeat)"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+class TraficHub:
+    """Diffusion des deltas de trafic aux abonnés du worker"""
+
+    def __init__(self, queue_size: int = 100):
+        self._queue_size = queue_size
+        self._subscribers: Set[TraficSubscriber] = set()
+        self.stats = {"published": 0, "delivered": 0, "evicted": 0}
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> TraficSubscriber:
+        """Nouvel abonné"""
+        subscriber = TraficSubscriber(self._queue_size)
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: TraficSubscriber):
+        """Retire un abonné (déconnexion du client)"""
+        self._subscribers.discard(subscriber)
+
+    def publish(self, delta: dict):
+        """
+        Publie un delta : sérialisé une seule fois, déposé sans attente dans
+        la file de chaque abonné ; les abonnés saturés sont évincés
+        """
+        payload = json.dumps(delta, ensure_ascii=False, default=str)
+        self.stats["published"] += 1
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber.queue.put_nowait(payload)
+                self.stats["delivered"] += 1
+            except asyncio.QueueFull:
+                self._evict(subscriber)
+
+    def _terminate(self, subscriber: TraficSubscriber):
+        """Retire l'abonné et remplace sa file par l'événement de fin"""
+        self._subscribers.discard(subscriber)
+        subscriber.evicted = True
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        subscriber.queue.put_nowait(EVICTED)
+
+    def _evict(self, subscriber: TraficSubscriber):
+        """Évince un abonné trop lent"""
+        self._terminate(subscriber)
+        self.stats["evicted"] += 1
+        logger.warning("⚠️  Abonné trafic évincé (file pleine)")
+
+    def close(self):
+        """Termine tous les flux (arrêt du worker)"""
+        for subscriber in list(self._subscribers):
+            self._terminate(subscriber)
+
+    def snapshot(self) -> dict:
+        """Nombre d'abonnés et compteurs de diffusion"""
+        return {"subscribers": len(self._subscribers), **self.stats}
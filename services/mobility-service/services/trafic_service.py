@@ -1,16 +1,87 @@
 """
 Service métier pour l'état du trafic
 """
-from typing import List
+from typing import List, Optional, Tuple
+from datetime import datetime
+from repositories.ligne_repository import LigneRepository
 from repositories.trafic_repository import TraficRepository
-from models.entities import EtatTrafic
+from services.ingestion import CoalescingBuffer
+from services.trafic_hub import TraficHub
+from models.entities import EtatTrafic, StatutTrafic
+
+def etat_to_dict(etat: EtatTrafic) -> dict:
+    """Delta diffusé aux abonnés du flux trafic"""
+    return {
+        "ligne_id": etat.ligne_id,
+        "statut": etat.statut.value,
+        "retard_minutes": etat.retard_minutes,
+        "message": etat.message,
+        "timestamp": etat.timestamp.isoformat(),
+    }
 
 class TraficService:
     """Service de gestion du trafic"""
     
-    def __init__(self):
-        self.repository = TraficRepository()
+    def __init__(
+        self,
+        repository: TraficRepository,
+        ligne_repository: LigneRepository,
+        hub: TraficHub,
+        flush_interval: float = 1.0,
+        max_pending: int = 5000
+    ):
+        self.repository = repository
+        self.ligne_repository = ligne_repository
+        # Les changements de statut ou de retard sont publiés aux flux temps réel
+        self.hub = hub
+        # Mises à jour du flux AVL, fusionnées par ligne puis écrites par lots
+        self.buffer: CoalescingBuffer[EtatTrafic] = CoalescingBuffer("trafic", self._write, flush_interval, max_pending)
     
-    def get_all_trafic(self) -> List[EtatTrafic]:
+    async def get_all_trafic(self) -> List[EtatTrafic]:
         """Récupère l'état du trafic de toutes les lignes"""
-        return self.repository.find_all()
\ No newline at end of file
+        return await self.repository.find_all()
+    
+    async def get_version(self) -> Tuple[str, datetime]:
+        """Version des données (requêtes conditionnelles)"""
+        return await self.repository.get_version()
+    
+    async def _write(self, etats: List[EtatTrafic]):
+        """Écrit un lot d'états et publie un delta par ligne dont le statut ou le retard change"""
+        previous = await self.repository.save_many(etats)
+        for etat in etats:
+            before = previous.get(etat.ligne_id)
+            if before is None or (before.statut, before.retard_minutes) != (etat.statut, etat.retard_minutes):
+                self.hub.publish(etat_to_dict(etat))
+    
+    async def update_etat(
+        self,
+        ligne_id: str,
+        statut: StatutTrafic,
+        retard_minutes: int = 0,
+        message: str = ""
+    ) -> Optional[EtatTrafic]:
+        """
+        Met à jour immédiatement l'état du trafic d'une ligne (None si la ligne
+        n'existe pas). Un delta n'est publié que si le statut ou le retard change.
+        """
+        if not await self.ligne_repository.find_by_id(ligne_id):
+            return None
+        
+        etat = EtatTrafic(ligne_id, statut, retard_minutes, message)
+        # Plus récente que toute mise à jour du même flux, en attente ou en cours d'écriture
+        await self.buffer.write_now([etat])
+        return etat
+    
+    async def ingest(self, etats: List[EtatTrafic]) -> Tuple[int, List[str]]:
+        """
+        Accepte un lot du flux AVL : les états des lignes connues sont mis en
+        tampon (écriture différée), les lignes inconnues sont rejetées.
+        Retourne (nombre accepté, lignes rejetées).
+        """
+        known = await self.ligne_repository.existing_ids(etat.ligne_id for etat in etats)
+        accepted = self.buffer.submit(etat for etat in etats if etat.ligne_id in known)
+        return accepted, sorted({etat.ligne_id for etat in etats} - known)
+    
+    async def aclose(self):
+        """Écrit les mises à jour encore en attente"""
+        await self.buffer.aclose()
@@ -0,0 +1,35 @@
+"""
+Fixtures pytest partagées
+"""
+import pytest
+import pytest_asyncio
+from fastapi.testclient import TestClient
+
+from config.settings import settings
+from database import connection
+from main import app
+
+
+@pytest.fixture(autouse=True)
+def validate_responses(monkeypatch):
+    """Réponses validées contre leur schéma pendant les tests (désactivé en production)"""
+    monkeypatch.setattr(settings, "validate_responses", True)
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path, monkeypatch):
+    """Base SQLite (aiosqlite) initialisée et peuplée par init_db/seed_data"""
+    pytest.importorskip("aiosqlite")
+    monkeypatch.setattr(settings, "database_url", f"sqlite+aiosqlite:///{tmp_path / 'mobility.db'}")
+    await connection.init_db()
+    await connection.seed_data()
+    yield connection.get_session_factory()
+    await connection.close_db()
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """Application démarrée (lifespan) hors de l'arborescence du dépôt"""
+    monkeypatch.chdir(tmp_path)
+    with TestClient(app) as test_client:
+        yield test_client
@@ -0,0 +1,96 @@
+"""
+Tests unitaires pour les statistiques de disponibilité de la flotte
+"""
+from datetime import timedelta
+import asyncio
+
+import pytest
+
+from models.entities import Disponibilite
+from repositories.disponibilite_repository import DisponibiliteRepository
+from repositories.ligne_repository import LigneRepository
+from services.disponibilite_service import DisponibiliteService
+from services.disponibilite_stats import FlotteSnapshot, HistoriqueDisponibilite
+
+
+def test_snapshot_groups_by_type_and_weights_by_fleet():
+    """Test tranches par type, taux pondéré par la flotte, percentiles et seuil SLA"""
+    snapshot = FlotteSnapshot(
+        [
+            Disponibilite("a", 100, 90, 90.0),
+            Disponibilite("b", 10, 5, 50.0),
+            Disponibilite("c", 20, 18, 90.0),
+            Disponibilite("x", 4, 4, 100.0),
+        ],
+        {"a": "metro", "b": "bus", "c": "metro"},
+    )
+
+    assert snapshot.groupes == {"bus": (0, 1), "inconnu": (1, 2), "metro": (2, 4)}
+    assert snapshot.taux.dtype == "float64" and snapshot.total.dtype == "int64"
+    flotte = snapshot.stats()
+    assert (flotte["vehicules_total"], flotte["vehicules_en_service"]) == (134, 117)
+    assert flotte["taux_pondere"] == 87.31
+    assert flotte["taux_moyen"] == 82.5
+    assert snapshot.par_type()["metro"]["taux_pondere"] == 90.0
+    assert [snapshot.ligne_ids[i] for i in snapshot.sous_sla(95)] == ["b", "a", "c"]
+    # Percentiles par interpolation linéaire entre rangs voisins
+    assert (flotte["p10"], flotte["p50"], flotte["p90"]) == (62.0, 90.0, 97.0)
+    assert (snapshot.par_type()["metro"]["p10"], snapshot.par_type()["bus"]["p90"]) == (90.0, 50.0)
+    assert FlotteSnapshot([], {}).stats()["p50"] == 0.0
+
+
+def test_history_keeps_one_point_per_interval():
+    """Test l'historique remplace le point de l'intervalle courant et reste borné"""
+    historique = HistoriqueDisponibilite(taille=2, intervalle=60)
+    snapshot = FlotteSnapshot([Disponibilite("a", 10, 5, 50.0)], {"a": "bus"})
+    for secondes in (0, 30, 61, 130):
+        snapshot.timestamp = snapshot.timestamp + timedelta(seconds=secondes)
+        historique.enregistrer(snapshot)
+
+    assert len(historique) == 2
+    assert historique.depuis()[-1]["par_type"] == {"bus": 50.0}
+
+
+@pytest.mark.asyncio
+async def test_snapshot_is_rebuilt_only_on_new_version():
+    """Test l'instantané est mis en cache par version et alimente l'historique à chaque écriture"""
+    service = DisponibiliteService(DisponibiliteRepository(), LigneRepository(), historique=HistoriqueDisponibilite(intervalle=0))
+    premier = await service.get_snapshot()
+    assert await service.get_snapshot() is premier
+
+    await service.ingest([Disponibilite("2", 15, 3, 0.0)])
+    await service.buffer.flush()
+
+    assert await service.get_snapshot() is not premier
+    assert [p["par_type"]["metro"] for p in service.historique.depuis()] == [85.71, 60.0]
+
+
+@pytest.mark.asyncio
+async def test_history_is_sampled_without_new_writes():
+    """Test une flotte stable reçoit un point par intervalle : tendance plate, pas d'historique vide"""
+    service = DisponibiliteService(
+        DisponibiliteRepository(), LigneRepository(), historique=HistoriqueDisponibilite(intervalle=0.01)
+    )
+    premier = await service.get_snapshot()
+    await asyncio.sleep(0.05)
+    await service.aclose()
+
+    points = service.historique.depuis()
+    assert len(points) >= 2
+    assert {p["taux_pondere"] for p in points} == {premier.stats()["taux_pondere"]}
+    assert await service.get_snapshot() is premier
+
+
+def test_stats_endpoint(client):
+    """Test GET /disponibilite/stats : agrégats, SLA paramétrable et 304"""
+    response = client.get("/disponibilite/stats", params={"sla": 88})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["flotte"]["nombre_lignes"] == 4
+    assert set(body["par_type"]) == {"metro", "bus", "tramway"}
+    assert [ligne["ligne_id"] for ligne in body["sous_sla"]] == ["2", "4"]
+    assert len(body["historique"]) == 1 and body["tendance"] is None
+
+    cached = client.get("/disponibilite/stats", params={"sla": 88}, headers={"If-None-Match": response.headers["etag"]})
+    assert cached.status_code == 304
+    assert client.get("/disponibilite/stats", params={"sla": 120}).status_code == 422
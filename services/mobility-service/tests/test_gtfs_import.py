@@ -0,0 +1,156 @@
+"""
+Tests unitaires pour l'import GTFS
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+from config.settings import settings
+from database.gtfs_import import batched, gtfs_time, import_gtfs
+from repositories import timetable_store
+from repositories.sql import SqlHoraireRepository, SqlLigneRepository
+from repositories.timetable_store import TimetableStore
+from main import app
+
+
+def write_feed(path):
+    """Petit flux GTFS : une ligne existante (L1), une nouvelle (B99) avec deux courses"""
+    (path / "routes.txt").write_text(
+        "﻿route_id,route_short_name,route_long_name,route_type\n"
+        "r1,L1,Ligne 1 - Centre Nord,1\n"
+        "r99,B99,Port - Aéroport,3\n",
+        encoding="utf-8",
+    )
+    (path / "trips.txt").write_text(
+        "route_id,service_id,trip_id,trip_headsign\n"
+        "r99,semaine,t1,Aéroport\n"
+        "r99,semaine,t2,\n",
+        encoding="utf-8",
+    )
+    (path / "stops.txt").write_text(
+        "stop_id,stop_name,platform_code\n"
+        "s1,Port,2\n"
+        "s2,Centre,\n"
+        "s3,Aéroport,\n",
+        encoding="utf-8",
+    )
+    (path / "stop_times.txt").write_text(
+        "trip_id,arrival_time,departure_time,stop_id,stop_sequence\n"
+        "t1,07:00:00,07:00:00,s1,1\n"
+        "t1,07:10:00,07:11:00,s2,2\n"
+        "t1,07:30:00,07:30:00,s3,3\n"
+        "t2,24:40:00,24:40:00,s1,1\n"
+        "t2,25:05:00,25:05:00,s3,2\n",
+        encoding="utf-8",
+    )
+
+
+def test_helpers():
+    """Test heures GTFS au-delà de minuit et découpage en lots"""
+    assert gtfs_time("7:05:00") == "07:05"
+    assert gtfs_time("25:10:00") == "25:10"
+    assert [len(batch) for batch in batched(range(5), 2)] == [2, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_import_gtfs_streams_stop_times(session_factory, tmp_path):
+    """Test l'import crée les nouvelles lignes et un horaire par départ"""
+    write_feed(tmp_path)
+
+    stats = await import_gtfs(str(tmp_path), batch_size=2)
+
+    assert stats["lignes"] == 1
+    assert stats["horaires"] == 3
+    assert stats["horaires_par_seconde"] > 0
+
+    b99 = await SqlLigneRepository(session_factory).find_by_numero("B99")
+    assert (b99.terminus_debut, b99.terminus_fin) == ("Port", "Aéroport")
+
+    horaires = await SqlHoraireRepository(session_factory).find_by_ligne("B99")
+    assert [(h.heure_depart, h.heure_arrivee, h.station, h.destination, h.quai) for h in horaires] == [
+        ("07:00", "07:30", "Port", "Aéroport", "2"),
+        ("07:11", "07:30", "Centre", "Aéroport", ""),
+        ("24:40", "25:05", "Port", "Aéroport", "2"),
+    ]
+    # Course de nuit : après les courses de la journée, arrivée après le départ
+    nuit = horaires[-1]
+    assert (nuit.depart_minutes, nuit.arrivee_minutes) == (1480, 1505)
+    # L1 existait déjà : réutilisée, pas dupliquée
+    assert len(await SqlLigneRepository(session_factory).find_all()) == 5
+
+
+def test_precompile_timetable_from_gtfs(tmp_path):
+    """Test le fichier mappable se construit directement depuis un flux GTFS"""
+    write_feed(tmp_path)
+    output = str(tmp_path / "horaires.mtt")
+
+    timetable_store.main([output, "--from-gtfs", str(tmp_path)])
+
+    store = TimetableStore.open(output)
+    try:
+        assert len(store) == 3
+        assert [(h.heure_depart, h.ligne_id) for h in store.prochains("B99", "Port", 0, 5)] == [
+            ("07:00", "r99"),
+            ("24:40", "r99"),
+        ]
+        # Référentiel embarqué : toutes les lignes du flux, même sans course
+        assert {(l.id, l.numero, l.type_transport.value) for l in store.lignes_referentiel()} == {
+            ("r1", "L1", "metro"),
+            ("r99", "B99", "bus"),
+        }
+        assert store.horaires("L1") == []
+    finally:
+        store.close()
+
+
+@pytest.fixture
+def gtfs_client(tmp_path, monkeypatch):
+    """Application servant les horaires précompilés du petit flux GTFS"""
+    write_feed(tmp_path)
+    output = str(tmp_path / "horaires.mtt")
+    timetable_store.main([output, "--from-gtfs", str(tmp_path)])
+    monkeypatch.setattr(settings, "timetable_path", output)
+    monkeypatch.chdir(tmp_path)
+    with TestClient(app) as client:
+        yield client
+
+
+def test_precompiled_timetable_is_served(gtfs_client):
+    """Test les lignes d'un fichier compilé depuis GTFS sont servies par l'API (stockage mémoire)"""
+    response = gtfs_client.get("/horaires/B99")
+    assert response.status_code == 200
+    assert [h["heure_depart"] for h in response.json()["horaires"]] == ["07:00", "07:11", "24:40"]
+
+    response = gtfs_client.get("/horaires/B99/prochains", params={"station": "Port", "apres": "08:00"})
+    assert response.status_code == 200
+    assert [d["heure_depart"] for d in response.json()["departs"]] == ["24:40"]
+
+    # Référentiel du fichier, pas les lignes de démonstration
+    assert {(l["id"], l["numero"]) for l in gtfs_client.get("/lignes").json()} == {("r1", "L1"), ("r99", "B99")}
+    assert gtfs_client.get("/horaires/B15").status_code == 404
+    itineraire = gtfs_client.get("/itineraires", params={"depart": "Port", "arrivee": "Aéroport", "heure": "06:30"})
+    assert itineraire.status_code == 200
+
+
+def test_prochains_departs_after_midnight_of_service_day(gtfs_client):
+    """Test les départs après minuit du jour de service (24:xx) se cherchent au-delà de 24:00"""
+    response = gtfs_client.get("/horaires/B99/prochains", params={"station": "Port", "apres": "24:30"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["apres"] == "24:30"
+    assert [(d["heure_depart"], d["attente_minutes"]) for d in body["departs"]] == [("24:40", 10)]
+
+
+@pytest.mark.asyncio
+async def test_timetable_store_from_database_cursor(session_factory, tmp_path):
+    """Test le stockage en colonnes se construit sur le curseur de la table horaires"""
+    write_feed(tmp_path)
+    await import_gtfs(str(tmp_path))
+    repository = SqlHoraireRepository(session_factory)
+
+    store = await TimetableStore.build_async(repository.stream_by_numero(batch_size=2))
+
+    assert len(store) == len(await repository.find_all())
+    assert [h.heure_depart for h in store.horaires("L2")] == ["07:50", "08:20"]
+    b99 = await SqlLigneRepository(session_factory).find_by_numero("B99")
+    assert {h.ligne_id for h in store.horaires("B99")} == {b99.id}
@@ -0,0 +1,295 @@
+"""
+Tests unitaires pour les repositories (mémoire et SQL asynchrone)
+"""
+import pytest
+
+from config.settings import settings
+from database import connection
+from models.entities import Disponibilite, EtatTrafic, Ligne, StatutTrafic, TypeTransport, heure_to_minutes
+from repositories.base_repository import BatchOperationError, DuplicateKeyError
+from repositories.horaire_repository import HoraireRepository
+from repositories.ligne_repository import LigneRepository
+from repositories.sql import (
+    SqlDisponibiliteRepository,
+    SqlHoraireRepository,
+    SqlLigneRepository,
+    SqlTraficRepository,
+)
+
+
+def test_async_database_url_forces_asyncpg():
+    """Test les URL postgresql:// utilisent le driver asyncpg"""
+    assert connection.async_database_url("postgresql://u:p@db:5432/m") == "postgresql+asyncpg://u:p@db:5432/m"
+    assert connection.async_database_url("sqlite+aiosqlite:///x.db") == "sqlite+aiosqlite:///x.db"
+
+
+def test_pool_size_is_shared_between_workers(monkeypatch):
+    """Test le budget de connexions est réparti entre les workers uvicorn"""
+    monkeypatch.setattr(settings, "db_max_connections", 20)
+    monkeypatch.setattr(settings, "workers", 4)
+    assert connection.pool_size_per_worker() == 5
+
+    monkeypatch.setattr(settings, "workers", 40)
+    assert connection.pool_size_per_worker() == 1
+
+
+@pytest.mark.asyncio
+async def test_memory_ligne_repository_crud():
+    """Test le CRUD asynchrone du repository en mémoire"""
+    repository = LigneRepository()
+
+    created = await repository.create(
+        Ligne("", "B42", "Bus 42", TypeTransport.BUS, "Port", "Aéroport")
+    )
+    assert (await repository.find_by_numero("B42")).id == created.id
+
+    assert await repository.delete(created.id) is True
+    assert await repository.find_by_id(created.id) is None
+    assert await repository.delete(created.id) is False
+
+
+@pytest.mark.asyncio
+async def test_sql_ligne_repository_crud(session_factory):
+    """Test le CRUD du repository SQL sur les données initiales"""
+    repository = SqlLigneRepository(session_factory)
+
+    assert [ligne.numero for ligne in await repository.find_all()] == ["B15", "L1", "L2", "T1"]
+
+    created = await repository.create(
+        Ligne("", "B42", "Bus 42", TypeTransport.BUS, "Port", "Aéroport")
+    )
+    found = await repository.find_by_numero("B42")
+    assert found.id == created.id
+    assert found.type_transport is TypeTransport.BUS
+
+    created.actif = False
+    await repository.update(created.id, created)
+    assert (await repository.find_by_id(created.id)).actif is False
+
+    assert await repository.delete(created.id) is True
+    assert await repository.find_by_id(created.id) is None
+    assert await repository.update(created.id, created) is None
+
+
+@pytest.mark.asyncio
+async def test_sql_read_repositories(session_factory):
+    """Test horaires (jointure sur le numéro), trafic et disponibilité"""
+    l2 = await SqlLigneRepository(session_factory).find_by_numero("L2")
+
+    horaires = await SqlHoraireRepository(session_factory).find_by_ligne("L2")
+    assert [h.heure_depart for h in horaires] == ["07:50", "08:20"]
+    assert all(h.ligne_id == l2.id for h in horaires)
+
+    trafic = SqlTraficRepository(session_factory)
+    assert len(await trafic.find_all()) == 4
+    assert (await trafic.find_by_ligne(l2.id)).statut is StatutTrafic.RETARD
+    assert (await trafic.find_by_ligne("inconnue")).statut is StatutTrafic.NORMAL
+
+    disponibilite = await SqlDisponibiliteRepository(session_factory).find_by_ligne(l2.id)
+    assert disponibilite.taux_disponibilite == 80.0
+
+
+@pytest.mark.asyncio
+async def test_memory_ligne_indexes_follow_writes():
+    """Test les index numéro/type restent cohérents après create/update/delete"""
+    repository = LigneRepository()
+    ligne = await repository.create(Ligne("", "B42", "Bus 42", TypeTransport.BUS, "Port", "Aéroport"))
+
+    with pytest.raises(DuplicateKeyError):
+        await repository.create(Ligne("", "B42", "Doublon", TypeTransport.BUS, "A", "B"))
+
+    # Renumérotation et changement de type (entité modifiée hors du repository)
+    ligne.numero = "T42"
+    ligne.type_transport = TypeTransport.TRAMWAY
+    await repository.update(ligne.id, ligne)
+    assert await repository.find_by_numero("B42") is None
+    assert (await repository.find_by_numero("T42")).id == ligne.id
+    assert [l.numero for l in await repository.find_by_type(TypeTransport.BUS)] == ["B15"]
+    assert [l.numero for l in await repository.find_by_type(TypeTransport.TRAMWAY)] == ["T1", "T42"]
+
+    await repository.delete(ligne.id)
+    assert await repository.find_by_numero("T42") is None
+    assert [l.numero for l in await repository.find_by_type(TypeTransport.TRAMWAY)] == ["T1"]
+
+
+@pytest.mark.asyncio
+async def test_memory_ligne_update_rejects_taken_numero():
+    """Test une mise à jour vers un numéro existant est refusée"""
+    repository = LigneRepository()
+    l2 = await repository.find_by_numero("L2")
+    l2.numero = "L1"
+
+    with pytest.raises(DuplicateKeyError):
+        await repository.update(l2.id, l2)
+    assert (await repository.find_by_numero("L1")).id == "1"
+
+
+@pytest.mark.asyncio
+async def test_sql_ligne_numero_is_unique(session_factory):
+    """Test l'index unique SQL est traduit en DuplicateKeyError"""
+    repository = SqlLigneRepository(session_factory)
+
+    with pytest.raises(DuplicateKeyError):
+        await repository.create(Ligne("", "L1", "Doublon", TypeTransport.METRO, "A", "B"))
+    assert [l.numero for l in await repository.find_by_type(TypeTransport.METRO)] == ["L1", "L2"]
+
+
+@pytest.mark.asyncio
+async def test_memory_prochains_departs_bisect():
+    """Test les prochains départs d'une station (borne incluse, limite)"""
+    repository = HoraireRepository()
+
+    departs = await repository.find_prochains("L1", "Gare Centrale", heure_to_minutes("08:00"), 5)
+    assert [h.heure_depart for h in departs] == ["08:00", "08:15"]
+
+    departs = await repository.find_prochains("L1", "Gare Centrale", heure_to_minutes("08:01"), 1)
+    assert [h.heure_depart for h in departs] == ["08:15"]
+
+    assert await repository.find_prochains("L1", "Gare Centrale", heure_to_minutes("09:00"), 5) == []
+    assert await repository.find_prochains("L1", "Inconnue", 0, 5) == []
+
+
+@pytest.mark.asyncio
+async def test_sql_prochains_departs(session_factory):
+    """Test les prochains départs en SQL (comparaison HH:MM ordonnée)"""
+    repository = SqlHoraireRepository(session_factory)
+
+    departs = await repository.find_prochains("L2", "Gare Est", heure_to_minutes("08:00"), 5)
+    assert [h.heure_depart for h in departs] == ["08:20"]
+    assert departs[0].depart_minutes == 500
+
+
+@pytest.mark.asyncio
+async def test_memory_ligne_keyset_pagination():
+    """Test pages successives par curseur, filtres et tri sur l'id"""
+    repository = LigneRepository()
+
+    page = await repository.find_page(limite=2)
+    assert [l.numero for l in page] == ["B15", "L1"]
+    page = await repository.find_page(apres=page[-1].numero, limite=2)
+    assert [l.numero for l in page] == ["L2", "T1"]
+    assert await repository.find_page(apres="T1", limite=2) == []
+
+    assert [l.numero for l in await repository.find_page(type_transport=TypeTransport.METRO)] == ["L1", "L2"]
+    assert [l.id for l in await repository.find_page(tri="id", apres="2")] == ["3", "4"]
+
+    l2 = await repository.find_by_numero("L2")
+    l2.actif = False
+    await repository.update(l2.id, l2)
+    assert [l.numero for l in await repository.find_page(actif=False)] == ["L2"]
+
+
+@pytest.mark.asyncio
+async def test_sql_ligne_keyset_pagination(session_factory):
+    """Test filtres et curseur poussés dans la requête SQL"""
+    repository = SqlLigneRepository(session_factory)
+
+    assert [l.numero for l in await repository.find_page(apres="B15", limite=2)] == ["L1", "L2"]
+    assert [l.numero for l in await repository.find_page(type_transport=TypeTransport.METRO, apres="L1")] == ["L2"]
+    assert await repository.find_page(actif=False) == []
+
+
+@pytest.mark.asyncio
+async def test_sql_table_version_changes_on_write(session_factory):
+    """Test le jeton de version SQL suit les écritures (partagé entre workers)"""
+    repository = SqlLigneRepository(session_factory)
+    before, _ = await repository.get_version()
+    assert before == (await repository.get_version())[0]
+
+    await repository.create(Ligne("", "B42", "Bus 42", TypeTransport.BUS, "Port", "Aéroport"))
+
+    after, last_modified = await repository.get_version()
+    assert after != before
+    assert last_modified.tzinfo is not None
+
+
+@pytest.mark.asyncio
+async def test_sql_trafic_save_upserts_on_ligne(session_factory):
+    """Test l'upsert du trafic garde une ligne par ligne_id et retourne l'état précédent"""
+    repository = SqlTraficRepository(session_factory)
+    etat = (await repository.find_all())[0]
+    total = len(await repository.find_all())
+
+    previous = await repository.save(EtatTrafic(etat.ligne_id, StatutTrafic.ANNULE, 0, "Grève"))
+
+    assert (previous.statut, previous.retard_minutes) == (etat.statut, etat.retard_minutes)
+    assert (await repository.find_by_ligne(etat.ligne_id)).statut == StatutTrafic.ANNULE
+    assert len(await repository.find_all()) == total
+
+
+@pytest.mark.asyncio
+async def test_sql_disponibilite_save_many_upserts(session_factory):
+    """Test l'upsert par lot de la disponibilité (une ligne par ligne_id)"""
+    repository = SqlDisponibiliteRepository(session_factory)
+    existantes = await repository.find_all()
+    ligne_id = existantes[0].ligne_id
+
+    await repository.save_many([
+        Disponibilite(ligne_id, 12, 3, 0.0),
+        Disponibilite(ligne_id, 12, 6, 50.0),
+    ])
+
+    disponibilite = await repository.find_by_ligne(ligne_id)
+    assert (disponibilite.vehicules_en_service, disponibilite.taux_disponibilite) == (6, 50.0)
+    assert len(await repository.find_all()) == len(existantes)
+
+
+@pytest.mark.asyncio
+async def test_memory_ligne_apply_batch_is_all_or_nothing():
+    """Test un lot est appliqué en entier (une version) ou pas du tout"""
+    repository = LigneRepository()
+    l1 = await repository.find_by_numero("L1")
+    version = await repository.get_version()
+
+    # Numéro libéré puis repris dans le même lot
+    await repository.apply_batch([
+        ("delete", l1),
+        ("create", Ligne("", "L1", "Métro 1 bis", TypeTransport.METRO, "A", "B")),
+    ])
+    assert await repository.get_version() != version
+    recree = await repository.find_by_numero("L1")
+    assert recree.id != l1.id and recree.nom == "Métro 1 bis"
+    assert await repository.find_by_id(l1.id) is None
+
+    lignes = await repository.find_all()
+    creations = [
+        ("create", Ligne("", "B42", "Bus 42", TypeTransport.BUS, "Port", "Aéroport")),
+        ("create", Ligne("", "B42", "Doublon", TypeTransport.BUS, "A", "B")),
+    ]
+    with pytest.raises(BatchOperationError) as exc_info:
+        await repository.apply_batch(creations)
+    assert exc_info.value.index == 1
+    # Lot refusé : les entités fournies ne sont pas modifiées
+    assert [ligne.id for _, ligne in creations] == ["", ""]
+    assert isinstance(exc_info.value.error, DuplicateKeyError)
+    assert await repository.find_by_numero("B42") is None
+    assert len(await repository.find_all()) == len(lignes)
+
+
+@pytest.mark.asyncio
+async def test_sql_ligne_apply_batch_rolls_back(session_factory):
+    """Test un lot SQL en une transaction : tout validé ou tout annulé"""
+    repository = SqlLigneRepository(session_factory)
+    t1 = await repository.find_by_numero("T1")
+
+    b42 = Ligne("", "B42", "Bus 42", TypeTransport.BUS, "Port", "Aéroport")
+    with pytest.raises(BatchOperationError) as exc_info:
+        await repository.apply_batch([
+            ("create", b42),
+            ("delete", t1),
+            ("create", Ligne("", "L2", "Doublon", TypeTransport.METRO, "A", "B")),
+        ])
+    assert exc_info.value.index == 2
+    assert b42.id == ""
+    assert isinstance(exc_info.value.error, DuplicateKeyError)
+    assert await repository.find_by_numero("B42") is None
+    assert (await repository.find_by_id(t1.id)) is not None
+
+    t1.nom = "Tramway 1 prolongé"
+    appliquees = await repository.apply_batch([
+        ("create", Ligne("", "B42", "Bus 42", TypeTransport.BUS, "Port", "Aéroport")),
+        ("update", t1),
+    ])
+    assert appliquees[0].id
+    assert (await repository.find_by_numero("B42")).id == appliquees[0].id
+    assert (await repository.find_by_id(t1.id)).nom == "Tramway 1 prolongé"
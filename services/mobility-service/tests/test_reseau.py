@@ -0,0 +1,89 @@
+"""
+Tests unitaires pour le graphe du réseau et la recherche d'itinéraires
+"""
+import pytest
+
+from models.entities import EtatTrafic, Horaire, StatutTrafic
+from repositories.horaire_repository import HoraireRepository
+from repositories.ligne_repository import LigneRepository
+from repositories.timetable_store import TimetableStore
+from repositories.trafic_repository import TraficRepository
+from services.itineraire_service import ItineraireService
+from services.reseau import ReseauGraph
+
+# A -> B (ligne 1), B -> C (ligne 2), A -> C direct mais plus lent (ligne 3)
+HORAIRES = [
+    ("L1", Horaire("h1", "1", "B", "08:00", "08:10", "A", "1")),
+    ("L1", Horaire("h2", "1", "B", "08:20", "08:30", "A", "1")),
+    ("L2", Horaire("h3", "2", "C", "08:12", "08:20", "B", "2")),
+    ("L2", Horaire("h4", "2", "C", "08:32", "08:40", "B", "2")),
+    ("B15", Horaire("h5", "3", "C", "08:05", "08:35", "A", "3")),
+]
+
+
+def _service(trafic=None):
+    repository = HoraireRepository(TimetableStore.build(HORAIRES))
+    return ItineraireService(repository, LigneRepository(), trafic or TraficRepository())
+
+
+def test_connection_scan_earliest_arrival():
+    """Test la correspondance A -> B -> C bat le direct, et l'heure de départ est respectée"""
+    graph = ReseauGraph()
+    graph.update(h for _, h in HORAIRES)
+    vue = graph.vue({}, set())
+    a, c = graph.stations["A"], graph.stations["C"]
+
+    assert [vue.horaires[i].id for i in vue.arrivee_au_plus_tot(a, c, 7 * 60)] == ["h1", "h3"]
+    assert [vue.horaires[i].id for i in vue.arrivee_au_plus_tot(a, c, 8 * 60 + 1)] == ["h5"]
+    assert vue.arrivee_au_plus_tot(c, a, 7 * 60) is None
+
+
+def test_graph_update_rebuilds_only_changed_lines():
+    """Test seules les lignes modifiées ou supprimées sont reconstruites"""
+    graph = ReseauGraph()
+    assert graph.update(h for _, h in HORAIRES) == {"1", "2", "3"}
+    assert graph.update(h for _, h in HORAIRES) == set()
+
+    modifies = [h for _, h in HORAIRES if h.ligne_id != "3"]
+    modifies.append(Horaire("h6", "2", "C", "08:50", "09:00", "B", "2"))
+    assert graph.update(modifies) == {"2", "3"}
+    assert graph.lignes == {"1", "2"}
+
+
+@pytest.mark.asyncio
+async def test_itineraire_applies_trafic_delays():
+    """Test un retard fait manquer la correspondance ; une ligne annulée est évitée"""
+    trafic = TraficRepository()
+    service = _service(trafic)
+
+    # Ligne 2 en retard de 5 min (données mockées) : la correspondance tient encore
+    etapes = await service.rechercher("A", "C", 7 * 60)
+    assert [(e.horaire.id, e.arrivee, e.retard_minutes) for e in etapes] == [("h1", 490, 0), ("h3", 505, 5)]
+
+    await trafic.save(EtatTrafic("1", StatutTrafic.RETARD, 10, ""))
+    etapes = await service.rechercher("A", "C", 7 * 60)
+    assert [e.horaire.id for e in etapes] == ["h5"]
+
+    await trafic.save(EtatTrafic("3", StatutTrafic.ANNULE, 0, ""))
+    etapes = await service.rechercher("A", "C", 7 * 60)
+    assert [(e.horaire.id, e.arrivee) for e in etapes] == [("h1", 500), ("h4", 525)]
+    assert await service.rechercher("A", "inconnue", 7 * 60) is None
+
+
+def test_itineraires_endpoint(client):
+    """Test GET /itineraires sur les horaires mockés : trajet, 404 et ETag"""
+    response = client.get("/itineraires", params={"depart": "Gare Centrale", "arrivee": "Banlieue Nord", "heure": "08:05"})
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["heure_arrivee"], body["duree_minutes"], body["correspondances"]) == ("08:40", 35, 0)
+    assert body["etapes"][0]["horaire_id"] == "h2"
+
+    cached = client.get(
+        "/itineraires",
+        params={"depart": "Gare Centrale", "arrivee": "Banlieue Nord", "heure": "08:05"},
+        headers={"If-None-Match": response.headers["etag"]}
+    )
+    assert cached.status_code == 304
+
+    assert client.get("/itineraires", params={"depart": "Gare Centrale", "arrivee": "Atlantide"}).status_code == 404
+    assert client.get("/itineraires", params={"depart": "Gare Est", "arrivee": "Gare Centrale", "heure": "07:00"}).status_code == 404
@@ -0,0 +1,377 @@
+"""
+Tests unitaires pour les services et le conteneur de dépendances
+"""
+import pytest
+
+from services.container import ServiceContainer
+
+
+def test_container_shares_ligne_repository():
+    """Test LigneService et HoraireService partagent le même repository"""
+    container = ServiceContainer()
+    assert container.horaire_service.ligne_repository is container.ligne_service.repository
+
+
+def test_deleted_ligne_is_invisible_to_horaires(client):
+    """Test une ligne supprimée via /lignes n'a plus d'horaires"""
+    assert client.get("/horaires/L1").status_code == 200
+
+    l1 = next(ligne for ligne in client.get("/lignes").json() if ligne["numero"] == "L1")
+    assert client.delete(f"/lignes/{l1['id']}").status_code == 204
+
+    assert client.get("/horaires/L1").status_code == 404
+
+
+def test_container_is_built_once_per_application(client):
+    """Test les routes reçoivent les services du conteneur du lifespan"""
+    container = client.app.state.container
+    created = client.post("/lignes", json={
+        "numero": "B42",
+        "nom": "Bus 42",
+        "type_transport": "bus",
+        "terminus_debut": "Port",
+        "terminus_fin": "Aéroport",
+    }).json()
+
+    assert created["id"] in container.ligne_repository._storage
+
+
+def test_duplicate_numero_returns_conflict(client):
+    """Test POST /lignes avec un numéro existant -> 409, filtre par type"""
+    response = client.post("/lignes", json={
+        "numero": "L1",
+        "nom": "Doublon",
+        "type_transport": "metro",
+        "terminus_debut": "A",
+        "terminus_fin": "B",
+    })
+    assert response.status_code == 409
+
+    metros = client.get("/lignes", params={"type_transport": "metro"}).json()
+    assert sorted(ligne["numero"] for ligne in metros) == ["L1", "L2"]
+
+
+def test_prochains_departs_endpoint(client):
+    """Test GET /horaires/{ligne}/prochains avec temps d'attente"""
+    response = client.get("/horaires/L1/prochains", params={"station": "Gare Centrale", "apres": "08:05"})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["apres"] == "08:05"
+    assert [(d["heure_depart"], d["attente_minutes"]) for d in body["departs"]] == [("08:15", 10)]
+
+    assert client.get("/horaires/X9/prochains", params={"station": "Port"}).status_code == 404
+    assert client.get("/horaires/L1/prochains", params={"station": "Port", "apres": "48:00"}).status_code == 422
+
+
+def test_lignes_pagination_and_fields(client):
+    """Test GET /lignes paginé par curseur avec sélection de champs"""
+    first = client.get("/lignes", params={"limite": 3, "fields": "numero,nom"})
+    assert [ligne["numero"] for ligne in first.json()] == ["B15", "L1", "L2"]
+    assert set(first.json()[0]) == {"numero", "nom"}
+    assert 'rel="next"' in first.headers["link"]
+
+    second = client.get("/lignes", params={"limite": 3, "curseur": first.headers["x-next-cursor"]})
+    assert [ligne["numero"] for ligne in second.json()] == ["T1"]
+    assert "x-next-cursor" not in second.headers
+
+    assert client.get("/lignes", params={"fields": "numero,prix"}).status_code == 400
+    assert client.get("/lignes", params={"tri": "id", "curseur": first.headers["x-next-cursor"]}).status_code == 400
+
+
+def test_conditional_get_returns_not_modified(client):
+    """Test If-None-Match / If-Modified-Since -> 304, invalidé par une écriture"""
+    for path in ("/lignes", "/horaires/L1", "/trafic", "/disponibilite"):
+        first = client.get(path)
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+
+        cached = client.get(path, headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["etag"] == etag
+
+        since = client.get(path, headers={"If-Modified-Since": first.headers["last-modified"]})
+        assert since.status_code == 304
+
+    etag = client.get("/lignes").headers["etag"]
+    l1 = next(ligne for ligne in client.get("/lignes").json() if ligne["numero"] == "L1")
+    client.put(f"/lignes/{l1['id']}", json={"nom": "Ligne 1 - Renommée"})
+
+    refreshed = client.get("/lignes", headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["etag"] != etag
+
+    # L'ETag dépend de la représentation : filtres, page et champs
+    etags = {
+        client.get("/lignes", params=params).headers["etag"]
+        for params in ({}, {"type_transport": "metro"}, {"limite": 2}, {"fields": "id,numero"})
+    }
+    assert len(etags) == 4
+    assert client.get("/lignes", params={"fields": "numero,id"}).headers["etag"] in etags
+
+
+def test_trafic_hub_evicts_slow_subscriber():
+    """Test un abonné dont la file est pleine est évincé sans bloquer la publication"""
+    from services.trafic_hub import EVICTED, TraficHub
+
+    hub = TraficHub(queue_size=2)
+    lent, rapide = hub.subscribe(), hub.subscribe()
+    for retard in range(3):
+        hub.publish({"ligne_id": "1", "retard_minutes": retard})
+        if retard < 2:
+            rapide.queue.get_nowait()
+
+    assert lent.evicted and lent.queue.get_nowait() == EVICTED
+    assert not rapide.evicted
+    assert hub.snapshot() == {"subscribers": 1, "published": 3, "delivered": 5, "evicted": 1}
+
+
+def test_trafic_update_streams_only_changes(client):
+    """Test PUT /trafic publie un delta sur le WebSocket seulement si statut ou retard change"""
+    l1 = next(ligne for ligne in client.get("/lignes").json() if ligne["numero"] == "L1")
+    update = {"statut": "retard", "retard_minutes": 4, "message": "Incident"}
+
+    with client.websocket_connect("/trafic/ws") as ws:
+        assert ws.receive_json()["event"] == "snapshot"
+        assert client.put(f"/trafic/{l1['id']}", json=update).status_code == 200
+        # Même statut et même retard : pas de delta ; puis retour à la normale
+        client.put(f"/trafic/{l1['id']}", json={**update, "message": "Incident en cours"})
+        client.put(f"/trafic/{l1['id']}", json={"statut": "normal"})
+
+        first, second = ws.receive_json(), ws.receive_json()
+        assert first["event"] == "trafic"
+        assert (first["data"]["ligne_id"], first["data"]["retard_minutes"]) == (l1["id"], 4)
+        assert (second["data"]["statut"], second["data"]["retard_minutes"]) == ("normal", 0)
+
+    assert client.get("/trafic/streams").json()["published"] == 2
+    assert client.put("/trafic/inconnue", json=update).status_code == 404
+    assert client.put(f"/trafic/{l1['id']}", json={"statut": "inconnu"}).status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_ingestion_coalesces_updates_until_flush():
+    """Test les lots sont fusionnés par ligne et écrits en une fois, taux recalculé"""
+    from models.entities import Disponibilite, EtatTrafic, StatutTrafic
+    from repositories.disponibilite_repository import DisponibiliteRepository
+    from repositories.ligne_repository import LigneRepository
+    from repositories.trafic_repository import TraficRepository
+    from services.disponibilite_service import DisponibiliteService, taux_disponibilite
+    from services.trafic_hub import TraficHub
+    from services.trafic_service import TraficService
+
+    lignes = LigneRepository()
+    disponibilites = DisponibiliteService(DisponibiliteRepository(), lignes, flush_interval=60)
+    accepted, rejected = await disponibilites.ingest([
+        Disponibilite("1", 20, 10, 0.0),
+        Disponibilite("1", 20, 15, 0.0),
+        Disponibilite("4", 8, 7, 0.0),
+        Disponibilite("inconnue", 5, 5, 0.0),
+    ])
+    assert (accepted, rejected, len(disponibilites.buffer)) == (3, ["inconnue"], 2)
+    assert (await disponibilites.repository.find_by_ligne("1")).vehicules_en_service == 18
+
+    assert await disponibilites.buffer.flush() == 2
+    assert (await disponibilites.repository.find_by_ligne("1")).taux_disponibilite == 75.0
+    assert taux_disponibilite([8, 0], [7, 0]).tolist() == [87.5, 0.0]
+
+    hub = TraficHub()
+    subscriber = hub.subscribe()
+    trafic = TraficService(TraficRepository(), lignes, hub, flush_interval=60)
+    await trafic.ingest([
+        EtatTrafic("2", StatutTrafic.RETARD, 3, ""),
+        EtatTrafic("2", StatutTrafic.RETARD, 6, ""),
+        EtatTrafic("3", StatutTrafic.NORMAL, 0, ""),
+    ])
+    await trafic.aclose()
+    # Ligne 3 inchangée : un seul delta, avec la dernière valeur de la ligne 2
+    assert subscriber.queue.qsize() == 1
+    assert '"retard_minutes": 6' in subscriber.queue.get_nowait()
+
+
+@pytest.mark.asyncio
+async def test_direct_trafic_update_waits_for_running_flush():
+    """Test une mise à jour directe n'est pas écrasée par un vidage du flux déjà en cours"""
+    import asyncio
+    from models.entities import EtatTrafic, StatutTrafic
+    from repositories.ligne_repository import LigneRepository
+    from repositories.trafic_repository import TraficRepository
+    from services.trafic_hub import TraficHub
+    from services.trafic_service import TraficService
+
+    class SlowTraficRepository(TraficRepository):
+        """Écriture qui rend la main (comme un upsert SQL), la première plus lente"""
+        delais = [0.02, 0]
+        async def save_many(self, etats):
+            await asyncio.sleep(self.delais.pop(0) if self.delais else 0)
+            return await super().save_many(etats)
+
+    trafic = TraficService(SlowTraficRepository(), LigneRepository(), TraficHub(), flush_interval=60)
+    trafic.buffer.submit([EtatTrafic("2", StatutTrafic.RETARD, 3, "")])
+    flush = asyncio.create_task(trafic.buffer.flush())
+    await asyncio.sleep(0)
+
+    await trafic.update_etat("2", StatutTrafic.ANNULE)
+    await flush
+
+    assert (await trafic.repository.find_by_ligne("2")).statut == StatutTrafic.ANNULE
+    await trafic.aclose()
+
+
+def test_batch_endpoints_validate_and_accept(client):
+    """Test POST /trafic/batch et /disponibilite/batch -> 202, lignes inconnues rejetées"""
+    response = client.post("/trafic/batch", json={"updates": [
+        {"ligne_id": "1", "statut": "perturbe", "retard_minutes": 2},
+        {"ligne_id": "x", "statut": "normal"},
+    ]})
+    assert response.status_code == 202
+    assert response.json() == {"acceptees": 1, "rejetees": ["x"], "en_attente": 1}
+
+    response = client.post("/disponibilite/batch", json={"updates": [
+        {"ligne_id": "2", "vehicules_total": 10, "vehicules_en_service": 11},
+    ]})
+    assert response.status_code == 422
+    assert client.post("/disponibilite/batch", json={"updates": []}).status_code == 422
+
+
+def test_startup_is_lazy(client, tmp_path):
+    """Test le démarrage n'écrit pas openapi.yaml et ne construit que le nécessaire"""
+    container = client.app.state.container
+    assert not (tmp_path / "openapi.yaml").exists()
+    assert "disponibilite_service" not in container.__dict__
+
+    assert client.get("/disponibilite").status_code == 200
+    assert "disponibilite_service" in container.__dict__
+
+
+def test_openapi_export_cli(tmp_path):
+    """Test l'export OpenAPI au build"""
+    from utils.openapi_export import export_openapi
+
+    schema = export_openapi(str(tmp_path / "openapi.yaml"))
+    assert "/itineraires" in schema["paths"]
+    assert (tmp_path / "openapi.yaml").read_text(encoding="utf-8").startswith("components:")
+
+
+def test_lignes_bulk_is_atomic(client):
+    """Test POST /lignes/bulk : lot mixte appliqué, lot en échec annulé en entier"""
+    l1 = next(ligne for ligne in client.get("/lignes").json() if ligne["numero"] == "L1")
+    nouvelle = {"numero": "B42", "nom": "Bus 42", "type_transport": "bus", "terminus_debut": "Port", "terminus_fin": "Aéroport"}
+
+    response = client.post("/lignes/bulk", json={"operations": [
+        {"op": "create", "ligne": nouvelle},
+        {"op": "update", "id": l1["id"], "ligne": {"actif": False}},
+    ]})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["applique"] is True
+    assert [r["statut"] for r in body["resultats"]] == [201, 200]
+    assert body["resultats"][0]["ligne"]["numero"] == "B42"
+    assert body["resultats"][1]["ligne"]["actif"] is False
+
+    total = len(client.get("/lignes").json())
+    response = client.post("/lignes/bulk", json={"operations": [
+        {"op": "delete", "id": l1["id"]},
+        {"op": "create", "ligne": {**nouvelle, "nom": "Doublon"}},
+    ]})
+    assert response.status_code == 409
+    assert [r["statut"] for r in response.json()["resultats"]] == [424, 409]
+    assert len(client.get("/lignes").json()) == total
+
+    response = client.post("/lignes/bulk", json={"operations": [{"op": "delete", "id": "inconnue"}]})
+    assert response.status_code == 404
+
+
+def test_lignes_bulk_idempotency_key(client):
+    """Test un nouvel essai avec la même clé rejoue la réponse sans réappliquer"""
+    lot = {"operations": [{"op": "create", "ligne": {
+        "numero": "B42", "nom": "Bus 42", "type_transport": "bus", "terminus_debut": "Port", "terminus_fin": "Aéroport",
+    }}]}
+    headers = {"Idempotency-Key": "lot-1"}
+
+    first = client.post("/lignes/bulk", json=lot, headers=headers)
+    assert first.status_code == 200
+    assert "Idempotent-Replayed" not in first.headers
+
+    replay = client.post("/lignes/bulk", json=lot, headers=headers)
+    assert replay.status_code == 200
+    assert replay.headers["Idempotent-Replayed"] == "true"
+    assert replay.json() == first.json()
+
+    # Sans clé, le même lot est réellement rejoué : numéro déjà pris
+    assert client.post("/lignes/bulk", json=lot).status_code == 409
+
+    lot["operations"][0]["ligne"]["numero"] = "B43"
+    assert client.post("/lignes/bulk", json=lot, headers=headers).status_code == 422
+
+
+def test_json_response_validates_only_when_enabled(monkeypatch):
+    """Test la réponse encodée en octets n'est validée qu'avec VALIDATE_RESPONSES"""
+    from pydantic import ValidationError
+    from config.settings import settings
+    from models.entities import EtatTrafic, StatutTrafic
+    from routes.trafic import TRAFIC_ENCODER
+    from schemas.trafic import TraficItem
+    from utils.serialization import json_response
+
+    etat = EtatTrafic("1", StatutTrafic.RETARD, 5)
+    assert not hasattr(etat, "__dict__")
+    item = TRAFIC_ENCODER(etat)
+    assert item["statut"] == "retard" and item["retard_minutes"] == 5
+
+    monkeypatch.setattr(settings, "validate_responses", True)
+    with pytest.raises(ValidationError):
+        json_response({**item, "retard_minutes": "cinq"}, TraficItem)
+
+    monkeypatch.setattr(settings, "validate_responses", False)
+    response = json_response({**item, "retard_minutes": "cinq"}, TraficItem)
+    assert response.media_type == "application/json"
+    assert b'"retard_minutes":"cinq"' in response.body
+
+
+def test_serialization_benchmark_paths_agree():
+    """Test le micro-benchmark : les deux chemins produisent le même JSON"""
+    from utils.serialization_benchmark import benchmark
+
+    resultats = benchmark(items=50, repeat=1)
+    assert set(resultats) == {"lignes", "horaires", "trafic", "disponibilite"}
+    assert all(r["avant"] > 0 and r["apres"] > 0 for r in resultats.values())
+
+
+@pytest.mark.asyncio
+async def test_idempotency_key_serializes_retries_after_failure():
+    """Test trois requêtes concurrentes, la première en échec : jamais deux appels simultanés, puis rejeu"""
+    import asyncio
+    from utils.idempotency import IdempotencyCache
+
+    cache = IdempotencyCache()
+    loop = asyncio.get_running_loop()
+    tasks = []
+    calls = 0
+    running = 0
+
+    def request():
+        tasks.append(asyncio.ensure_future(cache.run("cle", "empreinte", call)))
+
+    async def call():
+        nonlocal calls, running
+        calls += 1
+        running += 1
+        assert running == 1, "deux exécutions simultanées pour la même clé"
+        numero = calls
+        await asyncio.sleep(0.01)
+        running -= 1
+        if numero == 1:
+            # La troisième requête arrive entre la libération du verrou et le réveil de la deuxième
+            loop.call_soon(request)
+        return (500, {}) if numero == 1 else (200, {"appel": numero})
+
+    request()
+    request()
+    await asyncio.sleep(0)
+    results = [await tasks[0], await tasks[1]]
+    results.append(await tasks[2])
+
+    assert [r for r, _ in results] == [(500, {}), (200, {"appel": 2}), (200, {"appel": 2})]
+    assert [replayed for _, replayed in results] == [False, False, True]
+    assert calls == 2
+    assert cache._inflight == {}
@@ -0,0 +1,62 @@
+"""
+Tests unitaires pour le stockage en colonnes des horaires
+"""
+import pytest
+
+from models.entities import Horaire, heure_to_minutes
+from repositories.horaire_repository import HoraireRepository
+from repositories.timetable_store import TimetableStore
+
+
+def test_build_interns_strings_and_slices_lines():
+    """Test chaînes partagées, colonnes uint16 et tranches contiguës par ligne"""
+    store = HoraireRepository().store
+
+    assert len(store) == 7
+    assert len(store.strings) == len(set(store.strings))
+    assert store.depart.typecode == "H" and store.depart.itemsize == 2
+    debut, fin = store.ligne_slice("L1")
+    assert fin - debut == 3
+    assert [h.id for h in store.horaires("L1")] == ["h1", "h2", "h3"]
+    assert store.ligne_slice("X9") == (0, 0)
+
+
+def test_saved_file_is_memory_mapped(tmp_path):
+    """Test le fichier précompilé relu par mmap donne les mêmes horaires"""
+    path = str(tmp_path / "horaires.mtt")
+    HoraireRepository().store.save(path)
+
+    store = TimetableStore.open(path)
+    try:
+        assert isinstance(store.depart, memoryview) and store.depart.readonly
+        assert [h.heure_depart for h in store.horaires("L2")] == ["07:50", "08:20"]
+        departs = store.prochains("L1", "Gare Centrale", heure_to_minutes("08:01"), 5)
+        assert [(h.id, h.quai, h.destination) for h in departs] == [("h2", "A", "Banlieue Nord")]
+    finally:
+        store.close()
+
+
+def test_open_rejects_foreign_file(tmp_path):
+    """Test un fichier qui n'est pas un stockage d'horaires est refusé"""
+    path = tmp_path / "autre.bin"
+    path.write_bytes(b"\0" * 64)
+
+    with pytest.raises(ValueError):
+        TimetableStore.open(str(path))
+
+
+def test_build_without_ordinal_ids_uses_position():
+    """Test les identifiants non numérotés reçoivent leur position d'origine"""
+    store = TimetableStore.build([
+        ("T1", Horaire("gtfs-b", "4", "Plage Sud", "09:10", "09:40", "Port", "1")),
+        ("T1", Horaire("gtfs-a", "4", "Plage Sud", "09:00", "09:30", "Port", "1")),
+    ])
+
+    assert [h.heure_depart for h in store.prochains("T1", "Port", 0, 5)] == ["09:00", "09:10"]
+    assert [h.id for h in store.horaires("T1")] == ["h1", "h2"]
+
+
+def test_empty_store_is_kept():
+    """Test un stockage vide fourni n'est pas remplacé par les données de démonstration"""
+    repository = HoraireRepository(TimetableStore.build([]))
+    assert len(repository.store) == 0
@@ -0,0 +1,49 @@
+"""
+Requêtes conditionnelles HTTP (ETag / Last-Modified / 304 Not Modified)
+Les écrans en gare interrogent le service toutes les quelques secondes alors
+que les données changent rarement : la version des repositories suffit à
+répondre 304 sans relire ni sérialiser les données.
+"""
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+import hashlib
+
+from fastapi import Request, Response
+
+def make_etag(*versions: str) -> str:
+    """ETag fort dérivé des jetons de version (et des paramètres de la représentation)"""
+    digest = hashlib.blake2b("|".join(versions).encode("utf-8"), digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+def cache_headers(etag: str, last_modified: datetime) -> dict:
+    """En-têtes de validation ; no-cache impose la revalidation à chaque requête"""
+    return {
+        "ETag": etag,
+        "Last-Modified": format_datetime(last_modified, usegmt=True),
+        "Cache-Control": "no-cache",
+    }
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """Comparaison faible If-None-Match (liste, W/ et * acceptés)"""
+    if header.strip() == "*":
+        return True
+    candidates = (candidate.strip() for candidate in header.split(","))
+    return etag in (candidate[2:] if candidate.startswith("W/") else candidate for candidate in candidates)
+
+def not_modified(request: Request, etag: str, last_modified: datetime) -> Optional[Response]:
+    """Réponse 304 si la représentation du client est à jour, sinon None"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        fresh = _etag_matches(if_none_match, etag)
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since is None:
+            return None
+        try:
+            fresh = last_modified <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return None
+    if not fresh:
+        return None
+    return Response(status_code=304, headers=cache_headers(etag, last_modified))
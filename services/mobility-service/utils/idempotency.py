@@ -0,0 +1,76 @@
+"""
+Clés d'idempotence (en-tête Idempotency-Key)
+
+Le résultat d'une requête réussie est conservé sous sa clé : un nouvel essai
+avec la même clé et le même contenu reçoit la réponse enregistrée sans rien
+réexécuter. Une requête concurrente avec la même clé attend la première.
+Le cache est propre au worker.
+"""
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+import asyncio
+import time
+
+# (code HTTP, corps JSON)
+Reponse = Tuple[int, object]
+
+class IdempotencyKeyReused(ValueError):
+    """Clé déjà utilisée pour une requête de contenu différent"""
+
+    def __init__(self, key: str):
+        super().__init__(f"Idempotency-Key '{key}' déjà utilisée pour une autre requête")
+        self.key = key
+
+class IdempotencyCache:
+    """Réponses réussies par clé, LRU borné avec expiration"""
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 86400.0):
+        self._max_entries = max_entries
+        self._ttl = ttl
+        # clé -> (empreinte du contenu, réponse, expiration)
+        self._entries: "OrderedDict[str, Tuple[str, Reponse, float]]" = OrderedDict()
+        # clé -> (verrou, nombre de requêtes qui le détiennent ou l'attendent)
+        self._inflight: Dict[str, Tuple[asyncio.Lock, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get(self, key: str, fingerprint: str) -> Optional[Reponse]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_fingerprint, reponse, expires = entry
+        if expires < time.monotonic():
+            del self._entries[key]
+            return None
+        if stored_fingerprint != fingerprint:
+            raise IdempotencyKeyReused(key)
+        self._entries.move_to_end(key)
+        return reponse
+
+    async def run(self, key: str, fingerprint: str, call: Callable[[], Awaitable[Reponse]]) -> Tuple[Reponse, bool]:
+        """
+        Exécute `call` une seule fois par clé. Retourne (réponse, rejouée).
+        Seules les réponses 2xx sont conservées : un échec peut être retenté.
+        """
+        lock, waiters = self._inflight.get(key) or (asyncio.Lock(), 0)
+        self._inflight[key] = (lock, waiters + 1)
+        try:
+            async with lock:
+                reponse = self._get(key, fingerprint)
+                if reponse is not None:
+                    return reponse, True
+                reponse = await call()
+                if 200 <= reponse[0] < 300:
+                    self._entries[key] = (fingerprint, reponse, time.monotonic() + self._ttl)
+                    while len(self._entries) > self._max_entries:
+                        self._entries.popitem(last=False)
+                return reponse, False
+        finally:
+            # Retiré seulement sans attente restante : après release(), locked()
+            # reste faux jusqu'au réveil du suivant, qui doit garder le même verrou
+            lock, waiters = self._inflight[key]
+            if waiters == 1:
+                del self._inflight[key]
+            else:
+                self._inflight[key] = (lock, waiters - 1)
@@ -0,0 +1,33 @@
+"""
+Export du schéma OpenAPI en YAML (étape de build)
+
+Le schéma est généré une fois, au build de l'image ou en CI, au lieu d'être
+réécrit par chaque worker au démarrage.
+
+Usage :
+    python -m utils.openapi_export [openapi.yaml]
+"""
+from typing import List, Optional
+import argparse
+
+def export_openapi(path: str = "openapi.yaml") -> dict:
+    """Écrit le schéma OpenAPI de l'application dans `path` et le retourne"""
+    import yaml
+    from main import app
+
+    schema = app.openapi()
+    with open(path, "w", encoding="utf-8") as f:
+        yaml.dump(schema, f, allow_unicode=True, default_flow_style=False)
+    return schema
+
+def main(argv: Optional[List[str]] = None):
+    """Ligne de commande"""
+    parser = argparse.ArgumentParser(description="Export du schéma OpenAPI du service Mobilité")
+    parser.add_argument("output", nargs="?", default="openapi.yaml", help="Fichier YAML de sortie")
+    args = parser.parse_args(argv)
+
+    schema = export_openapi(args.output)
+    print(f"✅ Documentation OpenAPI générée: {args.output} ({len(schema['paths'])} chemins)")
+
+if __name__ == "__main__":
+    main()
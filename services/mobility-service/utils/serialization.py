@@ -0,0 +1,90 @@
+"""
+Sérialisation JSON directe des entités du domaine
+
+Chemin par défaut de FastAPI pour une liste : chaque entité est recopiée dans
+un `*Item` Pydantic, puis la réponse entière est revalidée contre
+`response_model` et réencodée (jsonable_encoder, puis json.dumps). Ici chaque
+entité est projetée une seule fois sur les champs du schéma (attrgetter, sans
+objet intermédiaire) et la réponse est encodée directement en octets ; une
+`Response` retournée telle quelle n'est pas revalidée par FastAPI.
+
+Le schéma reste la source des champs exposés (et de la documentation
+OpenAPI) ; la validation de la réponse contre ce schéma est désactivée par
+défaut (production) et s'active en développement et en CI (`VALIDATE_RESPONSES=true`).
+"""
+from datetime import date, datetime
+from enum import Enum
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Iterable, List, Optional, Set, Type
+import json
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+from config.settings import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - encodeur de la bibliothèque standard
+    orjson = None
+
+def _default(value: Any):
+    """Types non natifs JSON (encodeur standard)"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Type non sérialisable en JSON: {type(value).__name__}")
+
+def dumps(payload: Any) -> bytes:
+    """Encode en JSON UTF-8 (orjson s'il est installé)"""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_PASSTHROUGH_DATACLASS, default=_default)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+class EntityEncoder:
+    """Projection d'une entité sur les champs d'un schéma de réponse"""
+
+    def __init__(self, model: Optional[Type[BaseModel]], fields: Optional[Iterable[str]] = None):
+        self.fields = tuple(fields if fields is not None else model.model_fields)
+        getter = attrgetter(*self.fields)
+        # attrgetter à un seul champ retourne la valeur, pas un tuple
+        self._values = getter if len(self.fields) > 1 else (lambda entity: (getter(entity),))
+
+    def __call__(self, entity: Any) -> dict:
+        return dict(zip(self.fields, self._values(entity)))
+
+    def many(self, entities: Iterable[Any]) -> List[dict]:
+        """Projection d'une liste d'entités"""
+        fields, values = self.fields, self._values
+        return [dict(zip(fields, values(entity))) for entity in entities]
+
+    def select(self, selected: Optional[Set[str]]) -> "EntityEncoder":
+        """Encodeur limité aux champs demandés (ordre du schéma conservé)"""
+        if selected is None:
+            return self
+        return EntityEncoder(None, [field for field in self.fields if field in selected])
+
+@lru_cache(maxsize=None)
+def _adapter(model: Any) -> TypeAdapter:
+    return TypeAdapter(model)
+
+def validation_active() -> bool:
+    """Validation des réponses contre leur schéma (VALIDATE_RESPONSES)"""
+    return settings.validate_responses
+
+def json_response(
+    payload: Any,
+    model: Any = None,
+    status_code: int = 200,
+    headers: Optional[dict] = None
+) -> Response:
+    """
+    Réponse JSON encodée directement en octets. Avec VALIDATE_RESPONSES, le
+    contenu est d'abord validé contre `model` (ValidationError -> 500, comme la
+    validation de `response_model`).
+    """
+    if model is not None and validation_active():
+        _adapter(model).validate_python(payload)
+    return Response(dumps(payload), status_code=status_code, headers=headers, media_type="application/json")
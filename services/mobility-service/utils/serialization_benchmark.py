@@ -0,0 +1,129 @@
+"""
+Micro-benchmark de la sérialisation des réponses de liste
+
+Coût par élément (µs) de deux chemins, sur des entités synthétiques :
+- avant : un `*Item` Pydantic par entité, puis le traitement de `response_model`
+  par FastAPI (model_dump, revalidation, dump JSON-compatible, json.dumps)
+- apres : projection EntityEncoder et encodage direct en octets, sans validation
+  (configuration de production)
+
+Usage :
+    python -m utils.serialization_benchmark [--items 5000] [--repeat 5]
+                                            [--min-speedup 2]
+Code de sortie 1 si un gain est inférieur à --min-speedup (suivi en CI).
+"""
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import argparse
+import json
+import sys
+import time
+
+from pydantic import TypeAdapter
+
+from models.entities import Disponibilite, EtatTrafic, Horaire, Ligne, StatutTrafic, TypeTransport, minutes_to_heure
+from schemas.disponibilite import DisponibiliteItem, DisponibiliteResponse
+from schemas.horaire import HoraireItem, HorairesResponse
+from schemas.ligne import LigneResponse
+from schemas.trafic import TraficItem, TraficResponse
+from utils.serialization import EntityEncoder, dumps
+
+def _lignes(n: int) -> List[Ligne]:
+    types = list(TypeTransport)
+    return [
+        Ligne(f"id-{i:06d}", f"N{i}", f"Ligne {i} - Centre", types[i % len(types)], "Gare Centrale", "Banlieue Nord")
+        for i in range(n)
+    ]
+
+def _horaires(n: int) -> List[Horaire]:
+    return [
+        Horaire(f"h{i}", "1", "Banlieue Nord", minutes_to_heure(i % 1400), minutes_to_heure(i % 1400 + 25), "Gare Centrale", "A")
+        for i in range(n)
+    ]
+
+def _trafic(n: int) -> List[EtatTrafic]:
+    statuts = list(StatutTrafic)
+    debut = datetime(2024, 3, 15, 8, 0)
+    return [
+        EtatTrafic(f"id-{i:06d}", statuts[i % len(statuts)], i % 10, "Incident technique" if i % 7 == 0 else "", debut + timedelta(seconds=i))
+        for i in range(n)
+    ]
+
+def _disponibilites(n: int) -> List[Disponibilite]:
+    debut = datetime(2024, 3, 15, 8, 0)
+    return [Disponibilite(f"id-{i:06d}", 20, 20 - i % 5, 100.0 - 5 * (i % 5), debut) for i in range(n)]
+
+# ressource -> (entités, item, réponse, champ de la liste, enveloppe) ; champ None : liste au premier niveau
+CAS: Dict[str, Tuple[Callable[[int], list], Any, Any, Optional[str], Callable[[int], dict]]] = {
+    "lignes": (_lignes, LigneResponse, List[LigneResponse], None, lambda n: {}),
+    "horaires": (_horaires, HoraireItem, HorairesResponse, "horaires", lambda n: {"ligne": "L1", "nombre_horaires": n}),
+    "trafic": (_trafic, TraficItem, TraficResponse, "trafic", lambda n: {"derniere_maj": datetime.now(), "nombre_lignes": n}),
+    "disponibilite": (
+        _disponibilites, DisponibiliteItem, DisponibiliteResponse, "disponibilites",
+        lambda n: {"timestamp": datetime.now(), "nombre_lignes": n}
+    ),
+}
+
+def avant(entites: list, item, reponse, champ: Optional[str], enveloppe: dict) -> bytes:
+    """Chemin d'origine : recopie en *Item puis traitement de response_model par FastAPI"""
+    fields = tuple(item.model_fields)
+    items = [item(**{field: getattr(e, field) for field in fields}) for e in entites]
+    adapter = TypeAdapter(reponse)
+    if champ is None:
+        contenu = [i.model_dump() for i in items]
+    else:
+        contenu = reponse(**enveloppe, **{champ: items}).model_dump()
+    donnees = adapter.dump_python(adapter.validate_python(contenu), mode="json")
+    return json.dumps(donnees, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+def apres(entites: list, item, champ: Optional[str], enveloppe: dict) -> bytes:
+    """Chemin direct : projection sur les champs du schéma et encodage en octets"""
+    elements = EntityEncoder(item).many(entites)
+    return dumps(elements if champ is None else {**enveloppe, champ: elements})
+
+def _par_element(call: Callable[[], bytes], n: int, repeat: int) -> float:
+    """Meilleur temps sur `repeat` essais, en µs par élément"""
+    meilleur = float("inf")
+    for _ in range(repeat):
+        debut = time.perf_counter()
+        call()
+        meilleur = min(meilleur, time.perf_counter() - debut)
+    return meilleur * 1e6 / n
+
+def benchmark(items: int = 5000, repeat: int = 5) -> Dict[str, Dict[str, float]]:
+    """µs par élément avant / après et gain, par ressource"""
+    resultats = {}
+    for nom, (fabrique, item, reponse, champ, enveloppe) in CAS.items():
+        entites = fabrique(items)
+        env = enveloppe(items)
+        # Même document JSON des deux côtés (à l'espacement près)
+        if json.loads(avant(entites, item, reponse, champ, env)) != json.loads(apres(entites, item, champ, env)):
+            raise RuntimeError(f"{nom} : les deux chemins ne produisent pas le même JSON")
+        cout_avant = _par_element(lambda: avant(entites, item, reponse, champ, env), items, repeat)
+        cout_apres = _par_element(lambda: apres(entites, item, champ, env), items, repeat)
+        resultats[nom] = {
+            "avant": round(cout_avant, 2),
+            "apres": round(cout_apres, 2),
+            "gain": round(cout_avant / cout_apres, 1),
+        }
+    return resultats
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Ligne de commande"""
+    parser = argparse.ArgumentParser(description="Coût par élément de la sérialisation des listes")
+    parser.add_argument("--items", type=int, default=5000, help="Éléments par réponse")
+    parser.add_argument("--repeat", type=int, default=5, help="Essais par chemin (meilleur retenu)")
+    parser.add_argument("--min-speedup", type=float, help="Gain minimal attendu sur chaque ressource")
+    args = parser.parse_args(argv)
+
+    resultats = benchmark(args.items, args.repeat)
+    for nom, r in resultats.items():
+        print(f"{nom:<14} avant {r['avant']:>6} µs/élément | après {r['apres']:>6} µs/élément | x{r['gain']}")
+
+    lents = [nom for nom, r in resultats.items() if args.min_speedup is not None and r["gain"] < args.min_speedup]
+    for nom in lents:
+        print(f"❌ {nom} : gain x{resultats[nom]['gain']} < x{args.min_speedup}")
+    return 1 if lents else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
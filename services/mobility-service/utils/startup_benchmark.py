@@ -0,0 +1,87 @@
+"""
+Mesure du démarrage à froid du service
+
+Chaque mesure lance un interpréteur neuf (comme un nouveau worker) et relève :
+- import : durée de `import main` (modules chargés au démarrage du worker)
+- demarrage : exécution du lifespan
+- premiere_requete : latence de la première requête (services construits à la demande)
+
+Usage :
+    python -m utils.startup_benchmark [--runs 5] [--path /lignes]
+                                      [--max-import-ms 800] [--max-first-request-ms 200]
+Code de sortie 1 si la médiane dépasse un des seuils (suivi en CI).
+"""
+from statistics import median
+from typing import Dict, List, Optional
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# Exécuté dans un interpréteur neuf ; affiche les durées en JSON
+PROBE = """
+import json, logging, sys, time
+logging.disable(logging.CRITICAL)
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(main.app) as client:
+    ready = time.perf_counter()
+    response = client.get(sys.argv[1])
+    answered = time.perf_counter()
+print(json.dumps({
+    "import": (imported - started) * 1000,
+    "demarrage": (ready - imported) * 1000,
+    "premiere_requete": (answered - ready) * 1000,
+    "status": response.status_code,
+}))
+"""
+
+SERVICE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def measure(path: str = "/lignes") -> Dict[str, float]:
+    """Une mesure de démarrage à froid dans un sous-processus"""
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE, path],
+        cwd=SERVICE_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def benchmark(runs: int = 5, path: str = "/lignes") -> Dict[str, float]:
+    """Médianes (ms) sur `runs` démarrages à froid"""
+    mesures = [measure(path) for _ in range(runs)]
+    if any(m["status"] >= 500 for m in mesures):
+        raise RuntimeError(f"{path} a répondu en erreur pendant la mesure")
+    return {key: round(median(m[key] for m in mesures), 1) for key in ("import", "demarrage", "premiere_requete")}
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Ligne de commande"""
+    parser = argparse.ArgumentParser(description="Démarrage à froid du service Mobilité")
+    parser.add_argument("--runs", type=int, default=5, help="Nombre de démarrages mesurés")
+    parser.add_argument("--path", default="/lignes", help="Première requête envoyée")
+    parser.add_argument("--max-import-ms", type=float, help="Seuil sur la médiane d'import")
+    parser.add_argument("--max-first-request-ms", type=float, help="Seuil sur la médiane de première requête")
+    args = parser.parse_args(argv)
+
+    resultats = benchmark(args.runs, args.path)
+    print(
+        f"import {resultats['import']} ms | lifespan {resultats['demarrage']} ms | "
+        f"première requête {args.path} {resultats['premiere_requete']} ms (médiane sur {args.runs})"
+    )
+
+    depassements = []
+    if args.max_import_ms is not None and resultats["import"] > args.max_import_ms:
+        depassements.append(f"import {resultats['import']} ms > {args.max_import_ms} ms")
+    if args.max_first_request_ms is not None and resultats["premiere_requete"] > args.max_first_request_ms:
+        depassements.append(f"première requête {resultats['premiere_requete']} ms > {args.max_first_request_ms} ms")
+    for depassement in depassements:
+        print(f"❌ {depassement}")
+    return 1 if depassements else 0
+
+if __name__ == "__main__":
+    sys.exit(main())